@@ -0,0 +1,168 @@
+"""Throughput of the read endpoints under WSGI and ASGI.
+
+Seeds a throwaway SQLite database, then runs the same load against:
+
+  wsgi        gunicorn (gthread) serving the sync ViewSets
+  asgi-sync   uvicorn serving the sync ViewSets through sync_to_async
+  asgi-async  uvicorn serving the /async/ read endpoints
+
+Each run keeps --connections keep-alive connections busy for --seconds,
+cycling through race, driver and history lookups, and reports requests per
+second and latency percentiles. Needs gunicorn and uvicorn installed.
+
+    python benchmarks/bench_asgi.py --connections 500 --seconds 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+SERVERS = {
+    'wsgi': (['gunicorn', 'formulanerd.wsgi:application', '--worker-class', 'gthread', '--workers', '1',
+              '--threads', '32', '--bind'], ''),
+    'asgi-sync': (['uvicorn', 'formulanerd.asgi:application', '--no-access-log', '--workers', '1', '--port'], ''),
+    'asgi-async': (['uvicorn', 'formulanerd.asgi:application', '--no-access-log', '--workers', '1', '--port'], '/async'),
+}
+
+
+def seed_database(path, races):
+    """Migrate and seed the benchmark database"""
+    os.environ['BENCH_DB'] = str(path)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+    from bench_indexes import seed
+
+    call_command('migrate', verbosity=0)
+    seed(connection, races)
+    connection.close()
+
+
+def get_paths(prefix, rng, count=1000):
+    """A fixed mix of detail and filtered list requests"""
+    from bench_indexes import CONSTRUCTORS, DRIVERS, NATIONS
+    paths = []
+    for _ in range(count):
+        paths.append(rng.choice((
+            f'{prefix}/races/{rng.randint(1, 10_000)}',
+            f'{prefix}/drivers/{rng.randint(1, DRIVERS)}',
+            f'{prefix}/constructors?nation={rng.randint(1, NATIONS)}',
+            f'{prefix}/driverconstructorhistories?constructor={rng.randint(1, CONSTRUCTORS)}&year={rng.randint(1950, 2024)}',
+        )))
+    return paths
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response with a Content-Length body
+
+    Returns:
+        int -- status code
+    """
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def run_load(port, paths, connections, seconds):
+    """Returns:
+        tuple -- (latencies in seconds, error count)
+    """
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(offset):
+        nonlocal errors
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        position = offset
+        while time.perf_counter() < deadline:
+            path = paths[position % len(paths)]
+            position += 1
+            started = time.perf_counter()
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: application/json\r\n\r\n'.encode())
+            try:
+                status = await read_response(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                errors += 1
+                writer.close()
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                continue
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors += 1
+        writer.close()
+
+    await asyncio.gather(*(client(offset * 7) for offset in range(connections)))
+    return latencies, errors
+
+
+def wait_for_port(port, timeout=30):
+    import socket
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as probe:
+            if probe.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--races', type=int, default=10_000, help='Races and history rows to seed')
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--servers', default=','.join(SERVERS), help='Comma separated subset of: ' + ', '.join(SERVERS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / 'bench.sqlite3'
+        seed_database(database, args.races)
+        env = dict(
+            os.environ, BENCH_DB=str(database), DJANGO_SETTINGS_MODULE='bench_settings',
+            PYTHONPATH=os.pathsep.join((str(ROOT), str(ROOT / 'benchmarks'))),
+        )
+
+        for port, name in enumerate(args.servers.split(','), 8701):
+            command, prefix = SERVERS[name]
+            address = f'127.0.0.1:{port}' if name == 'wsgi' else str(port)
+            server = subprocess.Popen(command + [address], cwd=ROOT, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_for_port(port)
+                paths = get_paths(prefix, random.Random(2025))
+                latencies, errors = asyncio.run(run_load(port, paths, args.connections, args.seconds))
+            finally:
+                server.terminate()
+                server.wait()
+
+            latencies.sort()
+            milliseconds = [latency * 1000 for latency in latencies] or [0]
+            print(
+                f'{name:<11} {len(latencies) / args.seconds:8.0f} req/s   '
+                f'p50 {milliseconds[len(milliseconds) // 2]:7.1f} ms   '
+                f'p99 {milliseconds[int(len(milliseconds) * 0.99)]:7.1f} ms   errors {errors}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Memory and latency of the autocomplete PrefixIndex.
+
+Builds an index over synthetic "First Last" names, measures its memory
+with tracemalloc, then times lookups for random 1-4 letter prefixes and
+in-place adds and removes.
+
+    python benchmarks/bench_autocomplete.py --names 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'formulanerd.settings')
+
+SYLLABLES = ['ka', 'ro', 'mi', 'ten', 'sa', 'lo', 'ver', 'han', 'ei', 'du', 'ma', 'rik', 'os', 'che', 'li', 'ny']
+
+
+def make_names(count, rng):
+    """Returns:
+        list -- (id, name) pairs of two or three capitalized words
+    """
+    def word():
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+    return [(pk, ' '.join(word() for _ in range(rng.choice((2, 2, 2, 3))))) for pk in range(1, count + 1)]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=100_000, help='Names to index')
+    parser.add_argument('--lookups', type=int, default=20_000, help='Prefix lookups to time')
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+    from formulanerdapi.autocomplete import PrefixIndex
+
+    rng = random.Random(2025)
+    names = make_names(args.names, rng)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = PrefixIndex(names)
+    built = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'Indexed {args.names:,} names in {built:.2f}s')
+    print(f'Memory: {size / 2 ** 20:.1f} MiB ({size / args.names * 100_000 / 2 ** 20:.1f} MiB per 100k names)')
+
+    words = [word for _, name in rng.sample(names, min(len(names), 5000)) for word in name.split()]
+    prefixes = [rng.choice(words)[:rng.randint(1, 4)] for _ in range(args.lookups)]
+    timings = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.search(prefix, 10)
+        timings.append((time.perf_counter() - started) * 1e6)
+    print(
+        f'Lookups: mean {statistics.mean(timings):.1f} us, p50 {percentile(timings, 0.5):.1f} us, '
+        f'p99 {percentile(timings, 0.99):.1f} us, max {max(timings):.1f} us'
+    )
+
+    timings = []
+    for pk, name in make_names(1000, rng):
+        started = time.perf_counter()
+        index.add(args.names + pk, name)
+        index.remove(rng.randint(1, args.names))
+        timings.append((time.perf_counter() - started) * 1e6)
+    print(f'Add + remove: mean {statistics.mean(timings):.1f} us, p99 {percentile(timings, 0.99):.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Latency, query count, SQL and serializer time of every GET route, at
+several dataset sizes, checked against formulanerdapi/endpoint_budgets.json.
+
+Each size gets a freshly seeded database (see `manage.py seed`) with
+--scales races and a tenth as many drivers, and runs in its own process.
+Every route is requested --repeat times in process through the Django test
+client, so the numbers cover routing, views, SQL, serializers and
+rendering but not a server or the network. Detail routes are spread over
+their table rather than hitting one row.
+
+    python benchmarks/bench_endpoints.py --scales 1000,10000,100000 --report endpoints.json
+
+Exits with status 1 when any route breaks a budget, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+USERS = 100
+
+
+def setup(database):
+    os.environ['BENCH_DB'] = str(database)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    import django
+    django.setup()
+
+
+def run_scale(races, repeat, budgets_path):
+    """Seed a database with `races` races and measure every read route
+
+    Returns:
+        dict -- route name to its summarized measurements
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        setup(Path(directory) / 'bench.sqlite3')
+        from django.core.management import call_command
+        from formulanerd.urls import router
+        from formulanerdapi.endpoint_budgets import (
+            add_users, get_client, get_paths, get_read_routes, load_budgets, measure_request, summarize
+        )
+        from formulanerdapi.seeding import seed_database
+
+        call_command('migrate', verbosity=0)
+        seed_database(max(300, races // 10), races)
+        add_users(USERS)
+        budgets = load_budgets(budgets_path)
+        client = get_client()
+
+        results = {}
+        for name, path, model in get_read_routes(router):
+            budget = budgets.get(name, {})
+            paths = get_paths(path, model, budget, repeat)
+            # One untimed request first, so lazy imports and warm caches
+            # are not charged to the route
+            measure_request(client, paths[0])
+            results[name] = summarize([measure_request(client, request_path) for request_path in paths])
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1000,10000', help='Comma separated race counts to seed')
+    parser.add_argument('--repeat', type=int, default=50, help='Requests per route and scale')
+    parser.add_argument('--budgets', default=None, help='Budgets file, endpoint_budgets.json by default')
+    parser.add_argument('--report', default=None, help='Write every measurement to this JSON file')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    budgets_path = args.budgets or ROOT / 'formulanerdapi' / 'endpoint_budgets.json'
+    if args.worker:
+        print(json.dumps(run_scale(args.worker, args.repeat, budgets_path)))
+        return
+
+    # Only to import the budget checks; this process never opens a database
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'formulanerd.settings')
+    import django
+    django.setup()
+    from formulanerdapi.endpoint_budgets import check_budget, load_budgets
+
+    budgets = load_budgets(budgets_path)
+    report, problems = {}, []
+    for races in [int(scale) for scale in args.scales.split(',')]:
+        # Each scale runs in a fresh process, since settings are read once
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', str(races), '--repeat', str(args.repeat),
+             '--budgets', str(budgets_path)],
+            check=True, stdout=subprocess.PIPE, text=True
+        ).stdout
+        results = report[races] = json.loads(output)
+
+        print(f'\n{races:,} races')
+        print(f'{"route":<40}{"p50 ms":>9}{"p99 ms":>9}{"queries":>9}{"sql ms":>9}{"ser ms":>9}{"bytes":>10}')
+        for name, result in results.items():
+            print(
+                f'{name:<40}{result["p50_ms"]:>9.2f}{result["p99_ms"]:>9.2f}{result["queries"]:>9}'
+                f'{result["sql_ms"]:>9.2f}{result["serializer_ms"]:>9.2f}{result["bytes"]:>10}'
+            )
+            problems += check_budget(name, result, budgets.get(name, {}), races)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+    if problems:
+        print('\nOver budget:', *problems, sep='\n  ')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
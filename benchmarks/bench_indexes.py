@@ -0,0 +1,131 @@
+"""EXPLAIN QUERY PLAN and timings for the hot filter queries, before and after
+the composite indexes from migration 0007.
+
+Builds a throwaway SQLite database, migrates it to 0006 (no indexes beyond
+the foreign keys), seeds it, then runs every query before and after
+applying 0007.
+
+    python benchmarks/bench_indexes.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'formulanerd.settings')
+
+NATIONS = 200
+CONSTRUCTORS = 500
+CIRCUITS = 2000
+DRIVERS = 20000
+
+
+def seed(connection, rows):
+    """Insert reference rows plus `rows` races and `rows` history rows with raw SQL"""
+    rng = random.Random(2025)
+    first_race = date(1950, 5, 13)
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous = OFF')
+        cursor.execute('PRAGMA journal_mode = MEMORY')
+        cursor.executemany(
+            'INSERT INTO formulanerdapi_nation (id, name, flag_image_url) VALUES (%s, %s, %s)',
+            [(i, f'Nation {i}', '') for i in range(1, NATIONS + 1)]
+        )
+        cursor.executemany(
+            'INSERT INTO formulanerdapi_constructor (id, name, location, nation_id, is_engine_manufacturer, about, constructor_image_url)'
+            ' VALUES (%s, %s, %s, %s, %s, %s, %s)',
+            [(i, f'Constructor {i}', '', rng.randint(1, NATIONS), False, '', '') for i in range(1, CONSTRUCTORS + 1)]
+        )
+        cursor.executemany(
+            'INSERT INTO formulanerdapi_circuit (id, name, nation_id, length, circuit_type, designer, year_built, circuit_image_url)'
+            ' VALUES (%s, %s, %s, %s, %s, %s, %s, %s)',
+            [(i, f'Circuit {i}', rng.randint(1, NATIONS), '', '', '', None, '') for i in range(1, CIRCUITS + 1)]
+        )
+        cursor.executemany(
+            'INSERT INTO formulanerdapi_driver (id, name, age, gender, nation_id, current_constructor_id, about, driver_image_url)'
+            ' VALUES (%s, %s, %s, %s, %s, %s, %s, %s)',
+            [(i, f'Driver {i}', None, '', rng.randint(1, NATIONS), rng.randint(1, CONSTRUCTORS), '', '') for i in range(1, DRIVERS + 1)]
+        )
+        cursor.executemany(
+            'INSERT INTO formulanerdapi_race (name, circuit_id, date, nation_id, distance, laps, winner_driver_id, p2_driver_id, p3_driver_id)'
+            ' VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)',
+            (
+                (f'Grand Prix {i}', rng.randint(1, CIRCUITS), first_race + timedelta(days=rng.randint(0, 75 * 365)),
+                 rng.randint(1, NATIONS), '', 60, rng.randint(1, DRIVERS), rng.randint(1, DRIVERS), rng.randint(1, DRIVERS))
+                for i in range(rows)
+            )
+        )
+        cursor.executemany(
+            'INSERT INTO formulanerdapi_driverconstructorhistory (driver_id, constructor_id, start_year, end_year)'
+            ' VALUES (%s, %s, %s, %s)',
+            (
+                (rng.randint(1, DRIVERS), rng.randint(1, CONSTRUCTORS), start, start + rng.randint(0, 5))
+                for start in (rng.randint(1950, 2024) for _ in range(rows))
+            )
+        )
+        cursor.execute('ANALYZE')
+
+
+def hot_queries():
+    """The filters the API and clients run most, as ORM querysets"""
+    from formulanerdapi.models import DriverConstructorHistory, Race, User
+
+    return [
+        ('races by nation, in date order', Race.objects.filter(nation=17).order_by('date', 'id')),
+        ('races at a circuit in a season', Race.objects.filter(circuit=42, date__gte='1990-01-01', date__lt='1991-01-01')),
+        ('races in a season', Race.objects.filter(date__gte='1990-01-01', date__lt='1991-01-01')),
+        ('race page after a cursor', Race.objects.filter(date__gt='1990-06-01').order_by('date', 'id')[:100]),
+        ('driver career from a year', DriverConstructorHistory.objects.filter(driver=123, start_year__gte=1990)),
+        ('constructor roster in a year', DriverConstructorHistory.objects.filter(constructor=7, start_year__lte=1990, end_year__gte=1990)),
+        ('user by uid', User.objects.filter(uid='user-42')),
+    ]
+
+
+def run_queries(label):
+    print(f'\n=== {label} ===')
+    for name, queryset in hot_queries():
+        started = time.perf_counter()
+        repeats = 20
+        for _ in range(repeats):
+            list(queryset.all())
+        elapsed = (time.perf_counter() - started) / repeats * 1000
+        plan = queryset.explain().replace('\n', '\n      ')
+        print(f'{name}: {elapsed:.2f} ms\n      {plan}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Races and history rows to seed')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        from django.conf import settings
+        settings.DATABASES['default']['NAME'] = str(Path(directory) / 'bench.sqlite3')
+
+        import django
+        django.setup()
+        from django.core.management import call_command
+        from django.db import connection
+
+        call_command('migrate', 'formulanerdapi', '0006', verbosity=0)
+        started = time.perf_counter()
+        seed(connection, args.rows)
+        print(f'Seeded {args.rows:,} races and {args.rows:,} history rows in {time.perf_counter() - started:.1f}s')
+
+        run_queries('before (foreign key indexes only)')
+
+        started = time.perf_counter()
+        call_command('migrate', 'formulanerdapi', '0007', verbosity=0)
+        connection.cursor().execute('ANALYZE')
+        print(f'\nApplied 0007 in {time.perf_counter() - started:.1f}s')
+
+        run_queries('after (0007 composite indexes)')
+
+
+if __name__ == '__main__':
+    main()
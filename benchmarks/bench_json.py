@@ -0,0 +1,84 @@
+"""Time spent turning the /races and /drivers list payloads into JSON and
+back: DRF's JSONRenderer and JSONParser against FastJSONRenderer and
+FastJSONParser.
+
+The payloads are serialized once from a seeded database (see `manage.py
+seed`) with --races races and a tenth as many drivers, the way the list
+views build them, so only rendering and parsing are timed. Each side's
+bytes and data are checked to be the same.
+
+    python benchmarks/bench_json.py --races 10000
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def time_call(function, repeats):
+    """Returns:
+        tuple -- (best ms per call over `repeats` calls, last result)
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--races', type=int, default=10_000, help='Races to seed')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs of each renderer and parser')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['BENCH_DB'] = str(Path(directory) / 'bench.sqlite3')
+        os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+        import django
+        django.setup()
+        from django.core.management import call_command
+        from rest_framework.parsers import JSONParser
+        from rest_framework.renderers import JSONRenderer
+        from formulanerdapi.models import Driver, Race
+        from formulanerdapi.parsers import FastJSONParser
+        from formulanerdapi.renderers import FastJSONRenderer, orjson
+        from formulanerdapi.seeding import seed_database
+        from formulanerdapi.utils import optimize_queryset
+        from formulanerdapi.views.driver import DriverSerializer
+        from formulanerdapi.views.race import RaceSerializer
+
+        if orjson is None:
+            print('orjson is not installed: the fast classes fall back to the stdlib')
+        call_command('migrate', verbosity=0)
+        seed_database(max(300, args.races // 10), args.races)
+
+        payloads = {}
+        for route, model, serializer_class in (('/races', Race, RaceSerializer), ('/drivers', Driver, DriverSerializer)):
+            queryset = optimize_queryset(model.objects.all(), serializer_class())
+            payloads[route] = serializer_class(queryset, many=True).data
+
+        for route, data in payloads.items():
+            stdlib_ms, body = time_call(lambda data=data: JSONRenderer().render(data), args.repeat)
+            fast_ms, fast_body = time_call(lambda data=data: FastJSONRenderer().render(data), args.repeat)
+            assert fast_body == body
+            print(
+                f'{route}: {len(data)} rows, {len(body) / 2 ** 20:.1f} MiB; '
+                f'render {stdlib_ms:.1f} ms -> {fast_ms:.1f} ms ({stdlib_ms / fast_ms:.1f}x)'
+            )
+
+            stdlib_ms, parsed = time_call(lambda body=body: JSONParser().parse(io.BytesIO(body)), args.repeat)
+            fast_ms, fast_parsed = time_call(lambda body=body: FastJSONParser().parse(io.BytesIO(body)), args.repeat)
+            assert fast_parsed == parsed
+            print(f'{route}: parse {stdlib_ms:.1f} ms -> {fast_ms:.1f} ms ({stdlib_ms / fast_ms:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
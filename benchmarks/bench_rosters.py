@@ -0,0 +1,73 @@
+"""Timings for "who drove for constructor X in year Y" on a large history
+table: the plain overlap filter against filter_active(), which bounds
+finished spells by the longest one and reads open spells from the
+partial index added in migration 0009.
+
+Seeds the same data as bench_indexes.py, with one spell in 50 left open.
+
+    python benchmarks/bench_rosters.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'formulanerd.settings')
+
+
+def time_query(queryset, repeats=200):
+    """Returns:
+        tuple -- (ms per run, rows returned)
+    """
+    started = time.perf_counter()
+    for _ in range(repeats):
+        rows = list(queryset.values_list('id', flat=True))
+    return (time.perf_counter() - started) / repeats * 1000, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='History rows (and races) to seed')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        from django.conf import settings
+        settings.DATABASES['default']['NAME'] = str(Path(directory) / 'bench.sqlite3')
+
+        import django
+        django.setup()
+        from django.core.management import call_command
+        from django.db import connection
+        from django.db.models import Q
+        from django.test import Client
+        from bench_indexes import seed
+        from formulanerdapi.history_index import filter_active
+        from formulanerdapi.models import DriverConstructorHistory
+
+        call_command('migrate', verbosity=0)
+        seed(connection, args.rows)
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE formulanerdapi_driverconstructorhistory SET end_year = NULL WHERE id % 50 = 0')
+            cursor.execute('ANALYZE')
+
+        history = DriverConstructorHistory.objects.all()
+        for year in (1960, 1990, 2020):
+            for name, spells in (('constructor 7', history.filter(constructor=7)), ('driver 123', history.filter(driver=123))):
+                plain = spells.filter(Q(end_year__isnull=True) | Q(end_year__gte=year), start_year__lte=year)
+                plain_ms, plain_rows = time_query(plain)
+                active_ms, active_rows = time_query(filter_active(spells, year))
+                assert plain_rows == active_rows
+                print(f'{name} in {year}: {plain_rows} spells, plain {plain_ms:.3f} ms, filter_active {active_ms:.3f} ms')
+
+        client = Client(HTTP_HOST='localhost')
+        for query in ('from=1990&to=1999', 'from=1990&to=1999&constructor=7'):
+            started = time.perf_counter()
+            response = client.get(f'/driverconstructorhistories/rosters?{query}')
+            print(f'rosters?{query}: {len(response.json())} rosters in {(time.perf_counter() - started) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
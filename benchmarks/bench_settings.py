@@ -0,0 +1,17 @@
+"""Settings for benchmark servers: the project settings pointed at a seeded
+database given in BENCH_DB, with debugging and response caching off so every
+request does its full work."""
+import os
+
+from formulanerd.settings import *  # noqa: F401,F403 pylint: disable=wildcard-import,unused-wildcard-import
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+DATABASES['default']['NAME'] = os.environ['BENCH_DB']  # noqa: F405
+RESPONSE_CACHE = None
+
+# BENCH_SQLITE_PROFILE=off measures SQLite with its defaults
+if os.environ.get('BENCH_SQLITE_PROFILE') == 'off':
+    SQLITE_PRAGMAS = None
+    SERIALIZE_SQLITE_WRITES = False
+    DATABASES['default']['OPTIONS'] = {}  # noqa: F405
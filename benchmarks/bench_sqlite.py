@@ -0,0 +1,148 @@
+"""Read and write throughput on SQLite with the production profile off and on.
+
+  off   SQLite defaults (rollback journal, synchronous=FULL), writers race
+        each other for the file lock
+  on    settings.SQLITE_PRAGMAS (WAL, synchronous=NORMAL, mmap, cache,
+        busy timeout), IMMEDIATE transactions and the in-process write queue
+
+Each mode gets a freshly seeded database file and --workers processes,
+each running --readers and --writers threads for --seconds. Readers
+alternate a race lookup with a filtered race list; writers update a race
+inside a transaction (read, then save, which also recomputes standings and
+bumps table versions), the same path as PUT /races/<id>. Failed statements,
+"database is locked" above all, are counted as errors.
+
+    python benchmarks/bench_sqlite.py --races 100000 --workers 2 --readers 8 --writers 4
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+MODES = ('off', 'on')
+
+
+def setup(database, mode):
+    os.environ['BENCH_DB'] = str(database)
+    os.environ['BENCH_SQLITE_PROFILE'] = mode
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    import django
+    django.setup()
+
+
+def seed_database(database, mode, races):
+    """Migrate and seed the benchmark database"""
+    setup(database, mode)
+    from django.core.management import call_command
+    from django.db import connection
+    from bench_indexes import seed
+
+    call_command('migrate', verbosity=0)
+    seed(connection, races)
+    connection.close()
+
+
+def run_worker(database, mode, races, readers, writers, seconds):
+    """Run reader and writer threads in this process
+
+    Returns:
+        dict -- reads, writes and errors completed before the deadline
+    """
+    setup(database, mode)
+    from django.db import DatabaseError, connection, transaction
+    from formulanerdapi.models import Race
+    from formulanerdapi.utils import serialized_write
+
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    @serialized_write
+    def write(pk):
+        with transaction.atomic():
+            race = Race.objects.get(pk=pk)
+            race.laps += 1
+            race.save()
+
+    def read(rng):
+        Race.objects.filter(pk=rng.randint(1, races)).values().first()
+        list(Race.objects.filter(nation=rng.randint(1, 200)).order_by('date', 'id').values('id', 'date')[:50])
+
+    def loop(work, key, seed):
+        rng = random.Random(seed)
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                work(rng) if key == 'reads' else work(rng.randint(1, races))
+                done += 1
+            except DatabaseError:
+                errors += 1
+        connection.close()
+        with lock:
+            counts[key] += done
+            counts['errors'] += errors
+
+    threads = [threading.Thread(target=loop, args=(read, 'reads', seed)) for seed in range(readers)]
+    threads += [threading.Thread(target=loop, args=(write, 'writes', 1000 + seed)) for seed in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--races', type=int, default=100_000, help='Races and history rows to seed')
+    parser.add_argument('--workers', type=int, default=2, help='Processes, like gunicorn workers')
+    parser.add_argument('--readers', type=int, default=8, help='Reader threads per process')
+    parser.add_argument('--writers', type=int, default=4, help='Writer threads per process')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--worker', nargs=2, metavar=('DATABASE', 'MODE'), help=argparse.SUPPRESS)
+    parser.add_argument('--seed', nargs=2, metavar=('DATABASE', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed_database(args.seed[0], args.seed[1], args.races)
+        return
+    if args.worker:
+        counts = run_worker(args.worker[0], args.worker[1], args.races, args.readers, args.writers, args.seconds)
+        print(json.dumps(counts))
+        return
+
+    options = ['--races', str(args.races), '--readers', str(args.readers), '--writers', str(args.writers),
+               '--seconds', str(args.seconds)]
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            database = Path(directory) / 'bench.sqlite3'
+            # Each mode runs in fresh processes, since settings are read once
+            subprocess.run([sys.executable, __file__, '--seed', str(database), mode] + options, check=True)
+            workers = [
+                subprocess.Popen([sys.executable, __file__, '--worker', str(database), mode] + options,
+                                 stdout=subprocess.PIPE, text=True)
+                for _ in range(args.workers)
+            ]
+            totals = {'reads': 0, 'writes': 0, 'errors': 0}
+            for worker in workers:
+                output, _ = worker.communicate()
+                for key, value in json.loads(output).items():
+                    totals[key] += value
+
+        print(
+            f'{mode:<4} reads {totals["reads"] / args.seconds:9.0f}/s   '
+            f'writes {totals["writes"] / args.seconds:7.0f}/s   errors {totals["errors"]}'
+        )
+
+
+if __name__ == '__main__':
+    main()
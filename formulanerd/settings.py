@@ -44,6 +44,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the other middleware too
+    'formulanerdapi.middleware.ProfilingMiddleware',
+    'formulanerdapi.middleware.MetricsMiddleware',
+    'formulanerdapi.middleware.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -52,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'formulanerdapi.middleware.replica_routing_middleware',
 ]
 
 ROOT_URLCONF = 'formulanerd.urls'
@@ -80,11 +85,81 @@ WSGI_APPLICATION = 'formulanerd.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # Django's SQLite backend plus transaction_mode, see
+        # formulanerdapi/backends/sqlite3/base.py
+        'ENGINE': 'formulanerdapi.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    },
+    # Read replica of 'default'. Kept current by the database's own
+    # replication, or for local SQLite files by `manage.py replicate`.
+    # Takes reads only while listed in DATABASE_REPLICAS.
+    'replica': {
+        'ENGINE': 'formulanerdapi.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    },
 }
 
+# GET, HEAD and OPTIONS requests read from one of these DATABASES aliases;
+# writes, and every read of a request that writes, go to 'default'.
+# Replicas whose heartbeat is more than REPLICA_MAX_LAG seconds old are
+# skipped, their lag being checked at most every REPLICA_LAG_CHECK_INTERVAL
+# seconds. Empty sends everything to 'default'.
+DATABASE_ROUTERS = ['formulanerdapi.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_MAX_LAG = 5
+REPLICA_LAG_CHECK_INTERVAL = 1
+
+# Pragmas run on every new SQLite connection. WAL lets readers carry on
+# while a write commits, and with it synchronous=NORMAL only syncs at
+# checkpoints (a power cut can lose the last commits, never corrupt the
+# file). mmap_size is in bytes; a negative cache_size is in KiB. Set to
+# None to keep SQLite's defaults.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 2 ** 20,
+    'cache_size': -64 * 2 ** 10,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+# Queue writes from the API through one in-process lock, so threads of a
+# worker take turns at SQLite's single write lock instead of failing with
+# "database is locked"
+SERIALIZE_SQLITE_WRITES = True
+
+# Fraction of requests to profile, from 0 (off, the middleware drops out
+# of the stack) to 1 (every request). Profiled responses carry a
+# Server-Timing header splitting their time into SQL, serializers, the
+# rest of the view and rendering. With REQUEST_PROFILING_LOG each one also
+# logs a JSON line to the 'formulanerdapi.profiling' logger.
+REQUEST_PROFILING_SAMPLE_RATE = 0
+REQUEST_PROFILING_LOG = False
+
+# Request counts, latency and SQL histograms per route, and response cache
+# results, served at /metrics for Prometheus. Each process counts its own
+# requests; with pre-forked workers, set METRICS_MULTIPROCESS_DIR to a
+# directory they all share (and that is emptied on deploy), which each
+# worker writes its totals to every METRICS_FLUSH_INTERVAL seconds, so a
+# scrape of any worker covers them all.
+METRICS_ENABLED = True
+METRICS_MULTIPROCESS_DIR = None
+METRICS_FLUSH_INTERVAL = 5
+
+# SQL statements that API views take SLOW_QUERY_THRESHOLD_MS or longer to
+# run are logged with their parameters, view, call stack and EXPLAIN plan
+# as JSON lines to SLOW_QUERY_LOG_FILE, which rotates at
+# SLOW_QUERY_LOG_MAX_BYTES keeping SLOW_QUERY_LOG_BACKUPS old files. The
+# SLOW_QUERY_TOP_N slowest statements of each process are also listed for
+# admins at /slowqueries. None turns recording off.
+SLOW_QUERY_THRESHOLD_MS = None
+SLOW_QUERY_LOG_FILE = BASE_DIR / 'logs' / 'slow_queries.log'
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 2 ** 20
+SLOW_QUERY_LOG_BACKUPS = 5
+SLOW_QUERY_TOP_N = 50
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -126,3 +201,40 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# List responses with more rows than this are streamed instead of being
+# rendered whole. None turns automatic streaming off; clients can still
+# ask for it with ?stream=true
+STREAMING_LIST_THRESHOLD = None
+
+# Cache for list/retrieve responses, keyed by URL and the versions of the
+# tables each response reads. LRUBackend keeps entries in process memory;
+# to share them between workers use
+#   'BACKEND': 'formulanerdapi.utils.response_cache.DjangoCacheBackend',
+#   'OPTIONS': {'alias': 'responses'},
+# with a FileBasedCache configured under CACHES['responses'].
+# Set to None to turn response caching off.
+RESPONSE_CACHE = {
+    'BACKEND': 'formulanerdapi.utils.response_cache.LRUBackend',
+    'OPTIONS': {'max_entries': 1024},
+}
+
+# /autocomplete keeps its name indexes in process memory. Each worker
+# checks the tables' versions at most every this many seconds and reloads
+# an index once another process has written to its table.
+AUTOCOMPLETE_VERSION_CHECK_INTERVAL = 1
+
+# JSON is written and read with orjson when it is installed, giving the
+# same bytes and data as DRF's own JSONRenderer and JSONParser, which take
+# over when it is not
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'formulanerdapi.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'formulanerdapi.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
@@ -8,6 +8,14 @@ from formulanerdapi.views import UserView
 from formulanerdapi.views import RaceView
 from formulanerdapi.views import ConstructorView
 from formulanerdapi.views import DriverConstructorHistoryView
+from formulanerdapi.views import ExportView
+from formulanerdapi.views import DriverStandingView
+from formulanerdapi.views import ConstructorStandingView
+from formulanerdapi.views import SearchView
+from formulanerdapi.views import AutocompleteView
+from formulanerdapi.views import SlowQueryView
+from formulanerdapi.views import metrics_view
+from formulanerdapi.views.asyncRead import get_async_urls
 """formulanerd URL Configuration
 
 The `urlpatterns` list routes URLs to views. For more information please see:
@@ -31,8 +39,16 @@ router.register(r'races', RaceView, 'race')
 router.register(r'constructors', ConstructorView, 'constructor')
 router.register(r'driverconstructorhistories', DriverConstructorHistoryView, 'driver_constructor_history')
 router.register(r'nations', NationView, 'nation')
+router.register(r'exports', ExportView, 'export')
+router.register(r'standings', DriverStandingView, 'standing')
+router.register(r'constructorstandings', ConstructorStandingView, 'constructor_standing')
+router.register(r'search', SearchView, 'search')
+router.register(r'autocomplete', AutocompleteView, 'autocomplete')
+router.register(r'slowqueries', SlowQueryView, 'slow_query')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include(router.urls)),
+    path('async/', include(get_async_urls())),
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FormulanerdapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'formulanerdapi'
+
+    def ready(self):
+        from formulanerdapi import signals  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
@@ -0,0 +1,100 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from formulanerdapi.models import (
+    Circuit, Constructor, Driver, DriverConstructorHistory, Nation, Race, User
+)
+
+# Archive files in dependency order: every table only refers to the ones
+# above it. Rows point at related rows by natural key (their name).
+ARCHIVE_TABLES = (
+    ('nations', Nation),
+    ('constructors', Constructor),
+    ('circuits', Circuit),
+    ('drivers', Driver),
+    ('races', Race),
+    ('driver_constructor_history', DriverConstructorHistory),
+)
+
+ARCHIVE_FORMATS = ('jsonl', 'csv')
+
+
+def get_foreign_keys(model):
+    """Returns:
+        list -- the model's ForeignKey fields in declaration order
+    """
+    return [field for field in model._meta.concrete_fields if field.many_to_one]
+
+
+def find_archive_file(directory, name):
+    """Find <name>.jsonl or <name>.csv in an archive directory
+
+    Returns:
+        Path -- the file, or None when the table has no file
+    """
+    for extension in ARCHIVE_FORMATS:
+        path = Path(directory) / f'{name}.{extension}'
+        if path.exists():
+            return path
+    return None
+
+
+def read_rows(path):
+    """Yield (line number, row dict) from a CSV or JSONL file
+
+    The file is read line by line, so multi-GB archives never need to fit
+    in memory.
+    """
+    path = Path(path)
+    with path.open(newline='', encoding='utf-8') as archive_file:
+        if path.suffix == '.csv':
+            # Line 1 is the header
+            for line_number, row in enumerate(csv.DictReader(archive_file), 2):
+                yield line_number, row
+        else:
+            for line_number, line in enumerate(archive_file, 1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+
+
+# Every table the export covers: the archive tables plus users
+EXPORT_TABLES = ARCHIVE_TABLES + (('users', User),)
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def get_export_columns(model):
+    """Returns:
+        list -- flat column names (foreign keys as <name>_id) in table order
+    """
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def iter_export_rows(model, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield tuples of column values straight from the database
+
+    Uses a values_list() projection with a chunked iterator, so no model
+    instances or serializers are involved and memory stays flat.
+    """
+    return model.objects.order_by('pk').values_list(*columns).iterator(chunk_size=chunk_size)
+
+
+def encode_value(value):
+    """Encode one value as compact JSON (dates as ISO strings)"""
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+
+def iter_jsonl(model, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a table as JSON lines, one object per row"""
+    columns = get_export_columns(model)
+    for row in iter_export_rows(model, columns, chunk_size):
+        yield encode_value(dict(zip(columns, row))) + '\n'
+
+
+def iter_column(model, column, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a single column as JSON lines, one value per row"""
+    for (value,) in iter_export_rows(model, [column], chunk_size):
+        yield encode_value(value) + '\n'
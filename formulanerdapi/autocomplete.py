@@ -0,0 +1,154 @@
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+
+from formulanerdapi.models import Circuit, Constructor, Driver, Nation
+from formulanerdapi.utils.versions import get_versions
+
+AUTOCOMPLETE_MODELS = {
+    'driver': Driver,
+    'circuit': Circuit,
+    'constructor': Constructor,
+    'nation': Nation,
+}
+
+
+def normalize(text):
+    """Lower case a name and strip its accents, so "pérez" and "Perez" meet"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def get_keys(name):
+    """Every suffix of a name that starts a word
+
+    "Lewis Hamilton" gives "lewis hamilton" and "hamilton", so both "lew"
+    and "ham" find it, and so does "lewis ha".
+    """
+    words = normalize(name).split()
+    return [' '.join(words[start:]) for start in range(len(words))]
+
+
+class PrefixIndex:
+    """Names searchable by the prefix of any of their words
+
+    Keys live in one sorted list with the owning ids in a parallel array of
+    machine integers, so a lookup is a bisect followed by a short scan and
+    each entry costs a string plus eight bytes. Edits insert or remove in
+    place instead of rebuilding.
+    """
+
+    def __init__(self, names=(), version=None):
+        """Build from (id, name) pairs, read at the table's `version`"""
+        self.version = version
+        # When the version was last found current
+        self.checked = time.monotonic()
+        self._lock = threading.Lock()
+        self._names = {}
+        entries = []
+        for pk, name in names:
+            self._names[pk] = name
+            entries.extend((key, pk) for key in get_keys(name))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._ids = array('q', (pk for _, pk in entries))
+
+    def __len__(self):
+        return len(self._names)
+
+    def search(self, prefix, limit=10):
+        """Returns:
+            list -- (id, name) pairs with a word starting with the prefix,
+            in key order, each id at most once
+        """
+        prefix = ' '.join(normalize(prefix).split())
+        found = {}
+        with self._lock:
+            position = bisect_left(self._keys, prefix)
+            while position < len(self._keys) and len(found) < limit and self._keys[position].startswith(prefix):
+                pk = self._ids[position]
+                found.setdefault(pk, self._names[pk])
+                position += 1
+        return list(found.items())
+
+    def add(self, pk, name):
+        """Add or rename an entry"""
+        with self._lock:
+            self._remove(pk)
+            self._names[pk] = name
+            for key in get_keys(name):
+                position = bisect_left(self._keys, key)
+                self._keys.insert(position, key)
+                self._ids.insert(position, pk)
+
+    def remove(self, pk):
+        """Drop an entry if it is there"""
+        with self._lock:
+            self._remove(pk)
+
+    def _remove(self, pk):
+        name = self._names.pop(pk, None)
+        if name is None:
+            return
+        for key in get_keys(name):
+            position = bisect_left(self._keys, key)
+            while self._ids[position] != pk:
+                position += 1
+            del self._keys[position]
+            del self._ids[position]
+
+
+_indexes_lock = threading.Lock()
+_indexes = {}
+
+
+def get_prefix_index(kind):
+    """Return the process-wide index for a type, loading it on first use
+
+    Writes made by other processes (other workers, import_archive, seed)
+    reach this one through the table's version, read at most every
+    settings.AUTOCOMPLETE_VERSION_CHECK_INTERVAL seconds: once it has moved
+    on, the index is loaded again. This process's own writes are applied
+    in place as they commit, so they show at once, and they move the
+    version on too.
+
+    Returns:
+        PrefixIndex
+    """
+    model = AUTOCOMPLETE_MODELS[kind]
+    index = _indexes.get(kind)
+    if index is not None and time.monotonic() - index.checked < settings.AUTOCOMPLETE_VERSION_CHECK_INTERVAL:
+        return index
+
+    version = get_versions([model])[model._meta.db_table]
+    if index is not None and index.version == version:
+        index.checked = time.monotonic()
+        return index
+    with _indexes_lock:
+        index = _indexes.get(kind)
+        if index is None or index.version != version:
+            names = model.objects.values_list('pk', 'name').iterator()
+            index = _indexes[kind] = PrefixIndex(names, version)
+    return index
+
+
+def get_loaded_index(model):
+    """Returns:
+        PrefixIndex -- a model's index if it has been loaded, else None
+    """
+    for kind, indexed_model in AUTOCOMPLETE_MODELS.items():
+        if indexed_model is model:
+            return _indexes.get(kind)
+    return None
+
+
+def clear_prefix_indexes(model=None):
+    """Forget loaded indexes (or one model's), so the next use reloads them"""
+    with _indexes_lock:
+        for kind, indexed_model in AUTOCOMPLETE_MODELS.items():
+            if model is None or indexed_model is model:
+                _indexes.pop(kind, None)
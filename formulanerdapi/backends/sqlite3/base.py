@@ -0,0 +1,37 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'EXCLUSIVE', 'IMMEDIATE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Django's SQLite backend with OPTIONS['transaction_mode']
+
+    SQLite starts transactions DEFERRED: they take the write lock at their
+    first write. A transaction that reads first and then writes fails at
+    once with "database is locked" when another connection has committed
+    in between, and the busy timeout cannot help. With 'IMMEDIATE' every
+    transaction takes the write lock at BEGIN, waiting out the busy timeout
+    for it if another process holds it. Django 5.1 has the same option
+    built in; on upgrade, point ENGINE back at django.db.backends.sqlite3.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transaction_mode = None
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        transaction_mode = kwargs.pop('transaction_mode', None)
+        if transaction_mode is not None and transaction_mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"settings.DATABASES transaction_mode must be one of {', '.join(TRANSACTION_MODES)}."
+            )
+        self.transaction_mode = transaction_mode.upper() if transaction_mode else None
+        return kwargs
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,172 @@
+"""Every GET route the API router serves, how to call it, and what it may cost
+
+Budgets live in endpoint_budgets.json, keyed by route name
+(`race-list`, `driver-detail`, `race-podium`, ...):
+
+    "race-list": {
+        "query": "nation=3",              optional query string
+        "pk": "nations",                  optional fixed pk for detail routes
+        "max_queries": 4,                 SQL statements per request, any dataset size
+        "max_p99_ms": {"1000": 80}        p99 latency per seeded race count
+    }
+
+Detail routes without a fixed pk are spread over the rows of the view's
+model. Query budgets hold at every dataset size, which is what catches N+1
+queries; latency budgets are only checked for the sizes they list.
+"""
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from formulanerdapi.models import Circuit, Driver, Nation, User
+from formulanerdapi.utils.profiling import profile_request
+
+BUDGETS_PATH = Path(__file__).with_name('endpoint_budgets.json')
+
+
+def load_budgets(path=BUDGETS_PATH):
+    """Returns:
+        dict -- route name to its request options and budgets
+    """
+    with open(path, encoding='utf-8') as budgets:
+        return json.load(budgets)
+
+
+def add_users(count):
+    """Create `count` API users on top of a seeded dataset, which has none"""
+    nations = list(Nation.objects.order_by('pk').values_list('pk', flat=True)[:count])
+    drivers = list(Driver.objects.order_by('pk').values_list('pk', flat=True)[:count])
+    circuits = list(Circuit.objects.order_by('pk').values_list('pk', flat=True)[:count])
+    User.objects.bulk_create(
+        User(
+            uid=f'bench-{index}', name=f'Bench User {index}',
+            nation_id=nations[index % len(nations)], favorite_driver_id=drivers[index % len(drivers)],
+            favorite_circuit_id=circuits[index % len(circuits)],
+        )
+        for index in range(count)
+    )
+
+
+def get_client():
+    """Returns:
+        APIClient -- signed in as a staff account, which the export routes need
+    """
+    staff, _ = get_user_model().objects.get_or_create(username='bench-staff', defaults={'is_staff': True})
+    client = APIClient()
+    client.force_authenticate(staff)
+    return client
+
+
+def get_viewset_model(viewset):
+    """Returns:
+        Model -- the model a viewset's serializer renders, or None
+    """
+    if not hasattr(viewset, 'get_serializer_class'):
+        return None
+    meta = getattr(viewset().get_serializer_class(), 'Meta', None)
+    return getattr(meta, 'model', None)
+
+
+def get_read_routes(router):
+    """Every route of a router that answers GET
+
+    Returns:
+        list -- (route name, path with a {pk} placeholder on detail routes,
+        model to take detail pks from)
+    """
+    routes = [('api-root', '/', None)]
+    for prefix, viewset, basename in router.registry:
+        model = get_viewset_model(viewset)
+        if hasattr(viewset, 'list'):
+            routes.append((f'{basename}-list', f'/{prefix}', None))
+        if hasattr(viewset, 'retrieve'):
+            routes.append((f'{basename}-detail', f'/{prefix}/{{pk}}', model))
+        for action in viewset.get_extra_actions():
+            if 'get' not in action.mapping:
+                continue
+            if action.detail:
+                routes.append((f'{basename}-{action.url_name}', f'/{prefix}/{{pk}}/{action.url_path}', model))
+            else:
+                routes.append((f'{basename}-{action.url_name}', f'/{prefix}/{action.url_path}', None))
+    return routes
+
+
+def get_paths(path, model, budget, count):
+    """Returns:
+        list -- `count` request paths for a route, detail pks spread evenly
+        over the model's table
+    """
+    query = budget.get('query')
+    suffix = f'?{query}' if query else ''
+    if '{pk}' not in path:
+        return [path + suffix] * count
+    if 'pk' in budget:
+        pks = [budget['pk']]
+    else:
+        pks = list(model.objects.order_by('pk').values_list('pk', flat=True))
+    return [path.format(pk=pks[index * len(pks) // count]) + suffix for index in range(count)]
+
+
+def measure_request(client, path):
+    """Make one GET request and read its whole body, streamed or not
+
+    Returns:
+        dict -- status, seconds, queries, sql_seconds, serializer_seconds, bytes
+    """
+    with profile_request() as profile:
+        started = time.perf_counter()
+        response = client.get(path, HTTP_ACCEPT='application/json')
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        elapsed = time.perf_counter() - started
+    return {
+        'status': response.status_code,
+        'seconds': elapsed,
+        'queries': profile.queries,
+        'sql_seconds': profile.sql_time,
+        'serializer_seconds': profile.serializer_time,
+        'bytes': len(body),
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(samples):
+    """Returns:
+        dict -- latency percentiles and per-request medians over some samples
+    """
+    def median_ms(key):
+        return round(percentile([sample[key] for sample in samples], 0.5) * 1000, 3)
+
+    return {
+        'status': max(sample['status'] for sample in samples),
+        'requests': len(samples),
+        'p50_ms': median_ms('seconds'),
+        'p99_ms': round(percentile([sample['seconds'] for sample in samples], 0.99) * 1000, 3),
+        'queries': max(sample['queries'] for sample in samples),
+        'sql_ms': median_ms('sql_seconds'),
+        'serializer_ms': median_ms('serializer_seconds'),
+        'bytes': max(sample['bytes'] for sample in samples),
+    }
+
+
+def check_budget(name, result, budget, races):
+    """Returns:
+        list -- messages for every budget a route's result exceeds
+    """
+    problems = []
+    if result['status'] != 200:
+        problems.append(f"{name}: status {result['status']}")
+    if 'max_queries' not in budget:
+        problems.append(f"{name}: no max_queries budget")
+    elif result['queries'] > budget['max_queries']:
+        problems.append(f"{name}: {result['queries']} queries, budget {budget['max_queries']}")
+    max_p99 = budget.get('max_p99_ms', {}).get(str(races))
+    if max_p99 is not None and result['p99_ms'] > max_p99:
+        problems.append(f"{name}: p99 {result['p99_ms']:.1f} ms at {races:,} races, budget {max_p99} ms")
+    return problems
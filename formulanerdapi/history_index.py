@@ -0,0 +1,114 @@
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+
+from django.db.models import F, Max, Q
+
+from formulanerdapi.models import DriverConstructorHistory
+from formulanerdapi.utils.versions import get_versions
+
+
+class ConstructorIndex:
+    """(driver, year) to constructor lookups over driver constructor history
+
+    Each driver's spells are kept as parallel arrays sorted by start year, so
+    a lookup is a bisect plus a short walk back over spells that started
+    earlier, instead of a scan of the whole history table.
+    """
+
+    def __init__(self, spells):
+        """Build from (driver id, start year, end year, constructor id) rows
+        sorted by driver and start year"""
+        self._starts = defaultdict(list)
+        self._spells = defaultdict(list)
+        for driver_id, start_year, end_year, constructor_id in spells:
+            self._starts[driver_id].append(start_year)
+            self._spells[driver_id].append((end_year, constructor_id))
+
+    def __len__(self):
+        return sum(len(starts) for starts in self._starts.values())
+
+    def constructor_for(self, driver_id, year):
+        """Find who a driver drove for in a year
+
+        When spells overlap (a mid-season move) the one that started last
+        wins.
+
+        Returns:
+            int -- constructor id, or None when no spell covers the year
+        """
+        starts = self._starts.get(driver_id)
+        if not starts:
+            return None
+        spells = self._spells[driver_id]
+        for position in range(bisect_right(starts, year) - 1, -1, -1):
+            end_year, constructor_id = spells[position]
+            if end_year is None or end_year >= year:
+                return constructor_id
+        return None
+
+
+def build_constructor_index():
+    """Returns:
+        ConstructorIndex -- built from the whole history table in one query
+    """
+    return ConstructorIndex(
+        DriverConstructorHistory.objects.order_by('driver_id', 'start_year', 'id')
+        .values_list('driver_id', 'start_year', 'end_year', 'constructor_id')
+        .iterator(chunk_size=5000)
+    )
+
+
+def find_longest_spell():
+    """Returns:
+        int -- the most years any finished spell lasted, 0 when there are none
+    """
+    longest = DriverConstructorHistory.objects.filter(end_year__isnull=False).aggregate(
+        longest=Max(F('end_year') - F('start_year'))
+    )['longest']
+    return longest or 0
+
+
+_cache_lock = threading.Lock()
+_cache = {}
+
+
+def get_cached(build):
+    """Return what build() makes from the history table, rebuilding only
+    when the table's version has moved on since the last build"""
+    version = get_versions([DriverConstructorHistory])[DriverConstructorHistory._meta.db_table]
+    cached = _cache.get(build)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _cache_lock:
+        cached = _cache.get(build)
+        if cached is None or cached[0] != version:
+            cached = _cache[build] = (version, build())
+    return cached[1]
+
+
+def get_constructor_index():
+    """Returns:
+        ConstructorIndex -- shared by the process, rebuilt after history writes
+    """
+    return get_cached(build_constructor_index)
+
+
+def filter_active(queryset, first_year, last_year=None):
+    """Keep history spells that overlap the years first_year..last_year
+
+    A spell overlaps when start_year <= last_year and it has not ended
+    before first_year. Written as is, that is a range on start_year alone,
+    which walks every earlier spell of the constructor. Instead, finished
+    spells are bounded by the longest spell on record, so start_year is
+    known to lie in a short window. Open spells are looked up separately in
+    the small partial index that holds only them.
+    """
+    if last_year is None:
+        last_year = first_year
+    earliest_start = first_year - get_cached(find_longest_spell)
+    return queryset.filter(
+        Q(end_year__isnull=True, start_year__lte=last_year)
+        | Q(start_year__gte=earliest_start, start_year__lte=last_year, end_year__gte=first_year)
+    )
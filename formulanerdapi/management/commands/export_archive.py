@@ -0,0 +1,78 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from formulanerdapi.archive import (
+    EXPORT_CHUNK_SIZE, EXPORT_TABLES, encode_value, get_export_columns, iter_export_rows, iter_jsonl
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Export every table to <table>.jsonl, or with --format columnar to "
+        "<table>/<column>.jsonl holding one JSON value per row"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help="Directory to write the export to")
+        parser.add_argument('--format', choices=('jsonl', 'columnar'), default='jsonl')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help="Rows fetched per round trip")
+
+    def handle(self, *args, **options):
+        directory = Path(options['directory'])
+        directory.mkdir(parents=True, exist_ok=True)
+
+        total = 0
+        started = time.perf_counter()
+        for name, model in EXPORT_TABLES:
+            table_started = time.perf_counter()
+            if options['format'] == 'columnar':
+                count = export_columnar(directory / name, model, options['chunk_size'])
+            else:
+                count = export_jsonl(directory / f'{name}.jsonl', model, options['chunk_size'])
+            total += count
+            self.report(name, count, time.perf_counter() - table_started)
+
+        self.report("total", total, time.perf_counter() - started)
+
+    def report(self, name, count, elapsed):
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{name}: {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+def export_jsonl(path, model, chunk_size):
+    """Write a table to one JSONL file
+
+    Returns:
+        int -- number of rows written
+    """
+    count = 0
+    with path.open('w', encoding='utf-8') as export_file:
+        for line in iter_jsonl(model, chunk_size):
+            export_file.write(line)
+            count += 1
+    return count
+
+
+def export_columnar(directory, model, chunk_size):
+    """Write a table as one file per column, rows aligned by line number
+
+    The table is read once; each value is appended to its column's file.
+
+    Returns:
+        int -- number of rows written
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    columns = get_export_columns(model)
+    files = [(directory / f'{column}.jsonl').open('w', encoding='utf-8') for column in columns]
+    count = 0
+    try:
+        for row in iter_export_rows(model, columns, chunk_size):
+            for export_file, value in zip(files, row):
+                export_file.write(encode_value(value) + '\n')
+            count += 1
+    finally:
+        for export_file in files:
+            export_file.close()
+    return count
@@ -0,0 +1,162 @@
+import time
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, models, transaction
+
+from formulanerdapi.archive import ARCHIVE_TABLES, find_archive_file, get_foreign_keys, read_rows
+from formulanerdapi.signals import bulk_write
+
+
+class Command(BaseCommand):
+    help = (
+        "Load nations, constructors, circuits, drivers, races and driver "
+        "constructor history from <table>.csv or <table>.jsonl files"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help="Directory holding the archive files")
+        parser.add_argument('--batch-size', type=int, default=2000, help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        directory = Path(options['directory'])
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory")
+
+        # Natural key (name) to id for every table rows can point at, kept
+        # up to date as new rows are inserted
+        keys = {}
+        for _, model in ARCHIVE_TABLES:
+            if any(field.name == 'name' for field in model._meta.fields):
+                keys[model] = {}
+                add_keys(keys[model], model.objects.values_list('name', 'pk'))
+
+        total = 0
+        started = time.perf_counter()
+        # All or nothing: a bad row anywhere leaves the database as it was,
+        # so no table is left half imported behind stale versions and caches
+        try:
+            with transaction.atomic():
+                for name, model in ARCHIVE_TABLES:
+                    path = find_archive_file(directory, name)
+                    if path is None:
+                        continue
+
+                    table_started = time.perf_counter()
+                    count = self.import_file(path, model, keys, options['batch_size'])
+                    if count:
+                        reset_sequences(model)
+                        bulk_write.send(sender=model)
+                    total += count
+                    self.report(name, count, time.perf_counter() - table_started)
+        except IntegrityError as e:
+            # SQLite checks foreign keys, such as <name>_id columns pointing
+            # at no row, when the transaction commits
+            raise CommandError(f"nothing was imported: {e}")
+
+        self.report("total", total, time.perf_counter() - started)
+
+    def import_file(self, path, model, keys, batch_size):
+        """Insert every row of one archive file in batches
+
+        Returns:
+            int -- number of rows inserted
+        """
+        count = 0
+        batch = []
+        for line_number, row in read_rows(path):
+            try:
+                batch.append(build_instance(model, row, keys))
+            except (ValidationError, ValueError) as e:
+                raise CommandError(f"{path.name} line {line_number}: {e}")
+
+            if len(batch) >= batch_size:
+                count += self.insert_batch(model, batch, keys)
+                batch = []
+
+        if batch:
+            count += self.insert_batch(model, batch, keys)
+        return count
+
+    def insert_batch(self, model, batch, keys):
+        try:
+            model.objects.bulk_create(batch)
+        except IntegrityError as e:
+            # Such as an id the table already has
+            raise CommandError(f"{model._meta.verbose_name_plural}: {e}")
+        if model in keys:
+            add_keys(keys[model], ((instance.name, instance.pk) for instance in batch))
+        return len(batch)
+
+    def report(self, name, count, elapsed):
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{name}: {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+def add_keys(keys, pairs):
+    """Add (name, id) pairs to a table's natural keys
+
+    A name shared by several rows maps to None: it does not say which one
+    is meant.
+    """
+    for name, pk in pairs:
+        keys[name] = None if name in keys else pk
+
+
+def reset_sequences(model):
+    """Move the table's id sequence past ids inserted as given, on databases
+    that keep one (SQLite picks the next id from the table itself)"""
+    statements = connection.ops.sequence_reset_sql(no_style(), [model])
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def build_instance(model, row, keys):
+    """Build an unsaved model instance from one archive row
+
+    Related rows are given either by id (nation_id) or by natural key
+    (nation, holding the nation's name). A row's own id is kept when it
+    has one, so the ids of an export_archive dump, and the <name>_id
+    columns pointing at them, still match once imported. Values are
+    converted with the model fields, so CSV strings and JSON values are
+    both accepted.
+
+    Returns:
+        Model -- validated instance ready for bulk_create
+    """
+    values = {}
+    for field in get_foreign_keys(model):
+        if row.get(field.attname) not in (None, ''):
+            values[field.attname] = int(row[field.attname])
+        elif row.get(field.name) not in (None, ''):
+            name = row[field.name]
+            verbose_name = field.related_model._meta.verbose_name
+            try:
+                pk = keys[field.related_model][name]
+            except KeyError:
+                raise ValueError(f"unknown {verbose_name} '{name}'")
+            if pk is None:
+                raise ValueError(f"more than one {verbose_name} is named '{name}'; give {field.attname} instead")
+            values[field.attname] = pk
+        elif not field.null:
+            raise ValueError(f"missing {field.name}")
+
+    for field in model._meta.concrete_fields:
+        if field.many_to_one or field.name not in row:
+            continue
+        value = row[field.name]
+        if field.primary_key and value in (None, ''):
+            continue
+        if value == '' and field.null:
+            value = None
+        elif isinstance(field, models.BooleanField) and isinstance(value, str):
+            value = value.strip().lower() in ('1', 'true', 't', 'yes')
+        values[field.attname] = field.to_python(value)
+
+    instance = model(**values)
+    instance.clean()
+    return instance
@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from formulanerdapi.search import rebuild_search_index, uses_fts
+
+
+class Command(BaseCommand):
+    help = "Refill the full-text search table from drivers, constructors, circuits and races"
+
+    def handle(self, *args, **options):
+        if not uses_fts():
+            raise CommandError("This database has no FTS5 search table; /search uses substring matches instead")
+
+        started = time.perf_counter()
+        count = rebuild_search_index()
+        self.stdout.write(f"Indexed {count:,} rows in {time.perf_counter() - started:.2f}s")
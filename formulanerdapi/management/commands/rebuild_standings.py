@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from formulanerdapi.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Recompute driver standings from races, for every season or just --season"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', type=int, help="Only rebuild this season")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_standings(options['season'])
+        self.stdout.write(f"Rebuilt {count:,} standings rows in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from formulanerdapi.replication import replay
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database over its replicas, once or --every few seconds"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', action='append', help="Replica alias, repeatable (default: DATABASE_REPLICAS)")
+        parser.add_argument('--every', type=float, help="Keep replaying, this many seconds apart")
+
+    def handle(self, *args, **options):
+        replicas = options['replica'] or list(settings.DATABASE_REPLICAS)
+        if not replicas:
+            raise CommandError("No replicas: pass --replica or set DATABASE_REPLICAS.")
+        unknown = set(replicas) - set(settings.DATABASES)
+        if unknown:
+            raise CommandError(f"Unknown database: {', '.join(sorted(unknown))}")
+
+        while True:
+            for replica in replicas:
+                started = time.perf_counter()
+                try:
+                    replay(replica)
+                except DatabaseError as e:
+                    raise CommandError(str(e)) from e
+                self.stdout.write(f"Replayed to {replica} in {time.perf_counter() - started:.2f}s")
+            if options['every'] is None:
+                break
+            time.sleep(options['every'])
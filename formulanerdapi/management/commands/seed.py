@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from formulanerdapi.seeding import SEED_BATCH_SIZE, SEEDED_MODELS, seed_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill an empty database with synthetic nations, constructors, circuits, "
+        "--scale drivers with their careers, and races from 1950 to 2024, e.g. "
+        "--scale 20000 --races 1000000"
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = None
+        self.table_started = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, required=True, help="Number of drivers; other tables grow with it")
+        parser.add_argument('--races', type=int, help="Number of races (default: --scale)")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed gives the same data")
+        parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE, help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        if options['scale'] < 3:
+            raise CommandError("--scale must be at least 3, to fill a podium.")
+        filled = [model._meta.db_table for model in SEEDED_MODELS if model.objects.exists()]
+        if filled:
+            raise CommandError(f"Seed an empty database; found {', '.join(filled)}. Run manage.py flush first.")
+
+        self.started = time.perf_counter()
+        self.table_started = self.started
+        counts = seed_database(
+            options['scale'], options['races'], options['seed'], options['batch_size'], report=self.report
+        )
+        total = sum(counts.values())
+        self.stdout.write(f"total: {total:,} rows in {time.perf_counter() - self.started:.2f}s")
+
+    def report(self, model, count):
+        now = time.perf_counter()
+        elapsed = now - self.table_started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{model._meta.db_table}: {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+        self.table_started = now
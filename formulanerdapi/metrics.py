@@ -0,0 +1,241 @@
+"""Request metrics, kept in process and served in the Prometheus text format
+
+Every thread counts into a shard of its own, so recording a request takes
+no lock and threads of a WSGI worker never wait on each other; a scrape
+adds the shards up. Pre-forked workers each have their own registry: with
+settings.METRICS_MULTIPROCESS_DIR set, each one writes its totals to a
+file in that directory every METRICS_FLUSH_INTERVAL seconds, and a scrape
+of any worker adds up every file. Totals of workers that have exited stay
+in, so counters only ever go up; clear the directory on deploy.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+COUNTERS = {
+    'formulanerd_requests_total': 'Requests answered, by route, method and status code.',
+    'formulanerd_request_errors_total': 'Requests answered with a 5xx status, by route and method.',
+    'formulanerd_response_cache_total': 'Cacheable responses by route and result: hit, miss or not_modified.',
+}
+HISTOGRAMS = {
+    'formulanerd_request_duration_seconds': ('Time to answer a request, by route and method.', LATENCY_BUCKETS),
+    'formulanerd_db_queries_per_request': ('SQL statements run for one request, by route.', QUERY_BUCKETS),
+    'formulanerd_db_duration_seconds': ('Time one request spent running SQL, by route.', LATENCY_BUCKETS),
+}
+CACHE_HIT_RATIO = 'formulanerd_response_cache_hit_ratio'
+
+
+class MetricsRegistry:
+    """Counters and histograms, keyed by (name, labels)
+
+    Labels are tuples of (name, value) pairs. A counter is a number; a
+    histogram is a list of per-bucket counts, one more for +Inf, then the
+    sum of observed values.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget every count, as in a freshly forked worker"""
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed = time.monotonic()
+        # Names this process's file, so a later process reusing the pid
+        # does not overwrite the totals of the one before it
+        self._file_name = f'{os.getpid()}-{time.time_ns()}.json'
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name, labels, amount=1):
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        shard = self._shard()
+        key = (name, labels)
+        buckets = HISTOGRAMS[name][1]
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * (len(buckets) + 2)
+        values[bisect_left(buckets, value)] += 1
+        values[-1] += value
+
+    def collect(self):
+        """Add up every thread's shard
+
+        Copying a dict or a list is a single step under the GIL, so shards
+        are read while their threads keep counting.
+
+        Returns:
+            dict -- (name, labels) to total
+        """
+        with self._lock:
+            shards = list(self._shards)
+        totals = {}
+        for shard in shards:
+            for key, value in shard.copy().items():
+                add_value(totals, key, list(value) if isinstance(value, list) else value)
+        return totals
+
+    def flush(self, directory):
+        """Write this process's totals to its file in `directory`"""
+        path = Path(directory) / self._file_name
+        partial = path.with_suffix('.tmp')
+        with self._flush_lock:
+            partial.write_text(json.dumps([[name, labels, value] for (name, labels), value in self.collect().items()]))
+            # Readers see the old file or the new one, never half of one
+            os.replace(partial, path)
+            self._flushed = time.monotonic()
+
+    def maybe_flush(self):
+        """Flush to METRICS_MULTIPROCESS_DIR if the last flush is older than
+        METRICS_FLUSH_INTERVAL, unless another thread is already at it"""
+        directory = settings.METRICS_MULTIPROCESS_DIR
+        if directory is None or time.monotonic() - self._flushed < settings.METRICS_FLUSH_INTERVAL:
+            return
+        if not self._flush_lock.locked():
+            self.flush(directory)
+
+
+def add_value(totals, key, value):
+    """Add a counter or histogram value into totals"""
+    total = totals.get(key)
+    if total is None:
+        totals[key] = value
+    elif isinstance(value, list):
+        totals[key] = [left + right for left, right in zip(total, value)]
+    else:
+        totals[key] = total + value
+
+
+def read_directory(directory):
+    """Add up the totals every process has written to `directory`
+
+    Returns:
+        dict -- (name, labels) to total
+    """
+    totals = {}
+    for path in Path(directory).glob('*.json'):
+        for name, labels, value in json.loads(path.read_text()):
+            add_value(totals, (name, tuple(tuple(label) for label in labels)), value)
+    return totals
+
+
+registry = MetricsRegistry()
+os.register_at_fork(after_in_child=registry.reset)
+
+
+@atexit.register
+def flush_at_exit():
+    if settings.configured and getattr(settings, 'METRICS_MULTIPROCESS_DIR', None) is not None:
+        registry.flush(settings.METRICS_MULTIPROCESS_DIR)
+
+
+def record_request(route, method, status_code, seconds, profile, cache_result=None):
+    """Count one answered request
+
+    `profile` is the RequestProfile that measured its SQL. `cache_result`
+    is hit, miss or not_modified for responses the cache could serve.
+    """
+    labels = (('route', route), ('method', method))
+    registry.inc('formulanerd_requests_total', labels + (('status', str(status_code)),))
+    if status_code >= 500:
+        registry.inc('formulanerd_request_errors_total', labels)
+    registry.observe('formulanerd_request_duration_seconds', labels, seconds)
+    route_labels = (('route', route),)
+    registry.observe('formulanerd_db_queries_per_request', route_labels, profile.queries)
+    registry.observe('formulanerd_db_duration_seconds', route_labels, profile.sql_time)
+    if cache_result is not None:
+        registry.inc('formulanerd_response_cache_total', route_labels + (('result', cache_result),))
+    registry.maybe_flush()
+
+
+def get_totals():
+    """Returns:
+        dict -- (name, labels) to total, over every worker in multiprocess mode
+    """
+    directory = settings.METRICS_MULTIPROCESS_DIR
+    if directory is None:
+        return registry.collect()
+    registry.flush(directory)
+    return read_directory(directory)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_sample(name, labels, value):
+    """Returns:
+        str -- one exposition line, `name{label="value",...} value`
+    """
+    label_text = ','.join(f'{label}="{escape_label(label_value)}"' for label, label_value in labels)
+    return f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}'
+
+
+def get_cache_hit_ratios(totals):
+    """Returns:
+        dict -- route labels to the share of cache lookups that hit
+    """
+    lookups = {}
+    for (name, labels), value in totals.items():
+        if name == 'formulanerd_response_cache_total':
+            route, result = labels[:-1], dict(labels)['result']
+            hits, misses = lookups.get(route, (0, 0))
+            if result == 'hit':
+                hits += value
+            elif result == 'miss':
+                misses += value
+            lookups[route] = (hits, misses)
+    return {route: hits / (hits + misses) for route, (hits, misses) in lookups.items() if hits + misses}
+
+
+def render_metrics(totals=None):
+    """Returns:
+        str -- every metric in the Prometheus text exposition format
+    """
+    if totals is None:
+        totals = get_totals()
+    by_name = {}
+    for (name, labels), value in sorted(totals.items()):
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, description in COUNTERS.items():
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} counter']
+        lines += [format_sample(name, labels, value) for labels, value in by_name.get(name, ())]
+    for name, (description, buckets) in HISTOGRAMS.items():
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+        for labels, value in by_name.get(name, ()):
+            # Buckets are stored one count each; Prometheus wants them cumulative
+            cumulative = 0
+            for bound, count in zip([str(bucket) for bucket in buckets] + ['+Inf'], value[:-1]):
+                cumulative += count
+                lines.append(format_sample(f'{name}_bucket', labels + (('le', bound),), cumulative))
+            lines.append(format_sample(f'{name}_sum', labels, value[-1]))
+            lines.append(format_sample(f'{name}_count', labels, cumulative))
+    lines += [
+        f'# HELP {CACHE_HIT_RATIO} Share of response cache lookups that hit, by route.',
+        f'# TYPE {CACHE_HIT_RATIO} gauge',
+    ]
+    lines += [format_sample(CACHE_HIT_RATIO, labels, ratio) for labels, ratio in get_cache_hit_ratios(totals).items()]
+    return '\n'.join(lines) + '\n'
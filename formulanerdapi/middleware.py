@@ -0,0 +1,217 @@
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.decorators import sync_and_async_middleware
+
+from formulanerdapi.metrics import record_request
+from formulanerdapi.routers import use_primary
+from formulanerdapi.slow_queries import get_view_name, install_on_thread_connections, set_view, track_view
+from formulanerdapi.utils.profiling import get_current_profile, profile_request
+
+profiling_logger = logging.getLogger('formulanerdapi.profiling')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """Let read-only requests read from replicas; pin writes to the primary"""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = use_primary.set(request.method not in SAFE_METHODS)
+            try:
+                return await get_response(request)
+            finally:
+                use_primary.reset(token)
+    else:
+        def middleware(request):
+            token = use_primary.set(request.method not in SAFE_METHODS)
+            try:
+                return get_response(request)
+            finally:
+                use_primary.reset(token)
+    return middleware
+
+
+def get_route(request):
+    """Returns:
+        str -- the matched URL's name (race-list, driver-detail, ...), or None
+    """
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else None
+
+
+def get_timings(profile, started, finished):
+    """Split a profiled request's time into milliseconds spent on SQL,
+    serializers, the rest of the view (middleware included) and rendering
+
+    Returns:
+        dict -- db, serializer, view, render and total
+    """
+    view_finished = profile.view_finished or finished
+    view = view_finished - started - profile.sql_time - profile.serializer_time
+    return {
+        'db': profile.sql_time * 1000,
+        'serializer': profile.serializer_time * 1000,
+        'view': max(view, 0) * 1000,
+        'render': (finished - view_finished) * 1000,
+        'total': (finished - started) * 1000,
+    }
+
+
+def get_server_timing(timings, queries):
+    """Returns:
+        str -- a Server-Timing header value for some timings
+    """
+    metrics = []
+    for name, duration in timings.items():
+        description = f';desc="{queries} queries"' if name == 'db' else ''
+        metrics.append(f'{name};dur={duration:.2f}{description}')
+    return ', '.join(metrics)
+
+
+class ProfilingMiddleware:
+    """Profile REQUEST_PROFILING_SAMPLE_RATE of requests into a Server-Timing
+    header and, with REQUEST_PROFILING_LOG, a JSON log line
+
+    A class rather than a function like the middleware above because Django
+    only calls process_template_response on a middleware instance, and that
+    is where the view ends and rendering starts. Streamed responses are
+    rendered after they leave the middleware, so their render time and any
+    SQL run while streaming are not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        self.log = settings.REQUEST_PROFILING_LOG
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        started = time.perf_counter()
+        with profile_request() as profile:
+            response = self.get_response(request)
+            self.finish(request, response, profile, started)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        with profile_request() as profile:
+            response = await self.get_response(request)
+            self.finish(request, response, profile, started)
+        return response
+
+    def process_template_response(self, request, response):
+        """Mark the end of the view: DRF responses are rendered after this"""
+        profile = get_current_profile()
+        if profile is not None:
+            profile.finish_view()
+        return response
+
+    def finish(self, request, response, profile, started):
+        timings = get_timings(profile, started, time.perf_counter())
+        response['Server-Timing'] = get_server_timing(timings, profile.queries)
+        if self.log:
+            profiling_logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'route': get_route(request),
+                'status': response.status_code,
+                'queries': profile.queries,
+                **{f'{name}_ms': round(duration, 3) for name, duration in timings.items()},
+            }))
+
+
+def get_cache_result(response):
+    """Returns:
+        str -- hit, miss or not_modified for responses of cached views, else None
+    """
+    if response.status_code == 304:
+        return 'not_modified'
+    cache = response.get('X-Cache')
+    return cache.lower() if cache else None
+
+
+class MetricsMiddleware:
+    """Count every request, its latency, its SQL and its cache outcome into
+    the registry /metrics serves, labelled by route name (race-list,
+    driver-detail, ...)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with profile_request() as profile:
+            response = self.get_response(request)
+        self.record(request, response, profile, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with profile_request() as profile:
+            response = await self.get_response(request)
+        self.record(request, response, profile, started)
+        return response
+
+    def record(self, request, response, profile, started):
+        record_request(
+            get_route(request) or 'unmatched', request.method, response.status_code,
+            time.perf_counter() - started, profile, get_cache_result(response)
+        )
+
+
+class SlowQueryMiddleware:
+    """Let the slow query recorder know which view each statement is run for
+
+    The view is named in process_view, which async views see too. Sync
+    requests also put the recorder on this thread's connections, in case
+    they were opened before slow queries were turned on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        install_on_thread_connections()
+        with track_view():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with track_view():
+            return await self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        set_view(get_route(request), get_view_name(view_func, request.method))
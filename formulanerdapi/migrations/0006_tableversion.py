@@ -0,0 +1,21 @@
+# Generated by Django 4.2.8 on 2026-10-17 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formulanerdapi', '0005_alter_circuit_nation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=75, unique=True)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
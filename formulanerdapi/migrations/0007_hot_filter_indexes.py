@@ -0,0 +1,37 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formulanerdapi', '0006_tableversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='driverconstructorhistory',
+            index=models.Index(fields=['start_year'], name='dch_start_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driverconstructorhistory',
+            index=models.Index(fields=['driver', 'start_year'], name='dch_driver_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driverconstructorhistory',
+            index=models.Index(fields=['constructor', 'start_year', 'end_year'], name='dch_constructor_years_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['date'], name='race_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['nation', 'date'], name='race_nation_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['circuit', 'date'], name='race_circuit_date_idx'),
+        ),
+    ]
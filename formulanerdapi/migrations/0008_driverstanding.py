@@ -0,0 +1,29 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formulanerdapi', '0007_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('wins', models.IntegerField(default=0)),
+                ('podiums', models.IntegerField(default=0)),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='formulanerdapi.driver')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='driverstanding',
+            constraint=models.UniqueConstraint(fields=('season', 'driver'), name='driver_standing_season_driver_unique'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formulanerdapi', '0008_driverstanding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='driverconstructorhistory',
+            index=models.Index(condition=models.Q(('end_year__isnull', True)), fields=['constructor', 'start_year'], name='dch_constructor_open_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+import sqlite3
+
+from django.db import migrations
+
+# The search index as it was when this migration was written; later
+# changes to formulanerdapi.search need migrations of their own. Rows of
+# each source get FTS rowid <pk> * 4 + <position here>.
+SEARCH_TABLE = 'formulanerdapi_search'
+SEARCH_SOURCES = (
+    # (type, table, title column, body expression over the row alias {row})
+    ('driver', 'formulanerdapi_driver', 'name', "coalesce({row}.about, '')"),
+    ('constructor', 'formulanerdapi_constructor', 'name', "coalesce({row}.about, '') || ' ' || coalesce({row}.location, '')"),
+    ('circuit', 'formulanerdapi_circuit', 'name', "coalesce({row}.designer, '')"),
+    ('race', 'formulanerdapi_race', 'name', "''"),
+)
+EVENTS = ('insert', 'update', 'delete')
+
+
+def fts5_available():
+    """Check whether the SQLite library Python links against has FTS5"""
+    try:
+        sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE probe USING fts5(text)')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def get_create_sql():
+    """Returns:
+        list -- statements creating the FTS5 table and its triggers, then
+        filling it from the source tables
+    """
+    statements = [
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+        "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+    ]
+    for position, (kind, table, title, body) in enumerate(SEARCH_SOURCES):
+        delete = f'DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * {len(SEARCH_SOURCES)} + {position};'
+        insert = (
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) '
+            f'VALUES (new.id * {len(SEARCH_SOURCES)} + {position}, new.{title}, {body.format(row="new")});'
+        )
+        for event, trigger_body in (('insert', insert), ('update', delete + insert), ('delete', delete)):
+            statements.append(
+                f'CREATE TRIGGER {SEARCH_TABLE}_{kind}_{event} AFTER {event.upper()} ON {table} '
+                f'BEGIN {trigger_body} END'
+            )
+    for position, (_, table, title, body) in enumerate(SEARCH_SOURCES):
+        statements.append(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) '
+            f'SELECT row.id * {len(SEARCH_SOURCES)} + {position}, row.{title}, {body.format(row="row")} '
+            f'FROM {table} AS row'
+        )
+    statements.append(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    return statements
+
+
+def create_index(apps, schema_editor):
+    """Only SQLite builds with FTS5 get the index; search falls back to
+    substring matches everywhere else"""
+    if schema_editor.connection.vendor == 'sqlite' and fts5_available():
+        for sql in get_create_sql():
+            schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for kind, *_ in SEARCH_SOURCES:
+            for event in EVENTS:
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{kind}_{event}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formulanerdapi', '0009_open_spell_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
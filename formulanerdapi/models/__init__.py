@@ -5,3 +5,6 @@ from .driverConstructorHistory import DriverConstructorHistory
 from .nation import Nation
 from .user import User
 from .race import Race
+from .tableVersion import TableVersion
+from .driverStanding import DriverStanding
+from .replicationHeartbeat import ReplicationHeartbeat
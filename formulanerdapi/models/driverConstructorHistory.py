@@ -11,6 +11,15 @@ class DriverConstructorHistory(models.Model):
   start_year = models.IntegerField()
   end_year = models.IntegerField(null=True, blank=True)
 
+  class Meta:
+    indexes = [
+      models.Index(fields=['start_year'], name='dch_start_year_idx'),
+      models.Index(fields=['driver', 'start_year'], name='dch_driver_start_idx'),
+      models.Index(fields=['constructor', 'start_year', 'end_year'], name='dch_constructor_years_idx'),
+      # Only spells still running, for "who drives for X now / in year Y"
+      models.Index(fields=['constructor', 'start_year'], condition=models.Q(end_year__isnull=True), name='dch_constructor_open_idx'),
+    ]
+
   def clean(self):
         if self.end_year and self.end_year < self.start_year:
             raise ValidationError("End year cannot be before start year.")
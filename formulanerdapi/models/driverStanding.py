@@ -0,0 +1,16 @@
+from django.db import models
+from .driver import Driver
+
+class DriverStanding(models.Model):
+  """A driver's championship totals for one season, kept up to date from races"""
+
+  season = models.IntegerField()
+  driver = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name="standings")
+  points = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+  wins = models.IntegerField(default=0)
+  podiums = models.IntegerField(default=0)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=['season', 'driver'], name='driver_standing_season_driver_unique'),
+    ]
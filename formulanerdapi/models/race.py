@@ -13,3 +13,10 @@ class Race(models.Model):
   winner_driver = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name="wins")
   p2_driver = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name="second_place_finishes")
   p3_driver = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name="third_place_finishes")
+
+  class Meta:
+    indexes = [
+      models.Index(fields=['date'], name='race_date_idx'),
+      models.Index(fields=['nation', 'date'], name='race_nation_date_idx'),
+      models.Index(fields=['circuit', 'date'], name='race_circuit_date_idx'),
+    ]
@@ -0,0 +1,7 @@
+from django.db import models
+
+class ReplicationHeartbeat(models.Model):
+  """When the primary last stamped itself; replicas read their copy of
+  this row to tell how far behind they are"""
+
+  beat = models.BigIntegerField(default=0)
@@ -0,0 +1,7 @@
+from django.db import models
+
+class TableVersion(models.Model):
+  """Change counter for a model's table, bumped on every write to it"""
+
+  table = models.CharField(max_length=75, unique=True)
+  version = models.BigIntegerField(default=0)
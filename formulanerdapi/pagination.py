@@ -0,0 +1,157 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+
+
+class KeysetPagination(CursorPagination):
+    """Opaque cursor pagination for the list endpoints
+
+    Pagination is opt-in: clients ask for a page with ?page_size= and then
+    follow the cursors in the Link header. Without page_size the endpoint
+    keeps returning the full list. Because each page filters on the last
+    seen key instead of using OFFSET, page N costs the same as page 1.
+
+    The cursor holds the whole key of a row, every field of `ordering`
+    (whose last field must be unique), not only the first one as
+    CursorPagination's does. Rows sharing a date or a season are then
+    paged through by id rather than by an OFFSET into the tie, which
+    CursorPagination caps at offset_cutoff and so never gets past.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = ('id',)
+
+    def __init__(self):
+        self.base_url = None
+        self.cursor = None
+        self.page = None
+        self.has_next = False
+        self.has_previous = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Returns:
+            list -- the rows of the page, or None without ?page_size=
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.get_cursor_position(queryset.model)
+
+        queryset = queryset.order_by(*(f'-{field}' if reverse else field for field in self.ordering))
+        if position is not None:
+            queryset = queryset.filter(self.get_after(position, reverse))
+
+        # One row more than the page, to tell whether another one follows
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_following
+        else:
+            self.has_next, self.has_previous = has_following, position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_cursor_position(self, model):
+        """Read the key out of the cursor, each value converted by its
+        model field, so a tampered cursor is a 404 like any other bad one
+        rather than an error in the query
+
+        Returns:
+            list -- the key the cursor points after, or None on the first page
+        """
+        if self.cursor is None or self.cursor.position is None:
+            return None
+        try:
+            position = json.loads(self.cursor.position)
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError('Cursor position does not match the ordering')
+            position = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+            if None in position:
+                raise ValueError('Cursor position has an empty value')
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_after(self, position, reverse):
+        """Row value comparison `(a, b, id) > (x, y, z)`, spelled out as
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z)`
+
+        The leading `a >= x` adds nothing to the result but bounds the
+        range read from the index on `a`.
+
+        Returns:
+            Q -- rows after the key in the page's direction
+        """
+        lookup = 'lt' if reverse else 'gt'
+        after = Q()
+        for index, field in enumerate(self.ordering):
+            equal = dict(zip(self.ordering[:index], position[:index]))
+            after |= Q(**equal, **{f'{field}__{lookup}': position[index]})
+        return Q(**{f'{self.ordering[0]}__{lookup}e': position[0]}) & after
+
+    def get_link(self, instance, reverse):
+        """Returns:
+            str -- the URL of the page after (or before) `instance`
+        """
+        position = json.dumps([getattr(instance, field) for field in self.ordering], cls=DjangoJSONEncoder)
+        return self.encode_cursor(Cursor(offset=0, reverse=reverse, position=position))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # A page before the first row; the next one starts over
+            return self.encode_cursor(Cursor(offset=0, reverse=False, position=None))
+        return self.get_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # A page past the last row; the one before it ends the list
+            return self.encode_cursor(Cursor(offset=0, reverse=True, position=None))
+        return self.get_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        """Return the page as a plain list with next/prev in the Link header
+
+        Returns:
+            Response -- JSON serialized page of results
+        """
+        links = []
+        next_link = self.get_next_link()
+        previous_link = self.get_previous_link()
+        if next_link is not None:
+            links.append(f'<{next_link}>; rel="next"')
+        if previous_link is not None:
+            links.append(f'<{previous_link}>; rel="prev"')
+
+        headers = {'Link': ', '.join(links)} if links else None
+        return Response(data, headers=headers)
+
+
+class RaceDatePagination(KeysetPagination):
+    """Races are paged through in calendar order"""
+    ordering = ('date', 'id')
+
+
+class StartYearPagination(KeysetPagination):
+    """Driver constructor histories are paged through by season"""
+    ordering = ('start_year', 'id')
@@ -0,0 +1,68 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both raise a ValueError on malformed JSON
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that reads UTF-8 bodies with orjson when it is installed
+
+    Gives the same data as JSONParser. Other encodings, and bodies orjson
+    turns down (integers past 64 bits, malformed JSON, which then gets
+    JSONParser's error message), are left to JSONParser.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            try:
+                return json.loads(body.decode(encoding), parse_constant=self.reject_constant)
+            except ValueError as exc:
+                raise ParseError(f'JSON parse error - {exc}')
+
+    @staticmethod
+    def reject_constant(constant):
+        """NaN and Infinity are not JSON; JSONParser's strict mode turns them down too"""
+        raise ValueError(f'Out of range float values are not JSON compliant: {constant!r}')
+
+
+class NDJSONParser(BaseParser):
+    """Parse newline-delimited JSON lazily, one object per line
+
+    Returns a generator so a large upload is never held in memory at once.
+    A malformed line is yielded as a ParseError in its place rather than
+    raised, so the consumer can report it and carry on with the lines after
+    it (a raised error would end the generator).
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        def rows():
+            for line_number, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json_loads(line.decode(encoding))
+                except ValueError as exc:
+                    yield ParseError(f'NDJSON parse error on line {line_number} - {exc}')
+
+        return rows()
@@ -0,0 +1,43 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Non-str keys are written as strings, as the json module does. Dates,
+# times and datetimes are passed to the encoder rather than written by
+# orjson, which keeps microseconds and +00:00 where DRF trims them
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that writes compact JSON with orjson when it is installed
+
+    The bytes are the ones JSONRenderer writes: values orjson has no
+    native form for (Decimal, datetimes, lazy strings, querysets) go
+    through DRF's encoder, and U+2028/U+2029 are escaped the same way.
+    Floats in exponent form are spelled 1e-5 rather than 1e-05. Indented
+    output, ASCII-only or non-compact settings, and anything orjson cannot
+    write (integers past 64 bits) are left to JSONRenderer, as is
+    everything when orjson is not installed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Valid JSON but not valid JavaScript; JSONRenderer escapes them too
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,77 @@
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from formulanerdapi.models import ReplicationHeartbeat
+
+HEARTBEAT_ID = 1
+
+# Replica alias to (checked at, lag in seconds), shared by this process's threads
+_lags = {}
+
+
+def beat(using=DEFAULT_DB_ALIAS):
+    """Stamp the primary's heartbeat row with the current time
+
+    Replication carries the row to every replica, where its age is the
+    replica's lag. With streaming replication run this every second or so;
+    replay() does it for SQLite replicas.
+    """
+    ReplicationHeartbeat.objects.using(using).update_or_create(pk=HEARTBEAT_ID, defaults={'beat': time.time_ns()})
+
+
+def get_replica_lag(alias):
+    """Returns:
+        float -- seconds since the replica's heartbeat, infinite when it has
+        none or cannot be reached. Checked at most every
+        settings.REPLICA_LAG_CHECK_INTERVAL seconds.
+    """
+    now = time.monotonic()
+    checked = _lags.get(alias)
+    if checked is not None and now - checked[0] < getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 1):
+        return checked[1]
+
+    try:
+        stamped = ReplicationHeartbeat.objects.using(alias).filter(pk=HEARTBEAT_ID).values_list('beat', flat=True).first()
+    except DatabaseError:
+        stamped = None
+    lag = float('inf') if stamped is None else max(0.0, (time.time_ns() - stamped) / 1e9)
+    _lags[alias] = (now, lag)
+    return lag
+
+
+def clear_replica_lags(alias=None):
+    """Forget measured lags, for one replica or all of them"""
+    if alias is None:
+        _lags.clear()
+    else:
+        _lags.pop(alias, None)
+
+
+def choose_replica():
+    """Returns:
+        str -- a random replica within settings.REPLICA_MAX_LAG, or None
+        when every replica is too far behind
+    """
+    max_lag = getattr(settings, 'REPLICA_MAX_LAG', 5)
+    replicas = [alias for alias in getattr(settings, 'DATABASE_REPLICAS', ()) if get_replica_lag(alias) <= max_lag]
+    return random.choice(replicas) if replicas else None
+
+
+def replay(replica, primary=DEFAULT_DB_ALIAS):
+    """Bring an SQLite replica up to date by copying the primary over it
+
+    Stands in for replication when both databases are local SQLite files:
+    stamps the heartbeat, then copies the whole primary with SQLite's
+    online backup API, which readers of the replica never see half done.
+    """
+    beat(primary)
+    source, target = connections[primary], connections[replica]
+    if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+        raise DatabaseError("Only SQLite databases can be replayed; use the database's own replication.")
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection)
+    clear_replica_lags(replica)
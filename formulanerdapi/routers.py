@@ -0,0 +1,39 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from formulanerdapi.replication import choose_replica
+
+# Whether the current request must read from the primary: None outside a
+# request, False for reads, True once the request is a write or has written.
+# Set by formulanerdapi.middleware.replica_routing_middleware.
+use_primary = ContextVar('use_primary', default=None)
+
+
+class ReplicaRouter:
+    """Send reads from read-only requests to a replica, everything else to
+    the primary
+
+    Only GET, HEAD and OPTIONS requests read from replicas, and only until
+    they write, so a request always reads its own writes. Replicas lagging
+    more than settings.REPLICA_MAX_LAG are skipped; with none left, reads
+    fall back to the primary. Code outside a request (management commands,
+    the shell) always uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if use_primary.get() is not False:
+            return DEFAULT_DB_ALIAS
+        return choose_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if use_primary.get() is False:
+            use_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, 'DATABASE_REPLICAS', ())}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,195 @@
+import re
+import sqlite3
+from functools import lru_cache
+
+from django.db import connection
+from django.db.models import Q
+
+from formulanerdapi.models import Circuit, Constructor, Driver, Race
+from formulanerdapi.utils.versions import bump_version
+
+SEARCH_TABLE = 'formulanerdapi_search'
+
+# (type, model, title column, other searched columns). A row's FTS rowid is
+# <pk> * len(SEARCH_SOURCES) + <position here>, so triggers can find and
+# replace it without scanning the index. Only append to this list: moving
+# an entry changes every rowid and needs a rebuild_search_index.
+SEARCH_SOURCES = (
+    ('driver', Driver, 'name', ('about',)),
+    ('constructor', Constructor, 'name', ('about', 'location')),
+    ('circuit', Circuit, 'name', ('designer',)),
+    ('race', Race, 'name', ()),
+)
+
+# bm25() column weights: a match in the name counts ten times one elsewhere
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+TERM_PATTERN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=None)
+def fts5_available():
+    """Check whether the SQLite library Python links against has FTS5"""
+    try:
+        sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE probe USING fts5(text)')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+_fts_databases = set()
+
+
+def uses_fts(using=connection):
+    """Returns:
+        bool -- whether a connection's database has the FTS5 search table
+    """
+    if using.alias in _fts_databases:
+        return True
+    if using.vendor == 'sqlite' and fts5_available() and SEARCH_TABLE in using.introspection.table_names():
+        _fts_databases.add(using.alias)
+        return True
+    return False
+
+
+def get_source_sql(position, model, title, columns, alias):
+    """SQL expressions for one source table's rowid, title and body, written
+    against the row alias `alias`
+
+    Returns:
+        tuple -- (rowid, title, body)
+    """
+    rowid = f'{alias}.{model._meta.pk.column} * {len(SEARCH_SOURCES)} + {position}'
+    body = " || ' ' || ".join(f"coalesce({alias}.{column}, '')" for column in columns) or "''"
+    return rowid, f'{alias}.{title}', body
+
+
+def create_search_index(using=connection):
+    """Create the FTS5 table, the triggers that keep it in sync, and fill it"""
+    with using.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+            "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        for position, (kind, model, title, columns) in enumerate(SEARCH_SOURCES):
+            old_rowid, _, _ = get_source_sql(position, model, title, columns, 'old')
+            new_rowid, new_title, new_body = get_source_sql(position, model, title, columns, 'new')
+            delete = f'DELETE FROM {SEARCH_TABLE} WHERE rowid = {old_rowid};'
+            insert = f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) VALUES ({new_rowid}, {new_title}, {new_body});'
+            for event, statements in (('insert', insert), ('update', delete + insert), ('delete', delete)):
+                cursor.execute(
+                    f'CREATE TRIGGER {SEARCH_TABLE}_{kind}_{event} AFTER {event.upper()} ON {model._meta.db_table} '
+                    f'BEGIN {statements} END'
+                )
+    rebuild_search_index(using)
+
+
+def drop_search_index(using=connection):
+    """Drop the FTS5 table and its triggers"""
+    with using.cursor() as cursor:
+        for kind, *_ in SEARCH_SOURCES:
+            for event in ('insert', 'update', 'delete'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{kind}_{event}')
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def rebuild_search_index(using=connection):
+    """Refill the FTS5 table from the source tables, one INSERT ... SELECT
+    per table, then merge its segments
+
+    Bumps the source tables' versions, since cached search responses are
+    keyed on them.
+
+    Returns:
+        int -- number of rows indexed
+    """
+    count = 0
+    with using.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        for position, (_, model, title, columns) in enumerate(SEARCH_SOURCES):
+            rowid, title, body = get_source_sql(position, model, title, columns, 'row')
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) '
+                f'SELECT {rowid}, {title}, {body} FROM {model._meta.db_table} AS row'
+            )
+            count += cursor.rowcount
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    for _, model, _, _ in SEARCH_SOURCES:
+        bump_version(model)
+    return count
+
+
+def get_terms(query):
+    """Returns:
+        list -- the words in a search query, lower cased
+    """
+    return TERM_PATTERN.findall(query.lower())
+
+
+def search(query, kinds=None, limit=20):
+    """Find drivers, constructors, circuits and races matching every word
+    of a query, best match first
+
+    Each word also matches as a prefix ("ham" finds "Hamilton"). Uses the
+    FTS5 table and bm25 ranking where the database has it, and falls back
+    to case-insensitive substring matches elsewhere.
+
+    Returns:
+        list -- dicts of type, id and name
+    """
+    terms = get_terms(query)
+    sources = [
+        (position, source) for position, source in enumerate(SEARCH_SOURCES)
+        if kinds is None or source[0] in kinds
+    ]
+    if not terms or not sources:
+        return []
+    if uses_fts():
+        return search_fts(terms, sources, limit)
+    return search_fallback(terms, sources, limit)
+
+
+def search_fts(terms, sources, limit):
+    """Ranked search against the FTS5 table"""
+    # Quote every term so user input can never be read as FTS5 syntax
+    match = ' '.join(f'"{term}"*' for term in terms)
+    positions = ', '.join(str(position) for position, _ in sources)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid, title FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND rowid %% {len(SEARCH_SOURCES)} IN ({positions}) '
+            f'ORDER BY bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT}) LIMIT %s',
+            [match, limit]
+        )
+        rows = cursor.fetchall()
+    return [
+        {
+            'type': SEARCH_SOURCES[rowid % len(SEARCH_SOURCES)][0],
+            'id': rowid // len(SEARCH_SOURCES),
+            'name': title,
+        }
+        for rowid, title in rows
+    ]
+
+
+def search_fallback(terms, sources, limit):
+    """Substring search for databases without FTS5
+
+    Every term has to appear in one of the searched columns. Rows whose
+    name holds more of the terms rank above rows matching elsewhere.
+    """
+    results = []
+    for _, (kind, model, title, columns) in sources:
+        matches = Q()
+        for term in terms:
+            term_matches = Q(**{f'{title}__icontains': term})
+            for column in columns:
+                term_matches |= Q(**{f'{column}__icontains': term})
+            matches &= term_matches
+        for pk, name in model.objects.filter(matches).values_list('pk', title)[:limit]:
+            in_name = sum(term in name.lower() for term in terms)
+            results.append((-in_name, name, {'type': kind, 'id': pk, 'name': name}))
+
+    results.sort(key=lambda result: result[:2])
+    return [result for _, _, result in results[:limit]]
@@ -0,0 +1,307 @@
+import random
+from datetime import date
+from itertools import islice
+
+from django.db import connection, transaction
+from faker import Faker
+
+from formulanerdapi.models import Circuit, Constructor, Driver, DriverConstructorHistory, Nation, Race
+from formulanerdapi.search import create_search_index, drop_search_index, uses_fts
+from formulanerdapi.signals import bulk_write
+
+FIRST_SEASON = 1950
+LAST_SEASON = 2024
+SEED_BATCH_SIZE = 10000
+
+# Faker is called a few thousand times to fill pools of names, places and
+# blurbs, and rows are assembled from the pools with a seeded Random, which
+# is what lets a million rows take seconds rather than minutes
+POOL_SIZE = 2000
+
+SEEDED_MODELS = (Nation, Constructor, Circuit, Driver, DriverConstructorHistory, Race)
+CONSTRUCTOR_SUFFIXES = ('Racing', 'Motorsport', 'Grand Prix', 'Engineering', 'F1 Team', 'Racing Team')
+CIRCUIT_SUFFIXES = ('Circuit', 'Autodrome', 'Ring', 'Raceway', 'Street Circuit', 'International Circuit')
+CIRCUIT_TYPES = ('Permanent', 'Street', 'Road')
+
+
+def get_counts(scale, races=None):
+    """Rows of each table for a dataset with `scale` drivers
+
+    Returns:
+        dict -- model to number of rows (histories follow the careers)
+    """
+    return {
+        Nation: max(10, min(200, scale // 25)),
+        Constructor: max(10, scale // 5),
+        Circuit: max(10, scale // 10),
+        Driver: scale,
+        Race: scale if races is None else races,
+    }
+
+
+def make_pool(count, make):
+    """Returns:
+        list -- min(count, POOL_SIZE) values of make()
+    """
+    return [make() for _ in range(min(count, POOL_SIZE))]
+
+
+def insert(model, fields, rows, batch_size, report):
+    """Insert rows, given as tuples of `fields` values, in batches
+
+    Uses executemany rather than bulk_create: at a million rows Django's
+    per-field value preparation in bulk_create costs more than the inserts
+    themselves. Rows are written as given, ids included, and no signals
+    are sent.
+
+    Returns:
+        int -- number of rows inserted
+    """
+    columns = [model._meta.get_field(field).column for field in fields]
+    sql = (
+        f'INSERT INTO {model._meta.db_table} ({", ".join(columns)}) '
+        f'VALUES ({", ".join(["%s"] * len(columns))})'
+    )
+    count = 0
+    rows = iter(rows)
+    with connection.cursor() as cursor:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            cursor.executemany(sql, batch)
+            count += len(batch)
+    if report is not None:
+        report(model, count)
+    return count
+
+
+def seed_nations(fake, count, batch_size, report):
+    """Returns:
+        list -- (pk, name) of each nation, named after distinct countries
+    """
+    names = []
+    seen = set()
+    # Faker has about 240 distinct countries; repeats past that are numbered
+    while len(names) < count:
+        name = fake.country()[:60]
+        if name in seen:
+            name = f'{name} {len(names)}'
+        seen.add(name)
+        names.append(name)
+    nations = list(enumerate(names, 1))
+    insert(
+        Nation, ('id', 'name', 'flag_image_url'),
+        [(pk, name, f'https://flags.example.com/{pk}.png') for pk, name in nations], batch_size, report
+    )
+    return nations
+
+
+def seed_constructors(fake, rng, count, nations, batch_size, report):
+    """Returns:
+        list -- constructor pks
+    """
+    surnames = make_pool(count, fake.last_name)
+    cities = make_pool(count, fake.city)
+    phrases = make_pool(count, fake.catch_phrase)
+    insert(
+        Constructor,
+        ('id', 'name', 'location', 'nation', 'is_engine_manufacturer', 'about', 'constructor_image_url'),
+        [
+            (
+                pk, f'{rng.choice(surnames)} {rng.choice(CONSTRUCTOR_SUFFIXES)}', rng.choice(cities)[:50],
+                rng.choice(nations)[0], rng.random() < 0.1, rng.choice(phrases)[:255],
+                f'https://images.example.com/constructors/{pk}.png',
+            )
+            for pk in range(1, count + 1)
+        ],
+        batch_size, report
+    )
+    return list(range(1, count + 1))
+
+
+def seed_circuits(fake, rng, count, nations, batch_size, report):
+    """Returns:
+        list -- (pk, nation pk, nation name, length in km) of each circuit
+    """
+    cities = make_pool(count, fake.city)
+    designers = make_pool(count, fake.name)
+    rows, circuits = [], []
+    for pk in range(1, count + 1):
+        nation, nation_name = rng.choice(nations)
+        length = round(rng.uniform(3.0, 7.0), 3)
+        rows.append((
+            pk, f'{rng.choice(cities)} {rng.choice(CIRCUIT_SUFFIXES)}'[:75], nation, f'{length} km',
+            rng.choice(CIRCUIT_TYPES), rng.choice(designers)[:50], rng.randint(1920, LAST_SEASON - 1),
+            f'https://images.example.com/circuits/{pk}.png',
+        ))
+        circuits.append((pk, nation, nation_name, length))
+    insert(
+        Circuit,
+        ('id', 'name', 'nation', 'length', 'circuit_type', 'designer', 'year_built', 'circuit_image_url'),
+        rows, batch_size, report
+    )
+    return circuits
+
+
+def make_career(rng, constructors, start=None):
+    """One driver's career as consecutive, non-overlapping spells, starting
+    in a random season unless `start` is given
+
+    Returns:
+        list -- (constructor pk, start year, end year or None while still driving)
+    """
+    if start is None:
+        start = rng.randint(FIRST_SEASON, LAST_SEASON)
+    end = min(start + rng.randint(0, 11), LAST_SEASON)
+    cuts = sorted(rng.sample(range(start + 1, end + 1), rng.randint(0, min(3, end - start))))
+    spells = []
+    constructor = None
+    for spell_start, spell_end in zip([start] + cuts, [cut - 1 for cut in cuts] + [end]):
+        # Moving teams means a different team
+        previous, constructor = constructor, rng.choice(constructors)
+        while constructor == previous:
+            constructor = rng.choice(constructors)
+        spells.append((constructor, spell_start, spell_end))
+    if end >= LAST_SEASON:
+        constructor, spell_start, _ = spells[-1]
+        spells[-1] = (constructor, spell_start, None)
+    return spells
+
+
+def seed_drivers(fake, rng, count, nations, constructors, batch_size, report):
+    """Insert drivers and their constructor histories
+
+    Returns:
+        tuple -- (season to the pks of the drivers racing in it, number of histories)
+    """
+    first_names = make_pool(count, fake.first_name_male) + make_pool(count // 10, fake.first_name_female)
+    last_names = make_pool(count, fake.last_name)
+    phrases = make_pool(count, fake.sentence)
+
+    # The first three drivers debut in each season, so no season is short
+    # of a podium once there are enough drivers
+    season_count = LAST_SEASON - FIRST_SEASON + 1
+    careers = [
+        make_career(rng, constructors, FIRST_SEASON + index % season_count if index < 3 * season_count else None)
+        for index in range(count)
+    ]
+    insert(
+        Driver,
+        ('id', 'name', 'age', 'gender', 'nation', 'current_constructor', 'about', 'driver_image_url'),
+        [
+            (
+                pk, f'{rng.choice(first_names)} {rng.choice(last_names)}',
+                LAST_SEASON - career[0][1] + rng.randint(18, 24), 'Female' if rng.random() < 0.05 else 'Male',
+                rng.choice(nations)[0], career[-1][0], rng.choice(phrases),
+                f'https://images.example.com/drivers/{pk}.png',
+            )
+            for pk, career in enumerate(careers, 1)
+        ],
+        batch_size, report
+    )
+
+    histories = []
+    seasons = {season: [] for season in range(FIRST_SEASON, LAST_SEASON + 1)}
+    for driver, career in enumerate(careers, 1):
+        for constructor, start, end in career:
+            histories.append((len(histories) + 1, driver, constructor, start, end))
+            for season in range(start, (end or LAST_SEASON) + 1):
+                seasons[season].append(driver)
+    insert(
+        DriverConstructorHistory, ('id', 'driver', 'constructor', 'start_year', 'end_year'),
+        histories, batch_size, report
+    )
+    return seasons, len(histories)
+
+
+def make_races(rng, count, circuits, seasons):
+    """Yield `count` races spread evenly over every season from March to
+    November, each held in its circuit's nation, with a podium of three
+    drivers racing that season"""
+    season_count = LAST_SEASON - FIRST_SEASON + 1
+    everyone = sorted({driver for entrants in seasons.values() for driver in entrants})
+    pk = 0
+    for offset, season in enumerate(range(FIRST_SEASON, LAST_SEASON + 1)):
+        races = count // season_count + (offset < count % season_count)
+        # Below 3 drivers a season, thin seasons borrow from everyone
+        entrants = seasons[season] if len(seasons[season]) >= 3 else everyone
+        opener = date(season, 3, 1).toordinal()
+        for race in range(races):
+            pk += 1
+            circuit, nation, nation_name, length = rng.choice(circuits)
+            laps = rng.randint(44, 78)
+            winner, second, third = rng.sample(entrants, 3)
+            yield (
+                pk, f'{nation_name} Grand Prix'[:75], circuit, date.fromordinal(opener + race * 274 // races).isoformat(),
+                nation, f'{laps * length:.3f} km'[:25], laps, winner, second, third,
+            )
+
+
+def get_sqlite_indexes(model):
+    """Returns:
+        list -- (name, CREATE INDEX statement) of the table's own indexes on SQLite
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+            [model._meta.db_table]
+        )
+        return cursor.fetchall()
+
+
+def seed_races(rng, count, circuits, seasons, batch_size, report):
+    # Races carry eight indexes; on SQLite, building them once the rows are
+    # in beats updating them row by row
+    indexes = get_sqlite_indexes(Race) if connection.vendor == 'sqlite' else []
+    with connection.cursor() as cursor:
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    count = insert(
+        Race,
+        ('id', 'name', 'circuit', 'date', 'nation', 'distance', 'laps', 'winner_driver', 'p2_driver', 'p3_driver'),
+        make_races(rng, count, circuits, seasons), batch_size, report=None
+    )
+    with connection.cursor() as cursor:
+        for _, sql in indexes:
+            cursor.execute(sql)
+    if report is not None:
+        report(Race, count)
+
+
+def seed_database(scale, races=None, seed=0, batch_size=SEED_BATCH_SIZE, report=None):
+    """Fill an empty database with a synthetic dataset of `scale` drivers
+
+    The same scale, race count and seed always give the same rows, ids
+    included, which is why the tables must start empty. Inserts run in one
+    transaction with the search index triggers dropped; the
+    index, standings, versions and autocomplete indexes are brought up to
+    date afterwards, as after any bulk write. `report(model, rows)` is
+    called as each table is filled.
+
+    Returns:
+        dict -- model to number of rows inserted
+    """
+    counts = get_counts(scale, races)
+    fake = Faker()
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+    has_search_index = uses_fts(connection)
+
+    with transaction.atomic():
+        if has_search_index:
+            drop_search_index(connection)
+
+        nations = seed_nations(fake, counts[Nation], batch_size, report)
+        constructors = seed_constructors(fake, rng, counts[Constructor], nations, batch_size, report)
+        circuits = seed_circuits(fake, rng, counts[Circuit], nations, batch_size, report)
+        seasons, counts[DriverConstructorHistory] = seed_drivers(
+            fake, rng, counts[Driver], nations, constructors, batch_size, report
+        )
+        seed_races(rng, counts[Race], circuits, seasons, batch_size, report)
+
+        if has_search_index:
+            create_search_index(connection)
+        for model in SEEDED_MODELS:
+            bulk_write.send(sender=model)
+    return counts
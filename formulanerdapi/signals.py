@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from formulanerdapi.models import (
+    Circuit, Constructor, Driver, DriverConstructorHistory, Nation, Race, User
+)
+from formulanerdapi.autocomplete import AUTOCOMPLETE_MODELS, clear_prefix_indexes, get_loaded_index
+from formulanerdapi.slow_queries import install_slow_query_recorder
+from formulanerdapi.standings import PODIUM_FIELDS, get_race_podium, rebuild_standings, update_standings
+from formulanerdapi.utils.profiling import install_query_recorder
+from formulanerdapi.utils.sqlite import configure_sqlite_connection
+from formulanerdapi.utils.versions import bump_version
+
+VERSIONED_MODELS = (Circuit, Constructor, Driver, DriverConstructorHistory, Nation, Race, User)
+
+# Sent by code paths that write many rows at once (bulk_create, update(),
+# raw imports), which Django does not cover with post_save/post_delete.
+# Send it once per batch with the model class as the sender, and pass the
+# written rows as instances= when they are at hand.
+bulk_write = Signal()
+
+
+connection_created.connect(configure_sqlite_connection)
+connection_created.connect(install_query_recorder)
+connection_created.connect(install_slow_query_recorder)
+
+
+def bump_table_version(sender, **kwargs):
+    """Bump the version of a table whenever one of its rows changes"""
+    bump_version(sender)
+
+
+# Connected per model rather than to every sender, so deletes of other
+# models keep Django's fast (signal-free) delete path
+for versioned_model in VERSIONED_MODELS:
+    post_save.connect(bump_table_version, sender=versioned_model)
+    post_delete.connect(bump_table_version, sender=versioned_model)
+    bulk_write.connect(bump_table_version, sender=versioned_model)
+
+
+def get_podium(race):
+    """Returns:
+        tuple -- (season, podium driver ids) of a race instance
+    """
+    return get_race_podium(race.date, [getattr(race, f'{field}_id') for field in PODIUM_FIELDS])
+
+
+@receiver(pre_save, sender=Race)
+def remember_race_podium(sender, instance, **kwargs):
+    """Keep the podium a race had before an update, so the drivers it
+    loses are recomputed too"""
+    instance._podium_before = None
+    if instance.pk is not None:
+        saved = Race.objects.filter(pk=instance.pk).values_list(
+            'date', *[f'{field}_id' for field in PODIUM_FIELDS]
+        ).first()
+        if saved is not None:
+            instance._podium_before = get_race_podium(saved[0], saved[1:])
+
+
+@receiver(post_save, sender=Race)
+def update_race_standings(sender, instance, **kwargs):
+    """Recompute the standings of drivers on the race's old and new podium"""
+    podiums = [get_podium(instance)]
+    if getattr(instance, '_podium_before', None) is not None:
+        podiums.append(instance._podium_before)
+    update_standings(podiums)
+
+
+@receiver(post_delete, sender=Race)
+def remove_race_standings(sender, instance, **kwargs):
+    """Recompute the standings of drivers on a deleted race's podium"""
+    update_standings([get_podium(instance)])
+
+
+@receiver(bulk_write, sender=Race)
+def update_bulk_race_standings(sender, instances=None, **kwargs):
+    """Recompute standings after a batch of races, in full when the batch
+    did not say which races it wrote"""
+    if instances is None:
+        rebuild_standings()
+    else:
+        update_standings([get_podium(race) for race in instances])
+
+
+def refresh_autocomplete(sender, instance, signal, **kwargs):
+    """Apply a saved or deleted name to the model's autocomplete index, if
+    this process has loaded it, once the write commits"""
+    pk, name, deleted = instance.pk, instance.name, signal is post_delete
+
+    def apply():
+        index = get_loaded_index(sender)
+        if index is None:
+            return
+        if deleted:
+            index.remove(pk)
+        else:
+            index.add(pk, name)
+    transaction.on_commit(apply)
+
+
+def reload_autocomplete(sender, **kwargs):
+    """Drop the model's autocomplete index after a bulk write, to be
+    reloaded on next use"""
+    transaction.on_commit(lambda: clear_prefix_indexes(sender))
+
+
+for autocomplete_model in AUTOCOMPLETE_MODELS.values():
+    post_save.connect(refresh_autocomplete, sender=autocomplete_model)
+    post_delete.connect(refresh_autocomplete, sender=autocomplete_model)
+    bulk_write.connect(reload_autocomplete, sender=autocomplete_model)
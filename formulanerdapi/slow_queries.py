@@ -0,0 +1,276 @@
+"""Record SQL statements that API requests take too long to run
+
+With settings.SLOW_QUERY_THRESHOLD_MS set, every statement a view runs
+is timed by a connection execute wrapper. Those at or over the threshold
+are written as JSON lines to a rotating file. Each line has the
+statement, its parameters, the route and the view action that ran it, the
+project frames of the call stack and the EXPLAIN plan. The slowest
+statements of the process are also kept in memory for /slowqueries.
+
+The plan is captured the first time a statement text is seen slow and
+reused after that. SQLite plans list every table a statement reads as
+SEARCH (through an index) or SCAN (row by row). Scans that use no index
+at all are repeated under `unindexed`, which is what finds the joins of
+deeply nested serializers that miss an index.
+"""
+import json
+import logging
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STACK_FRAMES = 8
+MAX_PARAMS_LENGTH = 500
+
+# Files whose frames are plumbing around every query, not its origin
+PLUMBING_FILES = {
+    str(Path(__file__).resolve()),
+    str(PROJECT_ROOT / 'formulanerdapi' / 'middleware.py'),
+    str(PROJECT_ROOT / 'formulanerdapi' / 'utils' / 'profiling.py'),
+}
+
+# The view of the request being answered in this context: a dict that
+# SlowQueryMiddleware fills in once the URL is resolved, None outside requests
+_current_view = ContextVar('current_view', default=None)
+# Set while a plan is being captured, so EXPLAIN is not itself recorded
+_explaining = ContextVar('explaining', default=False)
+
+
+class SlowQueryLog:
+    """The `size` slowest statements seen, by statement text"""
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_plan(self, sql):
+        """Returns:
+            list -- the plan already captured for a statement, or None
+        """
+        entry = self._entries.get(sql)
+        return entry['plan'] if entry is not None else None
+
+    def add(self, record):
+        """Count one slow run of a statement; keep it if it is among the slowest"""
+        with self._lock:
+            entry = self._entries.get(record['sql'])
+            if entry is None:
+                if len(self._entries) >= self.size:
+                    fastest = min(self._entries.values(), key=lambda entry: entry['max_ms'])
+                    if fastest['max_ms'] >= record['duration_ms']:
+                        return
+                    del self._entries[fastest['sql']]
+                entry = self._entries[record['sql']] = {
+                    'sql': record['sql'], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'plan': record['plan'], 'unindexed': record['unindexed'],
+                }
+            entry['count'] += 1
+            entry['total_ms'] += record['duration_ms']
+            if record['duration_ms'] >= entry['max_ms']:
+                entry.update(
+                    max_ms=record['duration_ms'], params=record['params'], route=record['route'],
+                    view=record['view'], stack=record['stack'],
+                )
+
+    def top(self):
+        """Returns:
+            list -- copies of the kept statements, slowest first
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        return sorted(entries, key=lambda entry: entry['max_ms'], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_slow_query_log = None
+_file_logger = None
+
+
+def get_slow_query_log():
+    """Returns:
+        SlowQueryLog -- this process's in-memory log, SLOW_QUERY_TOP_N long
+    """
+    global _slow_query_log  # pylint: disable=global-statement
+    if _slow_query_log is None:
+        _slow_query_log = SlowQueryLog(settings.SLOW_QUERY_TOP_N)
+    return _slow_query_log
+
+
+def get_file_logger():
+    """Returns:
+        Logger -- writing to SLOW_QUERY_LOG_FILE, or None when there is no file
+    """
+    global _file_logger  # pylint: disable=global-statement
+    if _file_logger is None and settings.SLOW_QUERY_LOG_FILE:
+        path = Path(settings.SLOW_QUERY_LOG_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path, maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES, backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+            encoding='utf-8', delay=True,
+        )
+        _file_logger = logging.getLogger('formulanerdapi.slow_queries')
+        _file_logger.setLevel(logging.INFO)
+        _file_logger.propagate = False
+        for old_handler in list(_file_logger.handlers):
+            _file_logger.removeHandler(old_handler)
+            old_handler.close()
+        _file_logger.addHandler(handler)
+    return _file_logger
+
+
+@receiver(setting_changed)
+def reset_slow_query_log(setting, **kwargs):
+    """Rebuild the log and its file when tests override their settings"""
+    global _slow_query_log, _file_logger  # pylint: disable=global-statement
+    if setting == 'SLOW_QUERY_TOP_N':
+        _slow_query_log = None
+    if setting.startswith('SLOW_QUERY_LOG'):
+        if _file_logger is not None:
+            for handler in list(_file_logger.handlers):
+                _file_logger.removeHandler(handler)
+                handler.close()
+        _file_logger = None
+
+
+def get_stack_summary():
+    """Returns:
+        list -- `file:line in function` for the innermost project frames
+    """
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(str(PROJECT_ROOT)) and 'site-packages' not in frame.filename
+        and frame.filename not in PLUMBING_FILES
+    ]
+    return [
+        f'{Path(frame.filename).relative_to(PROJECT_ROOT)}:{frame.lineno} in {frame.name}'
+        for frame in frames[-STACK_FRAMES:]
+    ]
+
+
+def explain(connection, sql, params):
+    """Returns:
+        list -- the lines of a SELECT statement's query plan, or [] for
+        other statements and plans that cannot be had
+    """
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return []
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            rows = cursor.fetchall()
+    except Exception:  # pylint: disable=broad-except
+        # A plan is a nice to have; never fail the request over one
+        return []
+    finally:
+        _explaining.reset(token)
+    # SQLite gives (id, parent, notused, detail); other databases give the
+    # plan in the first column
+    return [str(row[-1] if connection.vendor == 'sqlite' else row[0]) for row in rows]
+
+
+def get_unindexed(plan):
+    """Returns:
+        list -- plan lines that read a table row by row without any index
+        (full text tables are searched through their own index, though
+        SQLite lists them as a SCAN)
+    """
+    return [
+        line for line in plan
+        if line.startswith('SCAN ') and ' USING ' not in line and ' VIRTUAL TABLE ' not in line
+    ]
+
+
+def record_slow_query(execute, sql, params, many, context):
+    """Execute wrapper that records statements at or over the threshold
+    run while a view is answering a request"""
+    view = _current_view.get()
+    if view is None or many or _explaining.get():
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started) * 1000
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is not None and duration_ms >= threshold:
+        log_slow_query(context['connection'], sql, params, duration_ms, view)
+    return result
+
+
+def log_slow_query(connection, sql, params, duration_ms, view):
+    slow_query_log = get_slow_query_log()
+    plan = slow_query_log.get_plan(sql)
+    if plan is None:
+        plan = explain(connection, sql, params)
+    record = {
+        'time': time.time(),
+        'duration_ms': round(duration_ms, 3),
+        'sql': sql,
+        'params': repr(params)[:MAX_PARAMS_LENGTH],
+        'route': view.get('route'),
+        'view': view.get('view'),
+        'stack': get_stack_summary(),
+        'plan': plan,
+        'unindexed': get_unindexed(plan),
+        'database': connection.alias,
+    }
+    slow_query_log.add(record)
+    file_logger = get_file_logger()
+    if file_logger is not None:
+        file_logger.info(json.dumps(record))
+
+
+def install_slow_query_recorder(sender, connection, **kwargs):
+    """Add record_slow_query to new connections while slow queries are recorded"""
+    if settings.SLOW_QUERY_THRESHOLD_MS is not None and record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
+
+
+def install_on_thread_connections():
+    """Add record_slow_query to this thread's connections, opened or not"""
+    for alias in connections:
+        wrappers = connections[alias].execute_wrappers
+        if record_slow_query not in wrappers:
+            wrappers.append(record_slow_query)
+
+
+@contextmanager
+def track_view():
+    """Record slow statements run inside the block, once set_view names
+    the view they are run for"""
+    token = _current_view.set({})
+    try:
+        yield
+    finally:
+        _current_view.reset(token)
+
+
+def set_view(route, view):
+    """Name the view of the request being tracked in this context"""
+    current = _current_view.get()
+    if current is not None:
+        current.update(route=route, view=view)
+
+
+def get_view_name(view_func, method):
+    """Returns:
+        str -- `ViewClass.action` for ViewSet views, else the view's name
+    """
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__qualname__', repr(view_func))
+    action = getattr(view_func, 'actions', {}).get(method.lower(), method.lower())
+    return f'{view_class.__name__}.{action}'
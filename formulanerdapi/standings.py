@@ -0,0 +1,178 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Value
+
+from formulanerdapi.history_index import get_constructor_index
+from formulanerdapi.models import DriverStanding, Race
+from formulanerdapi.utils.versions import bump_version
+
+PODIUM_FIELDS = ('winner_driver', 'p2_driver', 'p3_driver')
+
+# Points for P1, P2 and P3, from the first season each system applied.
+# Override with settings.STANDINGS_POINTS_SYSTEMS in the same shape.
+DEFAULT_POINTS_SYSTEMS = (
+    (1950, (8, 6, 4)),
+    (1961, (9, 6, 4)),
+    (1991, (10, 6, 4)),
+    (2003, (10, 8, 6)),
+    (2010, (25, 18, 15)),
+)
+
+
+def get_points(season):
+    """Returns:
+        tuple -- points for P1, P2 and P3 in the given season
+    """
+    points = (0, 0, 0)
+    for first_season, era_points in getattr(settings, 'STANDINGS_POINTS_SYSTEMS', DEFAULT_POINTS_SYSTEMS):
+        if season >= first_season:
+            points = era_points
+    return points
+
+
+def get_race_podium(date, driver_ids):
+    """Turn a race's date and podium driver ids into (season, driver ids)
+
+    Dates may still be the strings a view assigned before saving.
+    """
+    season = Race._meta.get_field('date').to_python(date).year
+    return season, set(driver_ids)
+
+
+def compute_standings(races, season):
+    """Total points, wins and podiums per driver for one season of some races
+
+    Counts every podium position in a single query: one grouped COUNT per
+    position, combined with UNION ALL. Works a season at a time, since
+    date__year filters on a range of the date index, while grouping by the
+    extracted year runs a function on every row (on SQLite, a Python one).
+
+    Returns:
+        dict -- driver id to unsaved DriverStanding
+    """
+    races = races.filter(date__year=season)
+    by_position = [
+        races.annotate(position=Value(position))
+        .values_list(f'{field}_id', 'position')
+        .annotate(finishes=Count('id'))
+        .order_by()
+        for position, field in enumerate(PODIUM_FIELDS)
+    ]
+
+    points = get_points(season)
+    standings = {}
+    for driver_id, position, finishes in by_position[0].union(*by_position[1:], all=True):
+        standing = standings.get(driver_id)
+        if standing is None:
+            standing = standings[driver_id] = DriverStanding(season=season, driver_id=driver_id)
+        standing.points += Decimal(points[position]) * finishes
+        standing.podiums += finishes
+        if position == 0:
+            standing.wins += finishes
+    return standings
+
+
+def get_seasons():
+    """Returns:
+        range -- every season from the first race to the last
+    """
+    dates = Race.objects.aggregate(first=Min('date'), last=Max('date'))
+    if dates['first'] is None:
+        return range(0)
+    return range(dates['first'].year, dates['last'].year + 1)
+
+
+def update_standings(podiums):
+    """Recompute the standings rows touched by some race changes
+
+    Takes (season, driver ids) pairs and only rewrites those drivers' rows
+    for those seasons.
+    """
+    drivers_by_season = defaultdict(set)
+    for season, driver_ids in podiums:
+        drivers_by_season[season] |= driver_ids
+
+    with transaction.atomic():
+        for season, driver_ids in drivers_by_season.items():
+            on_podium = Q()
+            for field in PODIUM_FIELDS:
+                on_podium |= Q(**{f'{field}__in': driver_ids})
+            standings = compute_standings(Race.objects.filter(on_podium), season)
+
+            DriverStanding.objects.filter(season=season, driver__in=driver_ids).delete()
+            DriverStanding.objects.bulk_create([
+                standing for driver_id, standing in standings.items() if driver_id in driver_ids
+            ])
+        bump_version(DriverStanding)
+
+
+def rebuild_standings(season=None):
+    """Recompute the whole standings table, or one season of it
+
+    Returns:
+        int -- number of standings rows written
+    """
+    existing = DriverStanding.objects.all()
+    if season is not None:
+        existing = existing.filter(season=season)
+
+    count = 0
+    with transaction.atomic():
+        existing.delete()
+        for standings_season in get_seasons() if season is None else [season]:
+            standings = compute_standings(Race.objects.all(), standings_season)
+            DriverStanding.objects.bulk_create(standings.values(), batch_size=2000)
+            count += len(standings)
+        bump_version(DriverStanding)
+    return count
+
+
+def compute_constructor_standings(season):
+    """Constructor totals for a season, from the drivers' standings rows
+
+    Each driver's points go to the constructor their history spell covers
+    for that season, looked up in the cached ConstructorIndex, so the work
+    is one lookup per driver rather than a join of every race against the
+    history table. Drivers with no spell that season are left out.
+
+    Returns:
+        list -- dicts of constructor id, points, wins and podiums, leader first
+    """
+    index = get_constructor_index()
+    totals = {}
+    for driver_id, points, wins, podiums in DriverStanding.objects.filter(season=season).values_list(
+        'driver_id', 'points', 'wins', 'podiums'
+    ):
+        constructor_id = index.constructor_for(driver_id, season)
+        if constructor_id is None:
+            continue
+        total = totals.setdefault(constructor_id, {
+            'constructor_id': constructor_id, 'points': Decimal(0), 'wins': 0, 'podiums': 0,
+        })
+        total['points'] += points
+        total['wins'] += wins
+        total['podiums'] += podiums
+    return sorted(totals.values(), key=lambda total: (-total['points'], -total['wins'], -total['podiums']))
+
+
+def get_podium_constructors(race):
+    """Which constructor each podium finish of a race was for
+
+    Returns:
+        list -- dicts of position, driver id and constructor id (None when
+        the driver has no history spell that season)
+    """
+    index = get_constructor_index()
+    season = Race._meta.get_field('date').to_python(race.date).year
+    podium = []
+    for position, field in enumerate(PODIUM_FIELDS, 1):
+        driver_id = getattr(race, f'{field}_id')
+        podium.append({
+            'position': position,
+            'driver_id': driver_id,
+            'constructor_id': index.constructor_for(driver_id, season),
+        })
+    return podium
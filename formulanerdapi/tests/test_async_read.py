@@ -0,0 +1,90 @@
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.test import APITestCase
+from rest_framework import status
+from formulanerdapi.models import Nation, Circuit, Constructor, Driver, Race, DriverConstructorHistory, User
+from formulanerdapi.views.asyncRead import AsyncReadView
+
+class AsyncReadTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        cls.nation1 = Nation.objects.create(name="Germany", flag_image_url="https://example.com/germany.png")
+        cls.nation2 = Nation.objects.create(name="Italy", flag_image_url="https://example.com/italy.png")
+        cls.circuit = Circuit.objects.create(name="Monza", nation=cls.nation2, designer="Alfredo Rosselli")
+        cls.constructor = Constructor.objects.create(name="Ferrari", nation=cls.nation2)
+        cls.driver1 = Driver.objects.create(name="Sebastian Vettel", nation=cls.nation1, current_constructor=cls.constructor)
+        cls.driver2 = Driver.objects.create(name="Charles Leclerc", nation=cls.nation2, current_constructor=cls.constructor)
+        cls.race = Race.objects.create(
+            name="Italian Grand Prix", date="2019-09-08", nation=cls.nation2, circuit=cls.circuit, distance=306, laps=53,
+            winner_driver=cls.driver2, p2_driver=cls.driver1, p3_driver=cls.driver1
+        )
+        DriverConstructorHistory.objects.create(driver=cls.driver1, constructor=cls.constructor, start_year=2015, end_year=2020)
+        DriverConstructorHistory.objects.create(driver=cls.driver2, constructor=cls.constructor, start_year=2019)
+        cls.user = User.objects.create(
+            uid="abc123", name="Tifosi", nation=cls.nation2, favorite_driver=cls.driver2, favorite_circuit=cls.circuit
+        )
+
+    def assertSameBody(self, url):
+        """Assert that the async endpoint answers exactly like the sync one"""
+        expected = self.client.get(url)
+        response = self.client.get(f"/async{url}")
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+    def test_async_lists_match_sync(self):
+        """Test every resource's async list against the sync one"""
+        for resource in ("users", "drivers", "circuits", "races", "constructors", "driverconstructorhistories", "nations"):
+            with self.subTest(resource=resource):
+                self.assertSameBody(f"/{resource}")
+
+    def test_async_retrieve_matches_sync(self):
+        """Test every resource's async retrieve against the sync one"""
+        for resource, instance in (
+            ("users", self.user), ("drivers", self.driver1), ("circuits", self.circuit), ("races", self.race),
+            ("constructors", self.constructor), ("nations", self.nation1),
+            ("driverconstructorhistories", DriverConstructorHistory.objects.first()),
+        ):
+            with self.subTest(resource=resource):
+                self.assertSameBody(f"/{resource}/{instance.id}")
+
+    def test_async_filters_and_fields(self):
+        """Test query string filters, ?fields= and ?expand="""
+        self.assertSameBody(f"/drivers?nation={self.nation1.id}")
+        self.assertSameBody("/races?fields=id,name,winner_driver&expand=winner_driver")
+        self.assertSameBody(f"/driverconstructorhistories?constructor={self.constructor.id}&year=2021")
+
+        response = self.client.get("/async/driverconstructorhistories?year=soon")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_async_stream(self):
+        """Test that ?stream=true streams the same array"""
+        expected = self.client.get("/races").content
+        response = self.client.get("/async/races?stream=true")
+
+        async def read_stream():
+            return b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(async_to_sync(read_stream)(), expected)
+
+    def test_async_not_found_and_not_modified(self):
+        """Test 404s and that sync ETags are honoured"""
+        response = self.client.get("/async/drivers/999")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"error": "Driver not found"})
+
+        etag = self.client.get("/nations")["ETag"]
+        response = self.client.get("/async/nations", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.post("/async/nations", {"name": "France"})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_async_view_without_serializer(self):
+        """Test that a resource view must name its serializer"""
+        class AsyncTeamView(AsyncReadView):
+            model = Nation
+
+        with self.assertRaisesMessage(ImproperlyConfigured, "AsyncTeamView must set serializer_class."):
+            AsyncTeamView().get_queryset({})
@@ -0,0 +1,88 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from formulanerdapi.autocomplete import PrefixIndex, clear_prefix_indexes
+from formulanerdapi.models import Nation, Constructor, Driver
+from formulanerdapi.utils.versions import bump_version
+
+class AutocompleteTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        cls.nation = Nation.objects.create(name="United Kingdom", flag_image_url="https://example.com/uk.png")
+        cls.mexico = Nation.objects.create(name="Mexico", flag_image_url="https://example.com/mexico.png")
+        cls.constructor = Constructor.objects.create(name="Mercedes", nation=cls.nation)
+        cls.hamilton = Driver.objects.create(name="Lewis Hamilton", nation=cls.nation, current_constructor=cls.constructor)
+        cls.hakkinen = Driver.objects.create(name="Mika Häkkinen", nation=cls.nation, current_constructor=cls.constructor)
+        cls.perez = Driver.objects.create(name="Sergio Pérez", nation=cls.mexico, current_constructor=cls.constructor)
+
+    def setUp(self):
+        """Indexes outlive each test's transaction, so start every test from the database"""
+        clear_prefix_indexes()
+
+    def names(self, url):
+        """Returns the names in an autocomplete response"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row["name"] for row in response.data]
+
+    def test_autocomplete_matches_any_word(self):
+        """Test matching the start of any word, ignoring case and accents"""
+        self.assertEqual(self.names("/autocomplete?type=driver&prefix=ha"), ["Mika Häkkinen", "Lewis Hamilton"])
+        self.assertEqual(self.names("/autocomplete?type=driver&prefix=HAM"), ["Lewis Hamilton"])
+        self.assertEqual(self.names("/autocomplete?type=driver&prefix=lewis%20h"), ["Lewis Hamilton"])
+        self.assertEqual(self.names("/autocomplete?type=driver&prefix=perez"), ["Sergio Pérez"])
+        self.assertEqual(self.names("/autocomplete?type=nation&prefix=king"), ["United Kingdom"])
+        self.assertEqual(self.names("/autocomplete?type=driver&prefix=ha&limit=1"), ["Mika Häkkinen"])
+
+    def test_autocomplete_does_not_query_once_loaded(self):
+        """Test that only the first request reads the database"""
+        self.client.get("/autocomplete?type=driver&prefix=ham")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("/autocomplete?type=driver&prefix=ser"), ["Sergio Pérez"])
+
+    def test_autocomplete_follows_writes(self):
+        """Test that saves and deletes update a loaded index in place"""
+        self.client.get("/autocomplete?type=driver&prefix=ham")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hamilton.name = "Sir Lewis Hamilton"
+            self.hamilton.save()
+            Driver.objects.create(name="Lando Norris", nation=self.nation, current_constructor=self.constructor)
+            self.perez.delete()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("/autocomplete?type=driver&prefix=sir"), ["Sir Lewis Hamilton"])
+            self.assertEqual(self.names("/autocomplete?type=driver&prefix=lan"), ["Lando Norris"])
+            self.assertEqual(self.names("/autocomplete?type=driver&prefix=perez"), [])
+
+    @override_settings(AUTOCOMPLETE_VERSION_CHECK_INTERVAL=0)
+    def test_autocomplete_follows_other_processes(self):
+        """Test that a write no signal saw, as another process makes, reloads the index"""
+        self.assertEqual(self.names("/autocomplete?type=driver&prefix=ham"), ["Lewis Hamilton"])
+
+        Driver.objects.filter(pk=self.hamilton.pk).update(name="Sir Lewis Hamilton")
+        bump_version(Driver)
+
+        self.assertEqual(self.names("/autocomplete?type=driver&prefix=sir"), ["Sir Lewis Hamilton"])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names("/autocomplete?type=driver&prefix=ham"), ["Sir Lewis Hamilton"])
+
+    def test_autocomplete_invalid_requests(self):
+        """Test unknown types and missing prefixes"""
+        response = self.client.get("/autocomplete?type=race&prefix=brit")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/autocomplete?type=driver")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prefix_index_add_and_remove(self):
+        """Test renaming and removing entries that share keys"""
+        index = PrefixIndex([(1, "Max Verstappen"), (2, "Jos Verstappen")])
+        self.assertEqual(index.search("verst"), [(1, "Max Verstappen"), (2, "Jos Verstappen")])
+
+        index.add(2, "Jos the Boss Verstappen")
+        index.remove(1)
+        self.assertEqual(index.search("verst"), [(2, "Jos the Boss Verstappen")])
+        self.assertEqual(index.search("boss"), [(2, "Jos the Boss Verstappen")])
+        self.assertEqual(len(index), 1)
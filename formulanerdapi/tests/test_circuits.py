@@ -1,6 +1,9 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from formulanerdapi.models import Circuit, Nation
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 class CircuitViewTests(APITestCase):
@@ -155,3 +158,18 @@ class CircuitViewTests(APITestCase):
         response = self.client.post("/circuits", data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, {"error": "Nation not found."})
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_list_circuits_query_count_is_constant(self):
+        """Test that listing circuits does not issue queries per row"""
+        with CaptureQueriesContext(connection) as before:
+            self.client.get("/circuits")
+
+        for i in range(5):
+            nation = Nation.objects.create(name=f"Nation {i}", flag_image_url="https://example.com/flag.png")
+            Circuit.objects.create(name=f"Circuit {i}", nation=nation)
+
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get("/circuits")
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(len(after), len(before))
@@ -1,6 +1,9 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from formulanerdapi.models import Constructor, Nation
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 class ConstructorViewTests(APITestCase):
@@ -133,3 +136,18 @@ class ConstructorViewTests(APITestCase):
         response = self.client.post("/constructors", data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, {"error": "Nation not found."})
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_list_constructors_query_count_is_constant(self):
+        """Test that listing constructors does not issue queries per row"""
+        with CaptureQueriesContext(connection) as before:
+            self.client.get("/constructors")
+
+        for i in range(5):
+            nation = Nation.objects.create(name=f"Nation {i}", flag_image_url="https://example.com/flag.png")
+            Constructor.objects.create(name=f"Constructor {i}", nation=nation)
+
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get("/constructors")
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(len(after), len(before))
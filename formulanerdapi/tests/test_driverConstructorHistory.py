@@ -1,6 +1,9 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from formulanerdapi.models import DriverConstructorHistory, Driver, Constructor, Nation
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 class DriverConstructorHistoryViewTests(APITestCase):
@@ -144,3 +147,116 @@ class DriverConstructorHistoryViewTests(APITestCase):
         response = self.client.delete("/driverconstructorhistories/999")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.data, {"error": "DriverConstructorHistory not found"})
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_list_driver_constructor_histories_query_count_is_constant(self):
+        """Test that listing driver constructor histories does not issue queries per row"""
+        with CaptureQueriesContext(connection) as before:
+            self.client.get("/driverconstructorhistories")
+
+        for i in range(5):
+            nation = Nation.objects.create(name=f"Nation {i}", flag_image_url="https://example.com/flag.png")
+            constructor = Constructor.objects.create(name=f"Constructor {i}", nation=nation)
+            driver = Driver.objects.create(name=f"Driver {i}", nation=nation, current_constructor=constructor)
+            DriverConstructorHistory.objects.create(
+                driver=driver,
+                constructor=constructor,
+                start_year=2010 + i,
+                end_year=2012 + i
+            )
+
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get("/driverconstructorhistories")
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(len(after), len(before))
+
+    def test_list_driver_constructor_histories_paginated(self):
+        """Test paging through driver constructor histories with cursors"""
+        response = self.client.get("/driverconstructorhistories?page_size=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["start_year"], 1995)
+
+        next_link = response["Link"].split(";")[0].strip("<>")
+        response = self.client.get(next_link)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["start_year"], 2001)
+
+    def test_list_driver_constructor_histories_paginated_through_a_tied_season(self):
+        """Test walking every page, both ways, past 1000 histories of one season"""
+        DriverConstructorHistory.objects.bulk_create(
+            DriverConstructorHistory(driver=self.driver3, constructor=self.constructor3, start_year=2010, end_year=2010)
+            for _ in range(1300)
+        )
+        expected = list(DriverConstructorHistory.objects.order_by("start_year", "id").values_list("id", flat=True))
+
+        def walk(link, rel):
+            """Follow `rel` links from `link`, returning the ids of every page"""
+            pages = []
+            while link:
+                response = self.client.get(link)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                pages.append([history["id"] for history in response.data])
+                links = dict(part.split("; ")[::-1] for part in response.get("Link", "").split(", ") if part)
+                link = links.get(f'rel="{rel}"', "").strip("<>")
+            return pages, links
+
+        pages, links = walk("/driverconstructorhistories?page_size=200", "next")
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual(len(pages), len(expected) // 200 + 1)
+
+        previous_pages, _ = walk(links['rel="prev"'].strip("<>"), "prev")
+        self.assertEqual(sum(reversed(previous_pages), []), expected[:-len(pages[-1])])
+
+    def test_list_driver_constructor_histories_paginated_by_driver(self):
+        """Test that pagination keeps the driver filter"""
+        response = self.client.get(f"/driverconstructorhistories?driver={self.driver2.id}&page_size=5")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["driver"]["name"], "Sebastian Vettel")
+
+    def test_list_driver_constructor_histories_streamed(self):
+        """Test that a streamed history list matches the regular response byte for byte"""
+        expected = self.client.get("/driverconstructorhistories").content
+        response = self.client.get("/driverconstructorhistories?stream=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), expected)
+
+    def test_list_driver_constructor_histories_active_in_year(self):
+        """Test the roster of a constructor in a given year"""
+        DriverConstructorHistory.objects.create(driver=self.driver3, constructor=self.constructor1, start_year=1990)
+        DriverConstructorHistory.objects.create(driver=self.driver2, constructor=self.constructor1, start_year=1980, end_year=1994)
+
+        response = self.client.get(f"/driverconstructorhistories?constructor={self.constructor1.id}&year=1996")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(row["driver"]["name"] for row in response.data), ["Lewis Hamilton", "Pierre Gasly"])
+
+        response = self.client.get(f"/driverconstructorhistories?driver={self.driver2.id}&year=1980")
+        self.assertEqual([row["start_year"] for row in response.data], [1980])
+
+        response = self.client.get("/driverconstructorhistories?year=2006")
+        self.assertEqual([row["driver"]["name"] for row in response.data], ["Pierre Gasly"])
+
+        response = self.client.get("/driverconstructorhistories?year=soon")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rosters_for_a_range_of_years(self):
+        """Test full rosters for several years in one request"""
+        DriverConstructorHistory.objects.create(driver=self.driver3, constructor=self.constructor1, start_year=1996)
+
+        response = self.client.get("/driverconstructorhistories/rosters?from=1997&to=2001")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["year"], row["constructor_id"], row["driver_ids"]) for row in response.data],
+            [(1997, self.constructor1.id, [self.driver1.id, self.driver3.id])]
+            + [(year, self.constructor1.id, [self.driver3.id]) for year in (1998, 1999, 2000)]
+            + [(2001, self.constructor1.id, [self.driver3.id]), (2001, self.constructor2.id, [self.driver2.id])]
+        )
+
+        response = self.client.get(f"/driverconstructorhistories/rosters?from=2003&constructor={self.constructor2.id}")
+        self.assertEqual(response.data, [{"year": 2003, "constructor_id": self.constructor2.id, "driver_ids": [self.driver2.id]}])
+
+        response = self.client.get("/driverconstructorhistories/rosters?from=1900&to=2100")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/driverconstructorhistories/rosters")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
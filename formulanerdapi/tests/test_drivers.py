@@ -1,6 +1,9 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from formulanerdapi.models import Driver, Constructor, Nation
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 class DriverViewTests(APITestCase):
@@ -158,3 +161,33 @@ class DriverViewTests(APITestCase):
         response = self.client.post("/drivers", data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, {"error": "Constructor not found."})
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_list_drivers_query_count_is_constant(self):
+        """Test that listing drivers does not issue queries per row"""
+        with CaptureQueriesContext(connection) as before:
+            self.client.get("/drivers")
+
+        for i in range(5):
+            nation = Nation.objects.create(name=f"Nation {i}", flag_image_url="https://example.com/flag.png")
+            constructor = Constructor.objects.create(name=f"Constructor {i}", nation=nation)
+            Driver.objects.create(name=f"Driver {i}", nation=nation, current_constructor=constructor)
+
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get("/drivers")
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(len(after), len(before))
+
+    def test_list_drivers_streamed(self):
+        """Test that a streamed driver list matches the regular response byte for byte"""
+        expected = self.client.get(f"/drivers?nation={self.nation1.id}").content
+        response = self.client.get(f"/drivers?nation={self.nation1.id}&stream=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), expected)
+
+    def test_list_drivers_with_fields_and_expand(self):
+        """Test combining sparse fields with an expanded relation"""
+        response = self.client.get("/drivers?fields=id,name,nation&expand=nation")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "name", "nation"})
+        self.assertEqual(response.data[0]["nation"]["name"], "Germany")
@@ -0,0 +1,67 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from rest_framework import status
+from formulanerdapi.models import Nation, Constructor, Driver
+
+class ExportArchiveTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        cls.nation1 = Nation.objects.create(name="Germany", flag_image_url="https://example.com/germany.png")
+        cls.nation2 = Nation.objects.create(name="Italy", flag_image_url="https://example.com/italy.png")
+        cls.constructor1 = Constructor.objects.create(name="Ferrari", nation=cls.nation2)
+        cls.driver1 = Driver.objects.create(name="Sebastian Vettel", age=37, nation=cls.nation1, current_constructor=cls.constructor1)
+        cls.admin = get_user_model().objects.create_user(username="admin", password="password", is_staff=True)
+
+    def test_export_archive_jsonl(self):
+        """Test exporting every table to JSONL files"""
+        with tempfile.TemporaryDirectory() as directory:
+            out = StringIO()
+            call_command("export_archive", directory, stdout=out)
+
+            lines = (Path(directory) / "drivers.jsonl").read_text().splitlines()
+            self.assertEqual(len(lines), 1)
+            driver = json.loads(lines[0])
+            self.assertEqual(driver["name"], "Sebastian Vettel")
+            self.assertEqual(driver["nation_id"], self.nation1.id)
+            self.assertTrue((Path(directory) / "users.jsonl").exists())
+            self.assertIn("nations: 2 rows", out.getvalue())
+
+    def test_export_archive_columnar(self):
+        """Test exporting one file per column with rows aligned by line"""
+        with tempfile.TemporaryDirectory() as directory:
+            call_command("export_archive", directory, "--format", "columnar", stdout=StringIO())
+
+            nations = Path(directory) / "nations"
+            names = [json.loads(line) for line in (nations / "name.jsonl").read_text().splitlines()]
+            ids = [json.loads(line) for line in (nations / "id.jsonl").read_text().splitlines()]
+            self.assertEqual(names, ["Germany", "Italy"])
+            self.assertEqual(ids, [self.nation1.id, self.nation2.id])
+
+    def test_export_endpoint_requires_admin(self):
+        """Test that anonymous clients cannot export"""
+        response = self.client.get("/exports/drivers")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_endpoint_streams_table(self):
+        """Test streaming a whole table as JSON lines"""
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/exports/nations")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["name"] for row in rows], ["Germany", "Italy"])
+
+    def test_export_endpoint_streams_column(self):
+        """Test streaming a single column"""
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/exports/drivers?column=age")
+        self.assertEqual(b"".join(response.streaming_content), b"37\n")
+
+        response = self.client.get("/exports/drivers?column=salary")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
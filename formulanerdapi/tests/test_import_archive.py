@@ -0,0 +1,114 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from formulanerdapi.models import Nation, Constructor, Circuit, Driver, Race, DriverConstructorHistory
+
+class ImportArchiveTests(TestCase):
+
+    def setUp(self):
+        """Write a small archive mixing CSV and JSONL files"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        Nation.objects.create(name="Germany", flag_image_url="https://example.com/germany.png")
+
+        (self.path / "nations.csv").write_text(
+            "name,flag_image_url\n"
+            "Italy,https://example.com/italy.png\n"
+            "United Kingdom,https://example.com/uk.png\n"
+        )
+        self.write_jsonl("constructors", [
+            {"name": "Ferrari", "location": "Maranello", "nation": "Italy", "is_engine_manufacturer": True, "about": "", "constructor_image_url": ""},
+            {"name": "Mercedes", "location": "Brackley", "nation": "Germany", "is_engine_manufacturer": "true", "about": "", "constructor_image_url": ""},
+        ])
+        (self.path / "circuits.csv").write_text(
+            "name,nation,length,circuit_type,designer,year_built,circuit_image_url\n"
+            "Monza,Italy,5.793 km,Permanent,Jovino di Giorgio,1922,\n"
+            "Silverstone,United Kingdom,5.891 km,Permanent,,,\n"
+        )
+        self.write_jsonl("drivers", [
+            {"name": "Lewis Hamilton", "age": 40, "gender": "Male", "nation": "United Kingdom", "current_constructor": "Ferrari", "about": "", "driver_image_url": ""},
+            {"name": "Charles Leclerc", "age": 27, "gender": "Male", "nation": "Italy", "current_constructor": "Ferrari", "about": "", "driver_image_url": ""},
+        ])
+        (self.path / "races.csv").write_text(
+            "name,circuit,date,nation,distance,laps,winner_driver,p2_driver,p3_driver\n"
+            "Italian Grand Prix,Monza,2024-09-01,Italy,306.72 km,53,Charles Leclerc,Lewis Hamilton,Charles Leclerc\n"
+            "British Grand Prix,Silverstone,2024-07-07,United Kingdom,306.198 km,52,Lewis Hamilton,Charles Leclerc,Lewis Hamilton\n"
+        )
+        (self.path / "driver_constructor_history.csv").write_text(
+            "driver,constructor,start_year,end_year\n"
+            "Lewis Hamilton,Mercedes,2013,2024\n"
+            "Lewis Hamilton,Ferrari,2025,\n"
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_jsonl(self, name, rows):
+        (self.path / f"{name}.jsonl").write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+
+    def test_import_archive(self):
+        """Test importing every table and resolving natural keys"""
+        out = StringIO()
+        call_command("import_archive", str(self.path), "--batch-size", "1", stdout=out)
+
+        self.assertEqual(Nation.objects.count(), 3)
+        self.assertEqual(Constructor.objects.get(name="Mercedes").nation.name, "Germany")
+        self.assertTrue(Constructor.objects.get(name="Mercedes").is_engine_manufacturer)
+        self.assertIsNone(Circuit.objects.get(name="Silverstone").year_built)
+        self.assertEqual(Driver.objects.get(name="Lewis Hamilton").current_constructor.name, "Ferrari")
+        race = Race.objects.get(name="British Grand Prix")
+        self.assertEqual(race.winner_driver.name, "Lewis Hamilton")
+        self.assertEqual(race.circuit.name, "Silverstone")
+        self.assertIsNone(DriverConstructorHistory.objects.get(constructor__name="Ferrari").end_year)
+        self.assertIn("races: 2 rows", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+
+    def test_import_archive_with_unknown_natural_key(self):
+        """Test that a row pointing at a missing nation names the file and line"""
+        (self.path / "nations.csv").unlink()
+        with self.assertRaisesMessage(CommandError, "constructors.jsonl line 1: unknown nation 'Italy'"):
+            call_command("import_archive", str(self.path), stdout=StringIO())
+
+    def test_import_archive_with_invalid_history(self):
+        """Test that model validation still runs for bulk inserted rows"""
+        (self.path / "driver_constructor_history.csv").write_text(
+            "driver,constructor,start_year,end_year\n"
+            "Lewis Hamilton,Mercedes,2013,2010\n"
+        )
+        with self.assertRaisesMessage(CommandError, "driver_constructor_history.csv line 2"):
+            call_command("import_archive", str(self.path), stdout=StringIO())
+        # Tables imported before the bad row are rolled back too
+        self.assertEqual(Nation.objects.count(), 1)
+        self.assertFalse(Race.objects.exists())
+
+    def test_import_archive_with_ambiguous_natural_key(self):
+        """Test that a name several rows share is reported rather than picking one"""
+        germany = Nation.objects.get(name="Germany")
+        brawn = Constructor.objects.create(name="Brawn", nation=germany)
+        Driver.objects.create(name="Lewis Hamilton", nation=germany, current_constructor=brawn)
+        with self.assertRaisesMessage(
+            CommandError, "races.csv line 2: more than one driver is named 'Lewis Hamilton'; give p2_driver_id instead"
+        ):
+            call_command("import_archive", str(self.path), stdout=StringIO())
+
+    def test_import_exported_archive_keeps_ids(self):
+        """Test that an export_archive dump comes back with its ids and foreign keys"""
+        call_command("import_archive", str(self.path), stdout=StringIO())
+        races = {race.pk: (race.name, race.winner_driver.name, race.circuit.name) for race in Race.objects.all()}
+
+        with tempfile.TemporaryDirectory() as export:
+            call_command("export_archive", export, stdout=StringIO())
+            for model in (DriverConstructorHistory, Race, Driver, Circuit, Constructor, Nation):
+                model.objects.all().delete()
+            # Rows created since take the ids the dump will not be given
+            Nation.objects.create(name="France", flag_image_url="https://example.com/france.png")
+            call_command("import_archive", export, stdout=StringIO())
+
+        self.assertEqual(
+            {race.pk: (race.name, race.winner_driver.name, race.circuit.name) for race in Race.objects.all()}, races
+        )
+        self.assertEqual(DriverConstructorHistory.objects.get(end_year=None).constructor.name, "Ferrari")
@@ -0,0 +1,112 @@
+import tempfile
+import threading
+from unittest import mock
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from formulanerdapi.metrics import MetricsRegistry, get_totals, registry
+from formulanerdapi.models import Nation
+from formulanerdapi.utils import get_response_cache
+from formulanerdapi.views import NationView
+
+class MetricsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        cls.nation = Nation.objects.create(name="Italy", flag_image_url="https://example.com/italy.png")
+
+    def setUp(self):
+        """Start every test from empty counters and an empty response cache"""
+        registry.reset()
+        cache = get_response_cache()
+        if cache is not None:
+            cache.clear()
+
+    def scrape(self):
+        """Returns the /metrics samples as {name and labels: value}"""
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if not line.startswith("#"):
+                sample, value = line.rsplit(" ", 1)
+                samples[sample] = float(value)
+        return samples
+
+    def test_requests_are_counted_per_route(self):
+        """Test request counts, latency and query histograms labelled by route name"""
+        self.client.get("/nations")
+        self.client.get(f"/nations/{self.nation.id}")
+        self.client.get(f"/nations/{self.nation.id}?fields=name")
+        self.client.get("/nations/999")
+
+        samples = self.scrape()
+        self.assertEqual(samples['formulanerd_requests_total{route="nation-list",method="GET",status="200"}'], 1)
+        self.assertEqual(samples['formulanerd_requests_total{route="nation-detail",method="GET",status="200"}'], 2)
+        self.assertEqual(samples['formulanerd_requests_total{route="nation-detail",method="GET",status="404"}'], 1)
+        self.assertEqual(samples['formulanerd_request_duration_seconds_count{route="nation-detail",method="GET"}'], 3)
+        self.assertEqual(
+            samples['formulanerd_request_duration_seconds_bucket{route="nation-detail",method="GET",le="+Inf"}'], 3
+        )
+        self.assertEqual(samples['formulanerd_db_queries_per_request_count{route="nation-list"}'], 1)
+        self.assertEqual(samples['formulanerd_db_queries_per_request_bucket{route="nation-list",le="0"}'], 0)
+        self.assertGreater(samples['formulanerd_db_duration_seconds_sum{route="nation-list"}'], 0)
+
+    def test_errors_are_counted(self):
+        """Test that a view raising counts as a 5xx error of its route"""
+        self.client.raise_request_exception = False
+        with mock.patch.object(NationView, "list", side_effect=RuntimeError("boom")):
+            self.assertEqual(self.client.get("/nations").status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        samples = self.scrape()
+        self.assertEqual(samples['formulanerd_request_errors_total{route="nation-list",method="GET"}'], 1)
+
+    def test_response_cache_results(self):
+        """Test cache hits, misses, 304s and the hit ratio"""
+        first = self.client.get("/nations")
+        self.client.get("/nations")
+        self.client.get("/nations", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        samples = self.scrape()
+        self.assertEqual(samples['formulanerd_response_cache_total{route="nation-list",result="miss"}'], 1)
+        self.assertEqual(samples['formulanerd_response_cache_total{route="nation-list",result="hit"}'], 1)
+        self.assertEqual(samples['formulanerd_response_cache_total{route="nation-list",result="not_modified"}'], 1)
+        self.assertEqual(samples['formulanerd_response_cache_hit_ratio{route="nation-list"}'], 0.5)
+
+    def test_threads_do_not_lose_counts(self):
+        """Test that lock-free per-thread counting adds up exactly"""
+        labels = (("route", "race-list"), ("method", "GET"), ("status", "200"))
+
+        def count():
+            for _ in range(1000):
+                registry.inc("formulanerd_requests_total", labels)
+
+        threads = [threading.Thread(target=count) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(registry.collect()[("formulanerd_requests_total", labels)], 8000)
+
+    def test_multiprocess_totals(self):
+        """Test that a scrape adds up what every worker flushed to the shared directory"""
+        labels = (("route", "race-list"), ("method", "GET"), ("status", "200"))
+        other_worker = MetricsRegistry()
+        other_worker.inc("formulanerd_requests_total", labels, 3)
+        other_worker.observe("formulanerd_request_duration_seconds", labels[:2], 0.2)
+        registry.inc("formulanerd_requests_total", labels, 2)
+        registry.observe("formulanerd_request_duration_seconds", labels[:2], 0.02)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROCESS_DIR=directory):
+            other_worker.flush(directory)
+            totals = get_totals()
+        self.assertEqual(totals[("formulanerd_requests_total", labels)], 5)
+        latency = totals[("formulanerd_request_duration_seconds", labels[:2])]
+        self.assertEqual(sum(latency[:-1]), 2)
+        self.assertAlmostEqual(latency[-1], 0.22)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_off(self):
+        """Test that metrics can be turned off"""
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_404_NOT_FOUND)
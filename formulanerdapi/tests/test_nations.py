@@ -1,6 +1,8 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from formulanerdapi.models import Nation
+from django.test import override_settings
+from formulanerdapi.utils.response_cache import get_response_cache
 
 class NationViewTests(APITestCase):
     
@@ -58,3 +60,32 @@ class NationViewTests(APITestCase):
         """Test deleting a nation that does not exist"""
         response = self.client.delete("/nations/999")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_nations_not_modified(self):
+        """Test that a matching If-None-Match returns 304"""
+        response = self.client.get("/nations")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+
+        response = self.client.get("/nations", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_list_nations_etag_changes_after_write(self):
+        """Test that writing a nation changes the list ETag"""
+        etag = self.client.get("/nations")["ETag"]
+        self.client.put(f"/nations/{self.nation1.id}", {"name": "Deutschland", "flag_image_url": "https://example.com/germany.png"}, format="json")
+
+        response = self.client.get("/nations", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(RESPONSE_CACHE={"BACKEND": "formulanerdapi.utils.response_cache.DjangoCacheBackend", "OPTIONS": {"alias": "default"}})
+    def test_retrieve_nation_cached_in_shared_backend(self):
+        """Test caching nations through a Django cache alias"""
+        get_response_cache().clear()
+        self.assertEqual(self.client.get(f"/nations/{self.nation1.id}")["X-Cache"], "MISS")
+
+        response = self.client.get(f"/nations/{self.nation1.id}")
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.data["name"], "Germany")
@@ -0,0 +1,94 @@
+import json
+from asgiref.sync import sync_to_async
+from unittest import mock
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework import status
+from formulanerdapi.models import Nation, Circuit, Constructor, Driver, Race
+from formulanerdapi.utils.profiling import install_query_recorder, record_query
+
+@override_settings(REQUEST_PROFILING_SAMPLE_RATE=1, RESPONSE_CACHE=None)
+class ProfilingMiddlewareTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        nation = Nation.objects.create(name="Italy", flag_image_url="https://example.com/italy.png")
+        circuit = Circuit.objects.create(name="Monza", nation=nation, designer="Alfredo Rosselli")
+        constructor = Constructor.objects.create(name="Ferrari", nation=nation)
+        driver = Driver.objects.create(name="Charles Leclerc", nation=nation, current_constructor=constructor)
+        Race.objects.create(
+            name="Italian Grand Prix", date="2019-09-08", nation=nation, circuit=circuit, distance=306, laps=53,
+            winner_driver=driver, p2_driver=driver, p3_driver=driver
+        )
+
+    def setUp(self):
+        """Build the client, and so its middleware, under each test's settings"""
+        self.client = APIClient()
+
+    def get_timings(self, response):
+        """Returns the Server-Timing header as {name: (duration, description)}"""
+        timings = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, duration, *description = metric.split(";")
+            timings[name] = (float(duration[len("dur="):]), description[0] if description else None)
+        return timings
+
+    def test_server_timing(self):
+        """Test that a profiled response splits its time and counts its queries"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/races")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        timings = self.get_timings(response)
+        self.assertEqual(list(timings), ["db", "serializer", "view", "render", "total"])
+        self.assertEqual(timings["db"][1], f'desc="{len(queries)} queries"')
+        self.assertGreater(timings["serializer"][0], 0)
+        parts = sum(timings[name][0] for name in ("db", "serializer", "view", "render"))
+        self.assertAlmostEqual(parts, timings["total"][0], delta=0.05)
+
+    async def test_async_views_are_profiled(self):
+        """Test that queries an async view runs on another thread are counted"""
+        # As on a connection opened while profiling is on; the test database
+        # connection is older than the test's settings. The view's queries
+        # run on the sync_to_async thread's connection.
+        def record_queries(on):
+            if on:
+                install_query_recorder(sender=None, connection=connection)
+            else:
+                connection.execute_wrappers.remove(record_query)
+
+        await sync_to_async(record_queries)(True)
+        try:
+            race = await Race.objects.aget()
+            response = await AsyncClient().get(f"/async/races/{race.id}")
+        finally:
+            await sync_to_async(record_queries)(False)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        _, description = self.get_timings(response)["db"]
+        self.assertNotEqual(description, 'desc="0 queries"')
+
+    @override_settings(REQUEST_PROFILING_LOG=True)
+    def test_log_line(self):
+        """Test the structured log line of a profiled request"""
+        with self.assertLogs("formulanerdapi.profiling", level="INFO") as logs:
+            self.client.get(f"/drivers/{Driver.objects.get().id}")
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["route"], "driver-detail")
+        self.assertEqual(line["status"], 200)
+        self.assertGreater(line["queries"], 0)
+        self.assertIn("serializer_ms", line)
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0.25)
+    def test_sampling(self):
+        """Test that only the sampled fraction of requests is profiled"""
+        with mock.patch("formulanerdapi.middleware.random.random", side_effect=[0.1, 0.5]):
+            self.assertIn("Server-Timing", self.client.get("/nations"))
+            self.assertNotIn("Server-Timing", self.client.get("/nations"))
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0)
+    def test_off(self):
+        """Test that profiling off leaves responses alone"""
+        self.assertNotIn("Server-Timing", self.client.get("/nations"))
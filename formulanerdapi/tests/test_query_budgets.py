@@ -0,0 +1,37 @@
+from django.test import TestCase, override_settings
+from rest_framework import status
+from formulanerd.urls import router
+from formulanerdapi.endpoint_budgets import add_users, get_client, get_paths, get_read_routes, load_budgets, measure_request
+from formulanerdapi.seeding import seed_database
+
+@override_settings(RESPONSE_CACHE=None)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a small dataset; query budgets hold at any size"""
+        seed_database(300, 300, seed=1)
+        add_users(10)
+
+    def test_every_read_route_has_a_budget(self):
+        """Test that new GET routes cannot skip endpoint_budgets.json"""
+        budgets = load_budgets()
+        for name, _, _ in get_read_routes(router):
+            with self.subTest(route=name):
+                self.assertIn("max_queries", budgets.get(name, {}))
+
+    def test_read_routes_stay_within_query_budgets(self):
+        """Test that every GET route answers 200 within its query budget, N+1 queries included"""
+        budgets = load_budgets()
+        client = get_client()
+        for name, path, model in get_read_routes(router):
+            budget = budgets[name]
+            paths = get_paths(path, model, budget, 3)
+            # The first request may build an in-process index (rosters,
+            # podiums, autocomplete); budgets are for the requests after it
+            measure_request(client, paths[0])
+            for request_path in paths:
+                with self.subTest(route=name, path=request_path):
+                    result = measure_request(client, request_path)
+                    self.assertEqual(result["status"], status.HTTP_200_OK)
+                    self.assertLessEqual(result["queries"], budget["max_queries"])
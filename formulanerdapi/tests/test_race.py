@@ -1,6 +1,13 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from formulanerdapi.models import Race, Nation, Circuit, Driver, Constructor
+from formulanerdapi.utils.response_cache import get_response_cache
+from django.test import override_settings
+import json
+from base64 import b64encode
+from urllib.parse import urlencode
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 class RaceViewTests(APITestCase):
@@ -203,3 +210,237 @@ class RaceViewTests(APITestCase):
         response = self.client.post("/races", data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, {"error": "Driver not found."})
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_list_races_query_count_is_constant(self):
+        """Test that listing races does not issue queries per row"""
+        with CaptureQueriesContext(connection) as before:
+            self.client.get("/races")
+
+        for i in range(5):
+            nation = Nation.objects.create(name=f"Nation {i}", flag_image_url="https://example.com/flag.png")
+            circuit = Circuit.objects.create(name=f"Circuit {i}", nation=nation)
+            constructor = Constructor.objects.create(name=f"Constructor {i}", nation=nation)
+            driver = Driver.objects.create(name=f"Driver {i}", nation=nation, current_constructor=constructor)
+            Race.objects.create(
+                name=f"Grand Prix {i}",
+                circuit=circuit,
+                date="2025-10-01",
+                nation=nation,
+                distance=300.000,
+                laps=60,
+                winner_driver=driver,
+                p2_driver=self.driver1,
+                p3_driver=self.driver2
+            )
+
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get("/races")
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(len(after), len(before))
+
+    def test_list_races_paginated_by_date(self):
+        """Test paging through races with cursors"""
+        response = self.client.get("/races?page_size=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["name"], "Belgian Grand Prix")
+        self.assertIn('rel="next"', response["Link"])
+
+        next_link = response["Link"].split(";")[0].strip("<>")
+        response = self.client.get(next_link)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["name"], "Italian Grand Prix")
+        self.assertIn('rel="prev"', response["Link"])
+        self.assertNotIn('rel="next"', response["Link"])
+
+    def test_list_races_paginated_with_a_tampered_cursor(self):
+        """Test that cursors holding values that are not a race's key are not found"""
+        for position in (["not-a-date", "x"], ["2019-09-08", None], ["2019-09-08", [1]], ["2019-09-08"], {"id": 1}):
+            with self.subTest(position=position):
+                cursor = b64encode(urlencode({"p": json.dumps(position)}).encode()).decode()
+                response = self.client.get("/races", {"page_size": 1, "cursor": cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_races_paginated_by_nation(self):
+        """Test that pagination keeps the nation filter"""
+        response = self.client.get(f"/races?nation={self.nation2.id}&page_size=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["name"], "Italian Grand Prix")
+        self.assertFalse(response.has_header("Link"))
+
+    def test_list_races_streamed(self):
+        """Test that a streamed race list matches the regular response byte for byte"""
+        expected = self.client.get("/races").content
+        response = self.client.get("/races?stream=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), expected)
+
+    @override_settings(STREAMING_LIST_THRESHOLD=1, RESPONSE_CACHE=None)
+    def test_list_races_streamed_above_threshold(self):
+        """Test that race lists larger than the threshold are streamed automatically"""
+        response = self.client.get("/races")
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(json.loads(b"".join(response.streaming_content))), 2)
+
+    def test_retrieve_race_with_sparse_fields(self):
+        """Test retrieving only the requested race fields"""
+        response = self.client.get(f"/races/{self.race1.id}?fields=id,name,date")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"id", "name", "date"})
+
+    def test_list_races_with_expand(self):
+        """Test that only expanded relations are nested and the rest are ids"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/races?expand=winner_driver,circuit.nation")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        race = response.data[0]
+        self.assertEqual(race["nation"], self.nation1.id)
+        self.assertEqual(race["p2_driver"], self.driver2.id)
+        self.assertEqual(race["winner_driver"]["name"], "Lewis Hamilton")
+        self.assertEqual(race["winner_driver"]["current_constructor"], self.constructor1.id)
+        self.assertEqual(race["circuit"]["nation"]["name"], "Germany")
+
+        race_queries = [query["sql"] for query in queries if 'FROM "formulanerdapi_race"' in query["sql"]]
+        self.assertEqual(len(race_queries), 1)
+        self.assertNotIn("formulanerdapi_constructor", race_queries[0])
+
+    def test_list_races_not_modified_skips_queryset(self):
+        """Test that a 304 only reads the table versions"""
+        etag = self.client.get("/races")["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get("/races", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_race_etag_changes_when_nested_nation_changes(self):
+        """Test that writing a nation embedded through depth changes the race ETag"""
+        etag = self.client.get(f"/races/{self.race1.id}")["ETag"]
+        self.nation1.name = "Deutschland"
+        self.nation1.save()
+
+        response = self.client.get(f"/races/{self.race1.id}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["nation"]["name"], "Deutschland")
+
+    @override_settings(RESPONSE_CACHE={"BACKEND": "formulanerdapi.utils.response_cache.LRUBackend", "OPTIONS": {"max_entries": 8}})
+    def test_list_races_cached_until_nested_nation_changes(self):
+        """Test that cached race lists are served until an embedded nation is written"""
+        response = self.client.get("/races")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/races")
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(get_response_cache().stats(), {"hits": 1, "misses": 1})
+
+        self.nation1.name = "Deutschland"
+        self.nation1.save()
+        response = self.client.get("/races")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data[0]["nation"]["name"], "Deutschland")
+
+    def test_create_race_loads_drivers_in_one_query(self):
+        """Test that the three race drivers are resolved with a single query"""
+        data = {
+            "name": "Hungarian Grand Prix",
+            "date": "2025-08-02",
+            "nation_id": self.nation1.id,
+            "circuit_id": self.circuit1.id,
+            "distance": 306.630,
+            "laps": 70,
+            "winner_driver_id": self.driver1.id,
+            "p2_driver_id": self.driver2.id,
+            "p3_driver_id": self.driver1.id
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/races", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        driver_lookups = [query for query in queries if query["sql"].startswith('SELECT "formulanerdapi_driver"')]
+        self.assertEqual(len(driver_lookups), 1)
+
+    def test_update_race_with_invalid_driver(self):
+        """Test that updating a race with an unknown driver names the field"""
+        data = {
+            "winner_driver_id": self.driver1.id,
+            "p3_driver_id": 999
+        }
+        response = self.client.put(f"/races/{self.race1.id}", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Invalid p3_driver_id, driver not found."})
+
+    def bulk_race(self, name, **overrides):
+        """Build a bulk race payload"""
+        race = {
+            "name": name,
+            "date": "2024-05-26",
+            "nation_id": self.nation2.id,
+            "circuit_id": self.circuit2.id,
+            "distance": 306.720,
+            "laps": 53,
+            "winner_driver_id": self.driver1.id,
+            "p2_driver_id": self.driver2.id,
+            "p3_driver_id": self.driver1.id
+        }
+        race.update(overrides)
+        return race
+
+    def test_bulk_create_races(self):
+        """Test creating many races in one request with a fixed number of queries"""
+        data = [self.bulk_race(f"Grand Prix {i}") for i in range(50)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/races/bulk", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 50)
+        self.assertEqual(Race.objects.count(), 52)
+        self.assertEqual(response.data["results"][0]["id"], Race.objects.get(name="Grand Prix 0").id)
+        self.assertLess(len(queries), 15)
+
+    def test_bulk_create_races_is_all_or_nothing(self):
+        """Test that one invalid race rolls back the whole request"""
+        data = [self.bulk_race("Good Grand Prix"), self.bulk_race("Bad Grand Prix", p2_driver_id=999)]
+        response = self.client.post("/races/bulk", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual(response.data["results"][1], {"index": 1, "error": "Driver not found."})
+        self.assertEqual(Race.objects.count(), 2)
+
+    def test_bulk_create_races_partial(self):
+        """Test that atomic=false keeps the valid races"""
+        data = [self.bulk_race("Good Grand Prix"), self.bulk_race("Bad Grand Prix", laps="many")]
+        response = self.client.post("/races/bulk?atomic=false", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data["created"], 1)
+        self.assertIn("laps", response.data["results"][1]["error"])
+        self.assertTrue(Race.objects.filter(name="Good Grand Prix").exists())
+
+    def test_bulk_create_races_from_ndjson(self):
+        """Test creating races from a newline-delimited JSON stream"""
+        body = "\n".join(json.dumps(self.bulk_race(f"Grand Prix {i}")) for i in range(3))
+        response = self.client.post("/races/bulk", body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(Race.objects.count(), 5)
+
+    def test_bulk_create_races_with_malformed_ndjson_line(self):
+        """Test that a malformed line is reported on its own and the lines after it still read"""
+        lines = [json.dumps(self.bulk_race("Grand Prix 0")), '{"name": ', json.dumps(self.bulk_race("Grand Prix 2"))]
+        response = self.client.post("/races/bulk?atomic=false", "\n".join(lines), content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data["created"], 2)
+        self.assertTrue(response.data["results"][1]["error"].startswith("NDJSON parse error on line 2"))
+        self.assertTrue(Race.objects.filter(name="Grand Prix 2").exists())
+
+        response = self.client.post("/races/bulk", "\n".join(lines), content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Race.objects.count(), 4)
+
+    def test_bulk_create_races_rejects_bodies_that_are_not_lists(self):
+        """Test that JSON objects, strings and scalars are refused"""
+        for body in ({"name": "Grand Prix"}, "Grand Prix", 5, True, None):
+            with self.subTest(body=body):
+                response = self.client.post("/races/bulk", json.dumps(body), content_type="application/json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data, {"error": "Expected a list of races."})
@@ -0,0 +1,79 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework import status
+from formulanerdapi.models import Nation
+from formulanerdapi.parsers import FastJSONParser
+from formulanerdapi.renderers import FastJSONRenderer
+
+PAYLOAD = {
+    "name": "São Paulo Grand Prix \u2028 \u2029 \"quoted\" 🏁",
+    "date": datetime.date(2019, 9, 8),
+    "time": datetime.time(14, 5, 7, 123456),
+    "started": datetime.datetime(2019, 9, 8, 13, 10, 0, 654321, tzinfo=datetime.timezone.utc),
+    "naive": datetime.datetime(2019, 9, 8, 13, 10),
+    "distance": Decimal("306.720"),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Italy"),
+    1: [1.5, 0.1, None, True, {"laps": 53, "lap_record": 81.046}],
+}
+
+
+class FastJSONTests(APITestCase):
+
+    def test_same_bytes_as_json_renderer(self):
+        """Test dates, times, Decimal, UUIDs, lazy strings, separators and int keys"""
+        for data in (PAYLOAD, [PAYLOAD, PAYLOAD], {"nested": {"deep": [PAYLOAD]}}, [], "text", 1, {"huge": 2 ** 70}):
+            with self.subTest(data=data):
+                self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_indented_output_is_left_to_json_renderer(self):
+        """Test that ?indent= output is the stdlib's"""
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD, media_type), JSONRenderer().render(PAYLOAD, media_type)
+        )
+
+    def test_without_orjson(self):
+        """Test that both fall back to the stdlib when orjson is not installed"""
+        with mock.patch("formulanerdapi.renderers.orjson", None), mock.patch("formulanerdapi.parsers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b'{"laps": 53}')), {"laps": 53})
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(b'{"laps": }'))
+
+    def test_same_data_as_json_parser(self):
+        """Test parsing, including integers past 64 bits and other encodings"""
+        body = '{"name": "São Paulo 🏁", "laps": 71, "distance": 305.909, "huge": 1180591620717411303424}'.encode()
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+        latin = '{"name": "São Paulo"}'.encode("latin-1")
+        context = {"encoding": "latin-1"}
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(latin), parser_context=context),
+            JSONParser().parse(io.BytesIO(latin), parser_context=context),
+        )
+
+    def test_bad_json_is_a_parse_error(self):
+        """Test malformed JSON and the NaN and Infinity constants"""
+        for body in (b'{"laps": }', b'', b'{"laps": NaN}', b'[Infinity]'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+    def test_api_reads_and_writes_json(self):
+        """Test that the API renders and parses with the fast classes"""
+        response = self.client.post(
+            "/nations", {"name": "Brazil", "flag_image_url": "https://example.com/brazil.png"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.json()["name"], "Brazil")
+        self.assertTrue(Nation.objects.filter(name="Brazil").exists())
@@ -0,0 +1,58 @@
+import time
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from formulanerdapi.models import Nation, ReplicationHeartbeat
+from formulanerdapi.replication import clear_replica_lags, get_replica_lag, replay
+from formulanerdapi.routers import ReplicaRouter, use_primary
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_MAX_LAG=60, RESPONSE_CACHE=None)
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        """Start every test with a replica that has caught up"""
+        self.client = APIClient()
+        self.nation = Nation.objects.create(name="Brazil", flag_image_url="https://example.com/brazil.png")
+        replay('replica')
+
+    def tearDown(self):
+        clear_replica_lags()
+
+    def test_reads_come_from_the_replica(self):
+        """Test that list and retrieve read the replica, which sees writes once replayed"""
+        response = self.client.post("/nations", {"name": "Chile", "flag_image_url": ""}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        chile = response.data["id"]
+
+        self.assertEqual(self.client.get(f"/nations/{chile}").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual([row["name"] for row in self.client.get("/nations").data], ["Brazil"])
+
+        replay('replica')
+        self.assertEqual(self.client.get(f"/nations/{chile}").data["name"], "Chile")
+
+    def test_writes_read_the_primary(self):
+        """Test that a write request reads its own rows from the primary"""
+        chile = Nation.objects.create(name="Chile", flag_image_url="")
+        response = self.client.put(f"/nations/{chile.id}", {"name": "Chile", "flag_image_url": "x"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        router = ReplicaRouter()
+        token = use_primary.set(False)
+        try:
+            self.assertEqual(router.db_for_read(Nation), 'replica')
+            router.db_for_write(Nation)
+            self.assertEqual(router.db_for_read(Nation), DEFAULT_DB_ALIAS)
+        finally:
+            use_primary.reset(token)
+        self.assertEqual(router.db_for_read(Nation), DEFAULT_DB_ALIAS)
+
+    def test_lagging_replicas_are_skipped(self):
+        """Test falling back to the primary when the replica is too far behind"""
+        ReplicationHeartbeat.objects.using('replica').update(beat=time.time_ns() - 120 * 10 ** 9)
+        clear_replica_lags()
+        self.assertGreater(get_replica_lag('replica'), 60)
+
+        chile = Nation.objects.create(name="Chile", flag_image_url="")
+        self.assertEqual(self.client.get(f"/nations/{chile.id}").data["name"], "Chile")
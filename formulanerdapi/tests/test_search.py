@@ -0,0 +1,97 @@
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from formulanerdapi.models import Nation, Circuit, Constructor, Driver, Race
+
+class SearchTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        cls.nation = Nation.objects.create(name="United Kingdom", flag_image_url="https://example.com/uk.png")
+        cls.constructor = Constructor.objects.create(
+            name="Mercedes", location="Brackley", nation=cls.nation, about="Eight constructors' titles in a row"
+        )
+        cls.circuit = Circuit.objects.create(name="Silverstone", nation=cls.nation, designer="Hermann Tilke")
+        cls.hamilton = Driver.objects.create(
+            name="Lewis Hamilton", nation=cls.nation, current_constructor=cls.constructor,
+            about="Seven time world champion from Stevenage"
+        )
+        cls.russell = Driver.objects.create(
+            name="George Russell", nation=cls.nation, current_constructor=cls.constructor,
+            about="Drove alongside Lewis Hamilton at Mercedes"
+        )
+        cls.race = Race.objects.create(
+            name="British Grand Prix", date="2024-07-07", nation=cls.nation, circuit=cls.circuit,
+            distance=306, laps=52, winner_driver=cls.hamilton, p2_driver=cls.russell, p3_driver=cls.hamilton
+        )
+
+    def results(self, url):
+        """Returns (type, name) for each result of a search request"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(row["type"], row["name"]) for row in response.data]
+
+    def test_search_ranks_name_matches_first(self):
+        """Test that a name match outranks a mention in another field"""
+        self.assertEqual(
+            self.results("/search?q=hamilton"),
+            [("driver", "Lewis Hamilton"), ("driver", "George Russell")]
+        )
+
+    def test_search_matches_prefixes_and_every_word(self):
+        """Test prefix matching and that every word has to match"""
+        self.assertEqual(self.results("/search?q=silver"), [("circuit", "Silverstone")])
+        self.assertEqual(self.results("/search?q=brackley%20mercedes"), [("constructor", "Mercedes")])
+        self.assertEqual(self.results("/search?q=grand%20prix%20monaco"), [])
+
+    def test_search_ignores_query_syntax(self):
+        """Test that FTS5 operators in the query are treated as words"""
+        self.assertEqual(self.results('/search?q=%22tilke%22%20*(-'), [("circuit", "Silverstone")])
+
+    def test_search_filtered_by_type(self):
+        """Test restricting results to some types"""
+        self.assertEqual(self.results("/search?q=mercedes&type=constructor"), [("constructor", "Mercedes")])
+
+        response = self.client.get("/search?q=mercedes&type=team")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/search")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_follows_writes(self):
+        """Test that triggers keep the index in step with updates, deletes and bulk inserts"""
+        self.race.name = "Silverstone Grand Prix"
+        self.race.save()
+        self.assertEqual(self.results("/search?q=british"), [])
+        self.assertEqual(self.results("/search?q=grand%20prix"), [("race", "Silverstone Grand Prix")])
+
+        self.russell.delete()
+        self.assertEqual(self.results("/search?q=russell"), [])
+
+        Driver.objects.bulk_create([Driver(name="Lando Norris", nation=self.nation, current_constructor=self.constructor)])
+        self.assertEqual(self.results("/search?q=norris"), [("driver", "Lando Norris")])
+
+    def test_rebuild_search_index_command(self):
+        """Test rebuilding the index from the source tables"""
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM formulanerdapi_search")
+        self.assertEqual(self.results("/search?q=silverstone"), [])
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 5 rows", out.getvalue())
+        self.assertEqual(self.results("/search?q=silverstone"), [("circuit", "Silverstone")])
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_search_without_fts(self):
+        """Test the substring fallback for databases without FTS5"""
+        with mock.patch("formulanerdapi.search.uses_fts", return_value=False):
+            self.assertEqual(
+                self.results("/search?q=hamilton"),
+                [("driver", "Lewis Hamilton"), ("driver", "George Russell")]
+            )
+            self.assertEqual(self.results("/search?q=brackley%20mercedes"), [("constructor", "Mercedes")])
@@ -0,0 +1,72 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from formulanerdapi.models import Nation, Circuit, Constructor, Driver, Race, DriverConstructorHistory, DriverStanding
+from formulanerdapi.search import search
+
+class SeedCommandTests(TestCase):
+
+    def seed(self, *args):
+        """Run the seed command and return its output"""
+        out = StringIO()
+        call_command("seed", *args, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self):
+        """Returns every seeded row, for comparing two runs"""
+        return [
+            list(model.objects.order_by('pk').values_list())
+            for model in (Nation, Constructor, Circuit, Driver, DriverConstructorHistory, Race)
+        ]
+
+    def test_seed_is_consistent(self):
+        """Test row counts, careers without overlaps, podiums of drivers racing that season, and derived tables"""
+        self.seed("--scale", "300", "--races", "500", "--seed", "7")
+        self.assertEqual(Driver.objects.count(), 300)
+        self.assertEqual(Race.objects.count(), 500)
+        self.assertEqual(Nation.objects.count(), 12)
+
+        careers = {}
+        for driver_id, start, end in DriverConstructorHistory.objects.order_by('driver', 'start_year').values_list(
+            'driver', 'start_year', 'end_year'
+        ):
+            career = careers.setdefault(driver_id, [])
+            if career:
+                self.assertIsNotNone(career[-1][1])
+                self.assertGreater(start, career[-1][1])
+            career.append((start, end))
+        self.assertEqual(len(careers), 300)
+
+        def races_in(driver_id, season):
+            return any(start <= season <= (end or 2024) for start, end in careers[driver_id])
+
+        for race in Race.objects.select_related('circuit'):
+            podium = {race.winner_driver_id, race.p2_driver_id, race.p3_driver_id}
+            self.assertEqual(len(podium), 3)
+            self.assertEqual(race.nation_id, race.circuit.nation_id)
+            for driver_id in podium:
+                self.assertTrue(races_in(driver_id, race.date.year))
+
+        self.assertEqual(sum(DriverStanding.objects.values_list('podiums', flat=True)), 1500)
+        driver = Driver.objects.first()
+        self.assertIn({"type": "driver", "id": driver.id, "name": driver.name}, search(driver.name, kinds=["driver"]))
+
+    def test_seed_is_deterministic(self):
+        """Test that the same seed gives the same rows, and another seed does not"""
+        self.seed("--scale", "50", "--seed", "3")
+        first = self.snapshot()
+
+        Nation.objects.all().delete()
+        self.seed("--scale", "50", "--seed", "3")
+        self.assertEqual(self.snapshot(), first)
+
+        Nation.objects.all().delete()
+        self.seed("--scale", "50", "--seed", "4")
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_seed_needs_an_empty_database(self):
+        """Test that seeding refuses to mix with existing rows"""
+        Nation.objects.create(name="Monaco", flag_image_url="https://example.com/monaco.png")
+        with self.assertRaises(CommandError):
+            self.seed("--scale", "50")
@@ -0,0 +1,104 @@
+import json
+import tempfile
+from pathlib import Path
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APIClient, APITestCase
+from rest_framework import status
+from formulanerdapi.models import Nation, Circuit, Constructor, Driver, Race
+from formulanerdapi.slow_queries import SlowQueryLog, get_slow_query_log
+
+class SlowQueryTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        nation = Nation.objects.create(name="Italy", flag_image_url="https://example.com/italy.png")
+        circuit = Circuit.objects.create(name="Monza", nation=nation, designer="Alfredo Rosselli")
+        constructor = Constructor.objects.create(name="Ferrari", nation=nation)
+        driver = Driver.objects.create(name="Charles Leclerc", nation=nation, current_constructor=constructor)
+        cls.race = Race.objects.create(
+            name="Italian Grand Prix", date="2019-09-08", nation=nation, circuit=circuit, distance=306, laps=53,
+            winner_driver=driver, p2_driver=driver, p3_driver=driver
+        )
+        cls.admin = get_user_model().objects.create(username="admin", is_staff=True)
+
+    def setUp(self):
+        """Log to a file of each test's own, with nothing kept from other tests"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log_file = Path(directory.name) / "logs" / "slow.log"
+        settings = override_settings(SLOW_QUERY_LOG_FILE=self.log_file, RESPONSE_CACHE=None)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        get_slow_query_log().clear()
+        self.client = APIClient()
+
+    def read_log(self):
+        """Returns every JSON line of the slow query log file"""
+        if not self.log_file.exists():
+            return []
+        return [json.loads(line) for line in self.log_file.read_text().splitlines()]
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_queries_are_logged_with_their_view_and_plan(self):
+        """Test a logged statement's parameters, route, view action, stack and plan"""
+        response = self.client.get(f"/races/{self.race.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        records = [record for record in self.read_log() if "formulanerdapi_race" in record["sql"].split("FROM")[1]]
+        self.assertTrue(records)
+        record = records[0]
+        self.assertEqual(record["route"], "race-detail")
+        self.assertEqual(record["view"], "RaceView.retrieve")
+        self.assertIn(str(self.race.id), record["params"])
+        self.assertTrue(any(frame.startswith("formulanerdapi/views/race.py") for frame in record["stack"]))
+        self.assertIn("SEARCH formulanerdapi_race USING INTEGER PRIMARY KEY (rowid=?)", record["plan"])
+        self.assertEqual(record["unindexed"], [])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_scans_without_an_index_are_flagged(self):
+        """Test that a statement reading a whole table lists the scan under unindexed"""
+        self.client.get("/races")
+        records = [record for record in self.read_log() if record["route"] == "race-list"]
+        self.assertTrue(any("SCAN formulanerdapi_race" in record["unindexed"] for record in records))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_admins_see_the_slowest_statements(self):
+        """Test the in-memory top list, for admins only"""
+        self.client.get("/races")
+        self.client.get("/races")
+        self.assertEqual(self.client.get("/slowqueries").status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/slowqueries")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        slowest = [entry["max_ms"] for entry in response.data]
+        self.assertEqual(slowest, sorted(slowest, reverse=True))
+        races = [entry for entry in response.data if entry["route"] == "race-list"]
+        self.assertTrue(races)
+        self.assertTrue(all(entry["count"] == 2 for entry in races))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=10_000)
+    def test_fast_queries_are_not_logged(self):
+        """Test that statements under the threshold are left out"""
+        self.client.get("/races")
+        self.assertEqual(self.read_log(), [])
+        self.assertEqual(get_slow_query_log().top(), [])
+
+    def test_off(self):
+        """Test that nothing is recorded without a threshold"""
+        self.client.get("/races")
+        self.assertEqual(self.read_log(), [])
+        self.assertEqual(get_slow_query_log().top(), [])
+
+    def test_only_the_slowest_are_kept(self):
+        """Test that the in-memory log keeps the slowest statements, by text"""
+        log = SlowQueryLog(2)
+        for sql, duration in (("a", 5), ("b", 1), ("a", 7), ("c", 3), ("d", 2)):
+            log.add({
+                "sql": sql, "duration_ms": duration, "params": "()", "route": "race-list",
+                "view": "RaceView.list", "stack": [], "plan": [], "unindexed": [],
+            })
+        top = log.top()
+        self.assertEqual([(entry["sql"], entry["max_ms"], entry["count"]) for entry in top], [("a", 7, 2), ("c", 3, 1)])
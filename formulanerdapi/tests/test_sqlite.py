@@ -0,0 +1,69 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+from formulanerdapi.backends.sqlite3.base import DatabaseWrapper
+from formulanerdapi.utils.sqlite import WriteQueue, apply_pragmas
+
+class SQLiteProfileTests(TestCase):
+
+    def pragma(self, cursor, name):
+        """Returns the current value of a pragma"""
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+    def test_connections_get_the_profile(self):
+        """Test that Django's connections run the configured pragmas"""
+        with connection.cursor() as cursor:
+            self.assertEqual(self.pragma(cursor, 'busy_timeout'), 5000)
+            self.assertEqual(self.pragma(cursor, 'cache_size'), -65536)
+            self.assertEqual(self.pragma(cursor, 'synchronous'), 1)
+
+    def test_apply_pragmas_to_a_file(self):
+        """Test WAL and mmap on a database file"""
+        with tempfile.TemporaryDirectory() as directory:
+            database = sqlite3.connect(Path(directory) / 'profile.sqlite3')
+            cursor = database.cursor()
+            apply_pragmas(cursor, {'journal_mode': 'WAL', 'mmap_size': 2 ** 20})
+            self.assertEqual(self.pragma(cursor, 'journal_mode'), 'wal')
+            self.assertEqual(self.pragma(cursor, 'mmap_size'), 2 ** 20)
+            database.close()
+
+    def test_transaction_mode(self):
+        """Test that transactions begin IMMEDIATE and bad modes are refused"""
+        connection.ensure_connection()
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+        settings_dict = {**connection.settings_dict, 'OPTIONS': {'transaction_mode': 'eventually'}}
+        with self.assertRaises(ImproperlyConfigured):
+            DatabaseWrapper(settings_dict).get_connection_params()
+
+    def test_write_queue_takes_turns(self):
+        """Test that writers never overlap, are served in arrival order and may re-enter"""
+        queue = WriteQueue()
+        events = []
+
+        def write(name):
+            with queue:
+                with queue:
+                    events.append(('start', name))
+                    time.sleep(0.01)
+                    events.append(('end', name))
+
+        queue.acquire()
+        threads = []
+        for name in range(5):
+            thread = threading.Thread(target=write, args=(name,))
+            thread.start()
+            threads.append(thread)
+            # Let each writer take its ticket before the next one arrives
+            time.sleep(0.02)
+        queue.release()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(events, [(kind, name) for name in range(5) for kind in ('start', 'end')])
@@ -0,0 +1,206 @@
+import json
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from formulanerdapi.history_index import ConstructorIndex
+from formulanerdapi.models import Race, Nation, Circuit, Driver, Constructor, DriverStanding, DriverConstructorHistory
+from formulanerdapi.standings import compute_standings, rebuild_standings
+
+class StandingsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        cls.nation = Nation.objects.create(name="Germany", flag_image_url="https://example.com/germany.png")
+        cls.circuit = Circuit.objects.create(name="Hockenheim", nation=cls.nation)
+        cls.constructor = Constructor.objects.create(name="Mercedes", nation=cls.nation)
+        cls.driver1 = Driver.objects.create(name="Lewis Hamilton", nation=cls.nation, current_constructor=cls.constructor)
+        cls.driver2 = Driver.objects.create(name="Max Verstappen", nation=cls.nation, current_constructor=cls.constructor)
+        cls.driver3 = Driver.objects.create(name="Charles Leclerc", nation=cls.nation, current_constructor=cls.constructor)
+        cls.driver4 = Driver.objects.create(name="Lando Norris", nation=cls.nation, current_constructor=cls.constructor)
+
+    def create_race(self, date, winner, p2, p3):
+        """Create a race with the given podium"""
+        return Race.objects.create(
+            name=f"Grand Prix {date}", date=date, nation=self.nation, circuit=self.circuit,
+            distance=300, laps=60, winner_driver=winner, p2_driver=p2, p3_driver=p3
+        )
+
+    def standing(self, season, driver):
+        """Returns (points, wins, podiums) for a driver, or None without a row"""
+        row = DriverStanding.objects.filter(season=season, driver=driver).values_list('points', 'wins', 'podiums').first()
+        return row
+
+    def test_race_create_updates_standings(self):
+        """Test that saving races keeps the standings in step"""
+        self.create_race("2024-03-02", self.driver1, self.driver2, self.driver3)
+        self.create_race("2024-03-09", self.driver2, self.driver1, self.driver3)
+
+        self.assertEqual(self.standing(2024, self.driver1), (Decimal("43"), 1, 2))
+        self.assertEqual(self.standing(2024, self.driver2), (Decimal("43"), 1, 2))
+        self.assertEqual(self.standing(2024, self.driver3), (Decimal("30"), 0, 2))
+
+    def test_race_update_moves_points(self):
+        """Test that changing a podium recomputes the old and new drivers"""
+        race = self.create_race("2024-03-02", self.driver1, self.driver2, self.driver3)
+        race.p3_driver = self.driver4
+        race.save()
+
+        self.assertIsNone(self.standing(2024, self.driver3))
+        self.assertEqual(self.standing(2024, self.driver4), (Decimal("15"), 0, 1))
+
+        race.date = "2023-03-02"
+        race.save()
+        self.assertFalse(DriverStanding.objects.filter(season=2024).exists())
+        self.assertEqual(self.standing(2023, self.driver1), (Decimal("25"), 1, 1))
+
+    def test_race_delete_removes_points(self):
+        """Test that deleting a race takes its points away"""
+        self.create_race("2024-03-02", self.driver1, self.driver2, self.driver3)
+        race = self.create_race("2024-03-09", self.driver1, self.driver3, self.driver4)
+        race.delete()
+
+        self.assertEqual(self.standing(2024, self.driver1), (Decimal("25"), 1, 1))
+        self.assertIsNone(self.standing(2024, self.driver4))
+
+    def test_points_per_era(self):
+        """Test that each season uses its own points system"""
+        self.create_race("1985-07-07", self.driver1, self.driver2, self.driver3)
+        self.create_race("2005-07-07", self.driver1, self.driver2, self.driver3)
+
+        self.assertEqual(self.standing(1985, self.driver1)[0], Decimal("9"))
+        self.assertEqual(self.standing(2005, self.driver2)[0], Decimal("8"))
+
+        with override_settings(STANDINGS_POINTS_SYSTEMS=((1950, (1, 0, 0)),)):
+            call_command("rebuild_standings", stdout=StringIO())
+        self.assertEqual(self.standing(2005, self.driver1)[0], Decimal("1"))
+        self.assertEqual(self.standing(2005, self.driver2), (Decimal("0"), 0, 1))
+
+    def test_compute_standings_per_season(self):
+        """Test that each season is totalled from its own races only"""
+        self.create_race("2021-12-12", self.driver1, self.driver2, self.driver3)
+        self.create_race("2024-03-02", self.driver1, self.driver2, self.driver4)
+        self.create_race("2024-03-09", self.driver2, self.driver1, self.driver4)
+
+        standings = compute_standings(Race.objects.all(), 2024)
+        self.assertEqual(
+            {driver_id: (standing.season, standing.points, standing.wins, standing.podiums)
+             for driver_id, standing in standings.items()},
+            {
+                self.driver1.id: (2024, Decimal("43"), 1, 2),
+                self.driver2.id: (2024, Decimal("43"), 1, 2),
+                self.driver4.id: (2024, Decimal("30"), 0, 2),
+            }
+        )
+        self.assertEqual(compute_standings(Race.objects.all(), 2022), {})
+
+        self.assertEqual(rebuild_standings(), 6)
+        self.assertEqual(self.standing(2021, self.driver1), (Decimal("25"), 1, 1))
+        self.assertEqual(self.standing(2021, self.driver3), (Decimal("15"), 0, 1))
+        self.assertIsNone(self.standing(2024, self.driver3))
+
+    def test_bulk_races_update_standings(self):
+        """Test that the bulk race endpoint keeps the standings in step"""
+        races = [
+            {"name": "Bahrain", "date": "2024-03-02", "nation_id": self.nation.id, "circuit_id": self.circuit.id, "distance": 300, "laps": 60,
+             "winner_driver_id": self.driver1.id, "p2_driver_id": self.driver2.id, "p3_driver_id": self.driver3.id},
+            {"name": "Jeddah", "date": "2024-03-09", "nation_id": self.nation.id, "circuit_id": self.circuit.id, "distance": 300, "laps": 60,
+             "winner_driver_id": self.driver1.id, "p2_driver_id": self.driver3.id, "p3_driver_id": self.driver2.id},
+        ]
+        response = self.client.post("/races/bulk", races, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.standing(2024, self.driver1), (Decimal("50"), 2, 2))
+
+    def test_rebuild_standings_command(self):
+        """Test recomputing standings after writes that bypassed signals"""
+        self.create_race("2024-03-02", self.driver1, self.driver2, self.driver3)
+        Race.objects.update(winner_driver=self.driver4)
+
+        out = StringIO()
+        call_command("rebuild_standings", "--season", "2024", stdout=out)
+        self.assertIn("Rebuilt 3 standings rows", out.getvalue())
+        self.assertIsNone(self.standing(2024, self.driver1))
+        self.assertEqual(self.standing(2024, self.driver4), (Decimal("25"), 1, 1))
+
+    def test_list_standings(self):
+        """Test the standings endpoint, latest season by default"""
+        self.create_race("2023-03-02", self.driver4, self.driver3, self.driver2)
+        self.create_race("2024-03-02", self.driver1, self.driver2, self.driver3)
+        self.create_race("2024-03-09", self.driver2, self.driver3, self.driver1)
+
+        response = self.client.get("/standings")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual([row["driver"]["name"] for row in data], ["Max Verstappen", "Lewis Hamilton", "Charles Leclerc"])
+        self.assertEqual(data[0]["points"], "43.00")
+
+        response = self.client.get("/standings?season=2023")
+        self.assertEqual(json.loads(response.content)[0]["driver"]["id"], self.driver4.id)
+
+        response = self.client.get("/standings?season=latest")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConstructorStandingsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data for all tests"""
+        cls.nation = Nation.objects.create(name="Germany", flag_image_url="https://example.com/germany.png")
+        cls.circuit = Circuit.objects.create(name="Hockenheim", nation=cls.nation)
+        cls.mercedes = Constructor.objects.create(name="Mercedes", nation=cls.nation)
+        cls.ferrari = Constructor.objects.create(name="Ferrari", nation=cls.nation)
+        cls.hamilton = Driver.objects.create(name="Lewis Hamilton", nation=cls.nation, current_constructor=cls.ferrari)
+        cls.russell = Driver.objects.create(name="George Russell", nation=cls.nation, current_constructor=cls.mercedes)
+        cls.leclerc = Driver.objects.create(name="Charles Leclerc", nation=cls.nation, current_constructor=cls.ferrari)
+        DriverConstructorHistory.objects.create(driver=cls.hamilton, constructor=cls.mercedes, start_year=2013, end_year=2024)
+        DriverConstructorHistory.objects.create(driver=cls.hamilton, constructor=cls.ferrari, start_year=2025)
+        DriverConstructorHistory.objects.create(driver=cls.russell, constructor=cls.mercedes, start_year=2022)
+        DriverConstructorHistory.objects.create(driver=cls.leclerc, constructor=cls.ferrari, start_year=2019)
+        cls.race = Race.objects.create(
+            name="Bahrain Grand Prix", date="2024-03-02", nation=cls.nation, circuit=cls.circuit, distance=300, laps=60,
+            winner_driver=cls.hamilton, p2_driver=cls.leclerc, p3_driver=cls.russell
+        )
+
+    def test_constructor_index(self):
+        """Test interval lookups, open-ended spells and gaps"""
+        index = ConstructorIndex([(1, 2000, 2004, 10), (1, 2007, None, 11), (1, 2010, 2010, 12)])
+        self.assertEqual(index.constructor_for(1, 2002), 10)
+        self.assertIsNone(index.constructor_for(1, 2005))
+        self.assertEqual(index.constructor_for(1, 2010), 12)
+        self.assertEqual(index.constructor_for(1, 2030), 11)
+        self.assertIsNone(index.constructor_for(1, 1999))
+        self.assertIsNone(index.constructor_for(2, 2002))
+
+    def test_list_constructor_standings(self):
+        """Test attributing driver points to the constructor of the season"""
+        response = self.client.get("/constructorstandings?season=2024")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual([(row["constructor"]["name"], row["points"]) for row in data], [("Mercedes", "40.00"), ("Ferrari", "18.00")])
+        self.assertEqual(data[0]["wins"], 1)
+
+    def test_history_change_invalidates_constructor_standings(self):
+        """Test that a history write is reflected, not served from cache"""
+        response = self.client.get("/constructorstandings?season=2024")
+        etag = response["ETag"]
+
+        DriverConstructorHistory.objects.filter(driver=self.russell).update(start_year=2025)
+        DriverConstructorHistory.objects.create(driver=self.russell, constructor=self.ferrari, start_year=2024, end_year=2024)
+
+        response = self.client.get("/constructorstandings?season=2024", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual([(row["constructor"]["name"], row["points"]) for row in data], [("Ferrari", "33.00"), ("Mercedes", "25.00")])
+
+    def test_race_podium_constructors(self):
+        """Test which constructor each podium finish scored for"""
+        response = self.client.get(f"/races/{self.race.id}/podium")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["position"], row["driver_id"], row["constructor_id"]) for row in response.data],
+            [(1, self.hamilton.id, self.mercedes.id), (2, self.leclerc.id, self.ferrari.id), (3, self.russell.id, self.mercedes.id)]
+        )
@@ -1,6 +1,9 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from formulanerdapi.models import User, Nation, Driver, Circuit, Constructor
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 class UserViewTests(APITestCase):
@@ -184,3 +187,33 @@ class UserViewTests(APITestCase):
         """Test deleting a user that does not exist"""
         response = self.client.delete("/users/999")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_list_users_query_count_is_constant(self):
+        """Test that listing users does not issue queries per row"""
+        with CaptureQueriesContext(connection) as before:
+            self.client.get("/users")
+
+        for i in range(5):
+            nation = Nation.objects.create(name=f"Nation {i}", flag_image_url="https://example.com/flag.png")
+            constructor = Constructor.objects.create(name=f"Constructor {i}", nation=nation)
+            driver = Driver.objects.create(name=f"Driver {i}", nation=nation, current_constructor=constructor)
+            circuit = Circuit.objects.create(name=f"Circuit {i}", nation=nation)
+            User.objects.create(
+                uid=f"user_1{i}",
+                name=f"User {i}",
+                nation=nation,
+                favorite_driver=driver,
+                favorite_circuit=circuit
+            )
+
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get("/users")
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(len(after), len(before))
+
+    def test_list_users_with_sparse_fields(self):
+        """Test that relations come back as ids when not expanded"""
+        response = self.client.get("/users?fields=id,name,favorite_driver")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {"id": self.user1.id, "name": "John Doe", "favorite_driver": self.driver1.id})
@@ -0,0 +1,7 @@
+from .query_planner import optimize_queryset
+from .streaming import should_stream, stream_list
+from .dynamic_fields import DynamicFieldsMixin, get_field_options
+from .versions import conditional_get
+from .response_cache import get_response_cache
+from .resolvers import UnresolvedId, resolve_ids
+from .sqlite import serialized_write
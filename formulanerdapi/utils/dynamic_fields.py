@@ -0,0 +1,92 @@
+from rest_framework import serializers
+from rest_framework.utils.field_mapping import get_nested_relation_kwargs
+
+from .profiling import get_current_profile
+
+
+def parse_expand(value):
+    """Turn "winner_driver,circuit.nation" into a nested dict of relations
+
+    Returns:
+        dict -- {'winner_driver': {}, 'circuit': {'nation': {}}}
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def get_field_options(request):
+    """Read ?fields= and ?expand= from a request
+
+    Returns:
+        dict -- serializer kwargs, empty when the client asked for neither
+    """
+    return parse_field_options(request.query_params)
+
+
+def parse_field_options(query_params):
+    """Read fields and expand from a QueryDict
+
+    Returns:
+        dict -- serializer kwargs, empty when the client asked for neither
+    """
+    options = {}
+    fields = query_params.get('fields', None)
+    expand = query_params.get('expand', None)
+
+    if fields is not None:
+        options['fields'] = {name.strip() for name in fields.split(',') if name.strip()}
+    if fields is not None or expand is not None:
+        options['expand'] = parse_expand(expand or '')
+    return options
+
+
+class DynamicFieldsMixin:
+    """Let a ModelSerializer trim its fields and choose which relations to nest
+
+    Serializers built without `fields`/`expand` behave exactly as their Meta
+    describes. Once `expand` is given, Meta.depth is ignored: only the listed
+    relations are nested and every other relation is rendered as its id.
+    `fields` keeps just the named top-level fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.only_fields = kwargs.pop('fields', None)
+        self.expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+    def get_field_names(self, declared_fields, info):
+        field_names = super().get_field_names(declared_fields, info)
+        if self.only_fields is None:
+            return field_names
+        return [name for name in field_names if name in self.only_fields]
+
+    def to_representation(self, instance):
+        profile = get_current_profile()
+        if profile is None:
+            return super().to_representation(instance)
+        with profile.time_serializer():
+            return super().to_representation(instance)
+
+    def build_field(self, field_name, info, model_class, nested_depth):
+        if self.expand is not None and field_name in info.relations:
+            nested_depth = 1 if field_name in self.expand else 0
+        return super().build_field(field_name, info, model_class, nested_depth)
+
+    def build_nested_field(self, field_name, relation_info, nested_depth):
+        if self.expand is None:
+            return super().build_nested_field(field_name, relation_info, nested_depth)
+
+        class NestedSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+            class Meta:
+                model = relation_info.related_model
+                depth = 0
+                fields = '__all__'
+
+        field_kwargs = get_nested_relation_kwargs(relation_info)
+        field_kwargs['expand'] = self.expand[field_name]
+        return NestedSerializer, field_kwargs
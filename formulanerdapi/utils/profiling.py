@@ -0,0 +1,120 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+# The profile of the request being measured in this context, if any
+_current_profile = ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    """What one request spent its time on
+
+    SQL is counted and timed by a connection execute wrapper. Serializer
+    time is the time spent in top-level serializer to_representation calls,
+    less any SQL they ran (lazy relations), so the two never overlap.
+    A profile started inside another (metrics inside request profiling)
+    also adds what it records to the outer one.
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+        # Set by finish_view
+        self.view_finished = None
+
+    def lineage(self):
+        """Yields this profile and every profile it is nested in"""
+        profile = self
+        while profile is not None:
+            yield profile
+            profile = profile.parent
+
+    def time_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            for profile in self.lineage():
+                profile.sql_time += elapsed
+                profile.queries += 1
+
+    def finish_view(self):
+        """Mark the end of the view, before the response is rendered"""
+        finished = time.perf_counter()
+        for profile in self.lineage():
+            profile.view_finished = finished
+
+    @contextmanager
+    def time_serializer(self):
+        """Add a to_representation call's own time, unless it is nested in another"""
+        self._serializer_depth += 1
+        started, sql_before = time.perf_counter(), self.sql_time
+        try:
+            yield
+        finally:
+            self._serializer_depth -= 1
+            if not self._serializer_depth:
+                elapsed = time.perf_counter() - started - (self.sql_time - sql_before)
+                for profile in self.lineage():
+                    profile.serializer_time += elapsed
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper that times a query for the profile current in this
+    context, if any, whichever thread's connection runs it"""
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile.time_query(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """Add record_query to new connections while request profiling is on
+
+    Async views run their queries on another thread's connection, which a
+    wrapper set up around the request on the calling thread never sees.
+    """
+    if settings.REQUEST_PROFILING_SAMPLE_RATE and record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def get_current_profile():
+    """Returns:
+        RequestProfile -- the profile being recorded, or None
+    """
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_request(using=None):
+    """Record SQL and serializer time for everything run inside the block
+
+    Yields:
+        RequestProfile -- filled in as the block runs
+    """
+    profile = RequestProfile(parent=_current_profile.get())
+    token = _current_profile.set(profile)
+    # Wrappers are added to the lists directly rather than through
+    # connection.execute_wrapper(): this runs on every request while
+    # metrics are on, and the context managers cost more than the rest
+    wrapped = []
+    try:
+        for alias in using or connections:
+            # record_query times queries for whichever profile is current,
+            # so a connection never needs it twice
+            wrappers = connections[alias].execute_wrappers
+            if record_query not in wrappers:
+                wrappers.append(record_query)
+                wrapped.append(wrappers)
+        yield profile
+    finally:
+        for wrappers in wrapped:
+            wrappers.remove(record_query)
+        _current_profile.reset(token)
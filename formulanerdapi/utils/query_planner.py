@@ -0,0 +1,56 @@
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+def get_related_lookups(serializer, prefix=''):
+    """Walk a serializer's fields and collect the relations it will read
+
+    Nested serializers (from an explicit declaration or from Meta.depth)
+    become select_related lookups, nested many=True serializers become
+    prefetch_related lookups. Relations rendered as plain primary keys are
+    skipped since they are read straight off the *_id column.
+
+    Returns:
+        tuple -- (select_related lookups, prefetch_related lookups)
+    """
+    select_related = []
+    prefetch_related = []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        lookup = prefix + field.source.replace('.', '__')
+
+        if isinstance(field, ListSerializer):
+            prefetch_related.append(lookup)
+            nested_select, nested_prefetch = get_related_lookups(field.child, lookup + '__')
+            # Anything below a prefetched relation has to be prefetched as well
+            prefetch_related.extend(nested_select + nested_prefetch)
+        elif isinstance(field, BaseSerializer):
+            select_related.append(lookup)
+            nested_select, nested_prefetch = get_related_lookups(field, lookup + '__')
+            select_related.extend(nested_select)
+            prefetch_related.extend(nested_prefetch)
+
+    return select_related, prefetch_related
+
+
+def optimize_queryset(queryset, serializer):
+    """Apply the select_related/prefetch_related plan a serializer needs
+
+    Accepts either a serializer class or an instance, so views can plan the
+    query before the serializer that will render it exists.
+
+    Returns:
+        QuerySet -- queryset that loads every nested relation up front
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+
+    select_related, prefetch_related = get_related_lookups(serializer)
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
@@ -0,0 +1,57 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from django.core.exceptions import ObjectDoesNotExist
+
+
+class UnresolvedId(ObjectDoesNotExist):
+    """A referenced row that does not exist
+
+    `key` is the lookup that named it and `model` its model. resolve_ids
+    raises it as a subclass of the model's own DoesNotExist as well, so
+    `except Driver.DoesNotExist` still catches a missing driver.
+    """
+
+    def __init__(self, key, model):
+        super().__init__(f"{model.__name__} not found.")
+        self.key = key
+        self.model = model
+
+
+@lru_cache(maxsize=None)
+def get_unresolved_id_class(model):
+    """Returns:
+        type -- UnresolvedId for `model`, also a `model.DoesNotExist`
+    """
+    return type(f'Unresolved{model.__name__}Id', (UnresolvedId, model.DoesNotExist), {})
+
+
+def resolve_ids(lookups):
+    """Load every referenced row with one IN query per model
+
+    Takes (key, model, pk) triples, for example
+    ("winner_driver_id", Driver, 4), ("p2_driver_id", Driver, 7); all three
+    race drivers are then fetched by a single query.
+
+    Returns:
+        dict -- key to model instance
+
+    Raises:
+        UnresolvedId -- for the first lookup, in the order given, whose row
+        is missing; it is also the model's DoesNotExist
+    """
+    pks = []
+    ids_by_model = defaultdict(set)
+    for key, model, pk in lookups:
+        pk = model._meta.pk.to_python(pk)
+        pks.append(pk)
+        ids_by_model[model].add(pk)
+
+    rows = {model: model.objects.in_bulk(ids) for model, ids in ids_by_model.items()}
+
+    resolved = {}
+    for (key, model, _), pk in zip(lookups, pks):
+        if pk not in rows[model]:
+            raise get_unresolved_id_class(model)(key, model)
+        resolved[key] = rows[model][pk]
+    return resolved
@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+DEFAULT_RESPONSE_CACHE = {
+    'BACKEND': 'formulanerdapi.utils.response_cache.LRUBackend',
+    'OPTIONS': {'max_entries': 1024},
+}
+
+
+class LRUBackend:
+    """In-process cache that evicts the least recently used entry once full"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCacheBackend:
+    """Cache stored in one of the CACHES aliases
+
+    Point it at a FileBasedCache (or any other shared backend) so every
+    worker process on the host reuses the same responses.
+    """
+
+    def __init__(self, alias='default', timeout=None):
+        self.alias = alias
+        self.timeout = timeout
+
+    def get(self, key):
+        return caches[self.alias].get(key)
+
+    def set(self, key, value):
+        caches[self.alias].set(key, value, self.timeout)
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+class ResponseCache:
+    """Front for a cache backend that keeps hit and miss counts"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Returns:
+            dict -- hit and miss counts since the cache was created
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Build the response cache configured by settings.RESPONSE_CACHE
+
+    Returns:
+        ResponseCache -- shared instance, or None when caching is turned off
+    """
+    global _response_cache  # pylint: disable=global-statement
+    if _response_cache is None:
+        config = getattr(settings, 'RESPONSE_CACHE', DEFAULT_RESPONSE_CACHE)
+        if not config:
+            return None
+        backend = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+        _response_cache = ResponseCache(backend)
+    return _response_cache
+
+
+@receiver(setting_changed)
+def reset_response_cache(setting, **kwargs):
+    """Rebuild the cache when tests override its settings"""
+    global _response_cache  # pylint: disable=global-statement
+    if setting in ('RESPONSE_CACHE', 'CACHES'):
+        _response_cache = None
+
+
+def get_cache_key(request, etag):
+    """Key a response by its full URL and the table versions it was built from"""
+    return f'response:{request.build_absolute_uri()}:{etag}'
@@ -0,0 +1,96 @@
+import threading
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+
+def get_sqlite_pragmas():
+    """Returns:
+        dict -- pragma name to value from settings.SQLITE_PRAGMAS, empty when unset
+    """
+    return getattr(settings, 'SQLITE_PRAGMAS', None) or {}
+
+
+def apply_pragmas(cursor, pragmas):
+    """Run `PRAGMA name = value` for every pragma on a DB-API cursor"""
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Apply the SQLite profile to every new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = get_sqlite_pragmas()
+    if pragmas:
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, pragmas)
+
+
+class WriteQueue:
+    """A first-come, first-served lock that lets one thread write at a time
+
+    SQLite allows a single writer per database. Threads that start writing
+    at once otherwise race for the file lock, and a transaction that read
+    before writing can fail with "database is locked" straight away,
+    without waiting out the busy timeout. Queueing writers in the process
+    means they take the database lock one after another. The owning thread
+    may enter again, so a write that triggers further writes (signals,
+    bulk actions) does not deadlock on itself.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._owner = None
+        self._depth = 0
+
+    def acquire(self):
+        """Wait for this thread's turn to write"""
+        thread = threading.get_ident()
+        with self._condition:
+            if self._owner == thread:
+                self._depth += 1
+                return
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._condition.wait_for(lambda: self._serving == ticket)
+            self._owner = thread
+            self._depth = 1
+
+    def release(self):
+        """Hand the turn to the next thread in the queue"""
+        with self._condition:
+            self._depth -= 1
+            if self._depth == 0:
+                self._owner = None
+                self._serving += 1
+                self._condition.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+write_queue = WriteQueue()
+
+
+def serialized_write(method):
+    """Run a view method that writes through the process's write queue
+
+    Only applies while settings.SERIALIZE_SQLITE_WRITES is on and the
+    default database is SQLite; other backends handle concurrent writers
+    themselves.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        if not getattr(settings, 'SERIALIZE_SQLITE_WRITES', False) or connections['default'].vendor != 'sqlite':
+            return method(*args, **kwargs)
+        with write_queue:
+            return method(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+STREAM_CHUNK_SIZE = 500
+
+
+def should_stream(request, queryset):
+    """Decide whether a list response should be streamed
+
+    Streaming is used when the client asks for it with ?stream=true, or
+    when settings.STREAMING_LIST_THRESHOLD is set and the queryset has more
+    rows than that. It only applies to plain JSON responses, since the
+    browsable API and indented output are rendered as a whole.
+    """
+    renderer = getattr(request, 'accepted_renderer', None)
+    if not isinstance(renderer, JSONRenderer) or 'indent' in (request.accepted_media_type or ''):
+        return False
+
+    if request.query_params.get('stream', '').lower() in ('1', 'true'):
+        return True
+
+    threshold = getattr(settings, 'STREAMING_LIST_THRESHOLD', None)
+    return threshold is not None and queryset.count() > threshold
+
+
+def stream_list(request, queryset, serializer_class, chunk_size=STREAM_CHUNK_SIZE, **serializer_kwargs):
+    """Serialize a queryset as a JSON array one row at a time
+
+    Rows are read with a chunked iterator and each one is rendered on its
+    own, so memory stays flat no matter how many rows are exported. The
+    body is byte-identical to rendering the whole list with JSONRenderer.
+
+    Returns:
+        StreamingHttpResponse -- JSON array of serialized rows
+    """
+    renderer = request.accepted_renderer
+    serializer = serializer_class(context={'request': request}, **serializer_kwargs)
+
+    def render_rows():
+        yield b'['
+        separator = b''
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield separator + renderer.render(serializer.to_representation(instance))
+            separator = b','
+        yield b']'
+
+    return StreamingHttpResponse(render_rows(), content_type=renderer.media_type)
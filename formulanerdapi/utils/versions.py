@@ -0,0 +1,143 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from formulanerdapi.models import TableVersion
+from .dynamic_fields import get_field_options
+from .response_cache import get_cache_key, get_response_cache
+
+
+def bump_version(model):
+    """Mark a model's table as changed
+
+    Versions follow the clock rather than counting from zero, so a restored
+    or rolled back database never hands out a version that was already
+    used for different contents.
+    """
+    table = model._meta.db_table
+    now = time.time_ns()
+    updated = TableVersion.objects.filter(table=table).update(version=Greatest(F('version') + 1, Value(now)))
+    if not updated:
+        version, created = TableVersion.objects.get_or_create(table=table, defaults={'version': now})
+        if not created:
+            TableVersion.objects.filter(pk=version.pk).update(version=Greatest(F('version') + 1, Value(now)))
+
+
+def get_versions(models):
+    """Look up the current version of each model's table in one query
+
+    Returns:
+        dict -- table name to version, 0 for tables never written to
+    """
+    tables = {model._meta.db_table for model in models}
+    versions = dict.fromkeys(tables, 0)
+    versions.update(TableVersion.objects.filter(table__in=tables).values_list('table', 'version'))
+    return versions
+
+
+async def aget_versions(models):
+    """Async get_versions(), read with the async ORM
+
+    Returns:
+        dict -- table name to version, 0 for tables never written to
+    """
+    tables = {model._meta.db_table for model in models}
+    versions = dict.fromkeys(tables, 0)
+    async for table, version in TableVersion.objects.filter(table__in=tables).values_list('table', 'version'):
+        versions[table] = version
+    return versions
+
+
+def get_serializer_models(serializer):
+    """Collect every model a serializer reads, including nested relations
+
+    Returns:
+        set -- model classes
+    """
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+
+    meta = getattr(serializer, 'Meta', None)
+    models = {meta.model} if hasattr(meta, 'model') else set()
+    for field in serializer.fields.values():
+        if isinstance(field, BaseSerializer) and not field.write_only:
+            models |= get_serializer_models(field)
+    return models
+
+
+def get_etag(request, serializer, extra_models=()):
+    """Build a weak ETag from the versions of the tables a serializer reads,
+    plus any the view reads without rendering them
+
+    Returns:
+        str -- weak ETag header value
+    """
+    versions = get_versions(get_serializer_models(serializer) | set(extra_models))
+    return make_etag(request.accepted_media_type, versions)
+
+
+def make_etag(media_type, versions):
+    """Returns:
+        str -- weak ETag for a media type and a set of table versions
+    """
+    key = media_type + '|' + ','.join(
+        f'{table}:{version}' for table, version in sorted(versions.items())
+    )
+    return f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+
+
+def etag_matches(request, etag):
+    """Check an ETag against If-None-Match using weak comparison"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    return '*' in candidates or etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in candidates]
+
+
+def conditional_get(method):
+    """Answer GET requests from table versions before doing any real work
+
+    The ETag comes from the version counters of every table the view's
+    serializer touches, so the check runs before any queryset is built or
+    any row is serialized. A matching If-None-Match gets a 304; otherwise
+    the response cache is consulted under the same versions, so any write
+    to an embedded table (a nation inside a race) misses the old entries.
+    Views whose results also depend on tables they do not render list them
+    in a `version_models` attribute.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        serializer = self.get_serializer_class()(**get_field_options(request))
+        etag = get_etag(request, serializer, getattr(self, 'version_models', ()))
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        # Clients asking for a stream get one, never a cached full body
+        cache = get_response_cache() if 'stream' not in request.query_params else None
+        cache_key = get_cache_key(request, etag)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                data, headers = cached
+                response = Response(data, headers=headers)
+                response['ETag'] = etag
+                response['X-Cache'] = 'HIT'
+                return response
+
+        response = method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            if cache is not None and isinstance(response, Response):
+                headers = {name: response[name] for name in ('Link',) if response.has_header(name)}
+                cache.set(cache_key, (response.data, headers))
+                response['X-Cache'] = 'MISS'
+        return response
+    return wrapper
@@ -5,3 +5,10 @@ from .race import RaceView
 from .constructor import ConstructorView
 from .driverConstructorHistory import DriverConstructorHistoryView
 from .user import UserView
+from .export import ExportView
+from .driverStanding import DriverStandingView
+from .constructorStanding import ConstructorStandingView
+from .search import SearchView
+from .autocomplete import AutocompleteView
+from .slowQuery import SlowQueryView
+from .metrics import metrics_view
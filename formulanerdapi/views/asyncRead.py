@@ -0,0 +1,214 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.urls import path
+from rest_framework import status
+from formulanerdapi.history_index import filter_active
+from formulanerdapi.models import Circuit, Constructor, Driver, DriverConstructorHistory, Nation, Race, User
+from formulanerdapi.renderers import FastJSONRenderer
+from formulanerdapi.utils import optimize_queryset
+from formulanerdapi.utils.dynamic_fields import parse_field_options
+from formulanerdapi.utils.streaming import STREAM_CHUNK_SIZE
+from formulanerdapi.utils.versions import aget_versions, etag_matches, get_serializer_models, make_etag
+from .circuit import CircuitSerializer
+from .constructor import ConstructorSerializer
+from .driver import DriverSerializer
+from .driverConstructorHistory import DriverConstructorHistorySerializer
+from .nation import NationSerializer
+from .race import RaceSerializer
+from .user import UserSerializer
+
+
+class AsyncReadView:
+    """Async list and retrieve for one resource, for ASGI deployments
+
+    Mirrors the read side of the resource's ViewSet: the same filters,
+    ?fields=/?expand=, ETags (interchangeable with the sync endpoints) and
+    byte-identical JSON. Rows come from the async ORM and are rendered one
+    chunk at a time, so a request holds no worker thread while it waits.
+    The response cache and ?page_size= pagination stay on the sync
+    endpoints.
+    """
+
+    model = None
+    filter_fields = ()
+    renderer = FastJSONRenderer()
+
+    @property
+    def serializer_class(self):
+        """The resource's serializer, which subclasses set as a class attribute"""
+        raise ImproperlyConfigured(f'{type(self).__name__} must set serializer_class.')
+
+    def get_queryset(self, options):
+        """Returns:
+            QuerySet -- every row, with the relations the serializer nests
+        """
+        return optimize_queryset(self.model.objects.all(), self.serializer_class(**options))
+
+    async def filter_queryset(self, request, queryset):
+        """Apply the resource's query string filters
+
+        Returns:
+            QuerySet -- filtered queryset
+        """
+        for field in self.filter_fields:
+            value = request.GET.get(field, None)
+            if value is not None:
+                queryset = queryset.filter(**{field: value})
+        return queryset
+
+    async def get_etag(self, options):
+        """Returns:
+            str -- the ETag the sync endpoint gives the same JSON response
+        """
+        models = get_serializer_models(self.serializer_class(**options))
+        return make_etag(self.renderer.media_type, await aget_versions(models))
+
+    async def list(self, request):
+        """Handle GET requests for every row of the resource
+
+        Returns:
+            HttpResponse -- JSON array, streamed with ?stream=true
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+        options = parse_field_options(request.GET)
+        etag = await self.get_etag(options)
+        if etag_matches(request, etag):
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        try:
+            queryset = await self.filter_queryset(request, self.get_queryset(options))
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.serializer_class(**options)
+        rows = self.render_rows(queryset, serializer)
+        if request.GET.get('stream', '').lower() in ('1', 'true'):
+            response = StreamingHttpResponse(rows, content_type=self.renderer.media_type)
+        else:
+            response = HttpResponse(b''.join([chunk async for chunk in rows]), content_type=self.renderer.media_type)
+        response['ETag'] = etag
+        return response
+
+    async def retrieve(self, request, pk):
+        """Handle GET requests for a single row
+
+        Returns:
+            HttpResponse -- JSON object, or a 404 error
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+        options = parse_field_options(request.GET)
+        etag = await self.get_etag(options)
+        if etag_matches(request, etag):
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        try:
+            instance = await self.get_queryset(options).aget(pk=pk)
+        except self.model.DoesNotExist:
+            return JsonResponse(
+                {"error": f"{self.model._meta.verbose_name.capitalize()} not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = self.serializer_class(instance, **options)
+        response = HttpResponse(self.renderer.render(serializer.data), content_type=self.renderer.media_type)
+        response['ETag'] = etag
+        return response
+
+    async def render_rows(self, queryset, serializer):
+        """Render a queryset as a JSON array, one row at a time as rows arrive
+
+        Yields the same bytes JSONRenderer gives for the whole list.
+        """
+        yield b'['
+        separator = b''
+        async for instance in queryset.aiterator(chunk_size=STREAM_CHUNK_SIZE):
+            yield separator + self.renderer.render(serializer.to_representation(instance))
+            separator = b','
+        yield b']'
+
+    @classmethod
+    def get_urls(cls, prefix, basename):
+        """Returns:
+            list -- URL patterns for <prefix> and <prefix>/<pk>
+        """
+        view = cls()
+        return [
+            path(prefix, view.list, name=f'async-{basename}-list'),
+            path(f'{prefix}/<int:pk>', view.retrieve, name=f'async-{basename}-detail'),
+        ]
+
+
+class AsyncNationView(AsyncReadView):
+    model = Nation
+    serializer_class = NationSerializer
+
+
+class AsyncCircuitView(AsyncReadView):
+    model = Circuit
+    serializer_class = CircuitSerializer
+    filter_fields = ('nation',)
+
+
+class AsyncDriverView(AsyncReadView):
+    model = Driver
+    serializer_class = DriverSerializer
+    filter_fields = ('nation',)
+
+
+class AsyncRaceView(AsyncReadView):
+    model = Race
+    serializer_class = RaceSerializer
+    filter_fields = ('nation',)
+
+
+class AsyncConstructorView(AsyncReadView):
+    model = Constructor
+    serializer_class = ConstructorSerializer
+    filter_fields = ('nation',)
+
+
+class AsyncDriverConstructorHistoryView(AsyncReadView):
+    model = DriverConstructorHistory
+    serializer_class = DriverConstructorHistorySerializer
+    filter_fields = ('driver', 'constructor')
+
+    async def filter_queryset(self, request, queryset):
+        """Also keep spells active in ?year=, like the sync list"""
+        queryset = await super().filter_queryset(request, queryset)
+        year = request.GET.get('year', None)
+        if year is not None:
+            try:
+                year = int(year)
+            except ValueError:
+                raise ValueError("year must be a year.") from None
+            # The spell length bound comes from a cached sync lookup
+            queryset = await sync_to_async(filter_active)(queryset, year)
+        return queryset
+
+
+class AsyncUserView(AsyncReadView):
+    model = User
+    serializer_class = UserSerializer
+
+
+ASYNC_READ_VIEWS = (
+    ('users', 'user', AsyncUserView),
+    ('drivers', 'driver', AsyncDriverView),
+    ('circuits', 'circuit', AsyncCircuitView),
+    ('races', 'race', AsyncRaceView),
+    ('constructors', 'constructor', AsyncConstructorView),
+    ('driverconstructorhistories', 'driver_constructor_history', AsyncDriverConstructorHistoryView),
+    ('nations', 'nation', AsyncNationView),
+)
+
+
+def get_async_urls():
+    """Returns:
+        list -- URL patterns for every resource's async read endpoints
+    """
+    return [pattern for prefix, basename, view in ASYNC_READ_VIEWS for pattern in view.get_urls(prefix, basename)]
@@ -0,0 +1,39 @@
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework import status
+from formulanerdapi.autocomplete import AUTOCOMPLETE_MODELS, get_prefix_index
+
+MAX_AUTOCOMPLETE_RESULTS = 50
+
+
+class AutocompleteView(ViewSet):
+    """Formula Nerd type-ahead view, answered from an in-memory index"""
+
+    def list(self, request):
+        """Handle GET requests for names starting with a prefix
+
+        Takes ?type= (driver, circuit, constructor or nation), ?prefix= and
+        ?limit= (default 10, at most MAX_AUTOCOMPLETE_RESULTS). Any word of a
+        name can match. Once the type's index is loaded no query is run.
+
+        Returns:
+            Response -- JSON list of ids and names
+        """
+        kind = request.query_params.get('type', None)
+        if kind not in AUTOCOMPLETE_MODELS:
+            return Response(
+                {"error": f"type must be one of: {', '.join(AUTOCOMPLETE_MODELS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        prefix = request.query_params.get('prefix', '')
+        if not prefix.strip():
+            return Response({"error": "Missing parameter: 'prefix'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), MAX_AUTOCOMPLETE_RESULTS)
+        except ValueError:
+            return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        matches = get_prefix_index(kind).search(prefix, max(limit, 1))
+        return Response([{"id": pk, "name": name} for pk, name in matches])
@@ -4,12 +4,21 @@ from rest_framework.response import Response
 from rest_framework import serializers, status
 from formulanerdapi.models import Circuit
 from formulanerdapi.models import Nation
+from formulanerdapi.utils import optimize_queryset, DynamicFieldsMixin, get_field_options, conditional_get, serialized_write
+from formulanerdapi.pagination import KeysetPagination
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
 
 class CircuitView(ViewSet):
     """Level up circuit view"""
 
+    pagination_class = KeysetPagination
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return CircuitSerializer
+
+    @conditional_get
     def retrieve(self, request, pk):
         """Handle GET requests for single circuit by id
           get circuits by nation
@@ -21,32 +30,42 @@ class CircuitView(ViewSet):
         Returns:
             Response -- JSON serialized circuit
         """
+        options = get_field_options(request)
 
         try:
-            circuit = Circuit.objects.get(pk=pk)
+            circuit = optimize_queryset(Circuit.objects.all(), CircuitSerializer(**options)).get(pk=pk)
         except Circuit.DoesNotExist:
             return Response({"error": "Circuit not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = CircuitSerializer(circuit)
+        serializer = CircuitSerializer(circuit, **options)
         return Response(serializer.data)
 
 
+    @conditional_get
     def list(self, request):
         """Handle GET requests to get all circuits
 
         Returns:
             Response -- JSON serialized list of circuits
         """
+        options = get_field_options(request)
         nation = request.query_params.get('nation', None)
 
-        circuits = Circuit.objects.all()
+        circuits = optimize_queryset(Circuit.objects.all(), CircuitSerializer(**options))
 
         if nation is not None:
             circuits = circuits.filter(nation=nation)
 
-        serializer = CircuitSerializer(circuits, many=True)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(circuits, request, view=self)
+        if page is not None:
+            serializer = CircuitSerializer(page, many=True, **options)
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = CircuitSerializer(circuits, many=True, **options)
         return Response(serializer.data)
 
+    @serialized_write
     def create(self, request):
         """Handle POST operations
 
@@ -86,6 +105,7 @@ class CircuitView(ViewSet):
             # Catch-all for any other errors
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @serialized_write
     def update(self, request, pk):
         """Handle PUT requests for a circuit
 
@@ -126,6 +146,7 @@ class CircuitView(ViewSet):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         
+    @serialized_write
     def destroy(self, request, pk):
         try:
             circuit = Circuit.objects.get(pk=pk)
@@ -134,7 +155,7 @@ class CircuitView(ViewSet):
         except Circuit.DoesNotExist:
             raise Http404("Circuit not found")
 
-class CircuitSerializer(serializers.ModelSerializer):
+class CircuitSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for circuits
     """
     class Meta:
@@ -4,41 +4,60 @@ from rest_framework.response import Response
 from rest_framework import serializers, status
 from formulanerdapi.models import Nation
 from formulanerdapi.models import Constructor
+from formulanerdapi.utils import optimize_queryset, DynamicFieldsMixin, get_field_options, conditional_get, serialized_write
+from formulanerdapi.pagination import KeysetPagination
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
 class ConstructorView(ViewSet):
     """Formula Nerd constructor view"""
 
+    pagination_class = KeysetPagination
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return ConstructorSerializer
+
+    @conditional_get
     def retrieve(self, request, pk):
         """Handle GET requests for single constructor
 
         Returns:
             Response -- JSON serialized constructor
         """
+        options = get_field_options(request)
         try:
-            constructor = Constructor.objects.get(pk=pk)
+            constructor = optimize_queryset(Constructor.objects.all(), ConstructorSerializer(**options)).get(pk=pk)
         except Constructor.DoesNotExist:
             return Response({"error": "Constructor not found"}, status=status.HTTP_404_NOT_FOUND)
-        serializer = ConstructorSerializer(constructor)
+        serializer = ConstructorSerializer(constructor, **options)
         return Response(serializer.data)
 
 
+    @conditional_get
     def list(self, request):
         """Handle GET requests to get all constructors
 
         Returns:
             Response -- JSON serialized list of constructors
         """
+        options = get_field_options(request)
         nation = request.query_params.get('nation', None)
 
-        constructors = Constructor.objects.all()
+        constructors = optimize_queryset(Constructor.objects.all(), ConstructorSerializer(**options))
 
         if nation is not None:
             constructors = constructors.filter(nation=nation)
 
-        serializer = ConstructorSerializer(constructors, many=True)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(constructors, request, view=self)
+        if page is not None:
+            serializer = ConstructorSerializer(page, many=True, **options)
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = ConstructorSerializer(constructors, many=True, **options)
         return Response(serializer.data)
 
+    @serialized_write
     def create(self, request):
         """Handle POST operations
 
@@ -84,6 +103,7 @@ class ConstructorView(ViewSet):
 
     
 
+    @serialized_write
     def update(self, request, pk):
         """Handle PUT requests for a constructor
 
@@ -119,6 +139,7 @@ class ConstructorView(ViewSet):
         except KeyError as e:
             return Response({"error": f"Missing field: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
         
+    @serialized_write
     def destroy(self, request, pk):
         try:
             constructor = Constructor.objects.get(pk=pk)
@@ -127,7 +148,7 @@ class ConstructorView(ViewSet):
         except Constructor.DoesNotExist:
             return Response({"error": "Constructor not found"}, status=status.HTTP_404_NOT_FOUND)
 
-class ConstructorSerializer(serializers.ModelSerializer):
+class ConstructorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for constructors
     """
     class Meta:
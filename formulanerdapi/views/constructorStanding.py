@@ -0,0 +1,60 @@
+from django.db.models import Max
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework import serializers, status
+from formulanerdapi.models import Constructor, DriverConstructorHistory, DriverStanding
+from formulanerdapi.standings import compute_constructor_standings
+from formulanerdapi.utils import optimize_queryset, DynamicFieldsMixin, conditional_get
+from .constructor import ConstructorSerializer
+
+
+class ConstructorStandingView(ViewSet):
+    """Formula Nerd constructor championship standings view"""
+
+    # Points come from driver standings attributed through history spells,
+    # neither of which the serializer renders
+    version_models = (DriverStanding, DriverConstructorHistory)
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return ConstructorStandingSerializer
+
+    @conditional_get
+    def list(self, request):
+        """Handle GET requests for a season's constructor standings
+
+        Defaults to the latest season when ?season= is not given.
+
+        Returns:
+            Response -- JSON serialized standings, championship leader first
+        """
+        season = request.query_params.get('season', None)
+        if season is None:
+            season = DriverStanding.objects.aggregate(latest=Max('season'))['latest']
+            if season is None:
+                return Response([], status=status.HTTP_200_OK)
+
+        try:
+            season = int(season)
+        except ValueError:
+            return Response({"error": "season must be a year."}, status=status.HTTP_400_BAD_REQUEST)
+
+        standings = compute_constructor_standings(season)
+        constructors = optimize_queryset(Constructor.objects.all(), ConstructorSerializer).in_bulk(
+            [standing['constructor_id'] for standing in standings]
+        )
+        for standing in standings:
+            standing['season'] = season
+            standing['constructor'] = constructors[standing['constructor_id']]
+
+        serializer = ConstructorStandingSerializer(standings, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ConstructorStandingSerializer(DynamicFieldsMixin, serializers.Serializer):
+    """JSON serializer for constructor standings"""
+    season = serializers.IntegerField()
+    constructor = ConstructorSerializer()
+    points = serializers.DecimalField(max_digits=8, decimal_places=2)
+    wins = serializers.IntegerField()
+    podiums = serializers.IntegerField()
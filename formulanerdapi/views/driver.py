@@ -6,43 +6,65 @@ from rest_framework import serializers, status
 from formulanerdapi.models import Driver
 from formulanerdapi.models import Constructor
 from formulanerdapi.models import Nation
+from formulanerdapi.utils import optimize_queryset, resolve_ids, UnresolvedId, should_stream, stream_list, DynamicFieldsMixin, get_field_options, conditional_get, serialized_write
+from formulanerdapi.pagination import KeysetPagination
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
 
 class DriverView(ViewSet):
     """Formula Nerd driver view"""
 
+    pagination_class = KeysetPagination
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return DriverSerializer
+
+    @conditional_get
     def retrieve(self, request, pk):
         """Handle GET requests for single driver
 
         Returns:
             Response -- JSON serialized driver
         """
+        options = get_field_options(request)
         try:
-            driver = Driver.objects.get(pk=pk)
+            driver = optimize_queryset(Driver.objects.all(), DriverSerializer(**options)).get(pk=pk)
         except Driver.DoesNotExist:
             return Response({"error": "Driver not Found"}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = DriverSerializer(driver)
+        serializer = DriverSerializer(driver, **options)
         return Response(serializer.data)
 
 
+    @conditional_get
     def list(self, request):
         """Handle GET requests to get all drivers
 
         Returns:
             Response -- JSON serialized list of drivers
         """
+        options = get_field_options(request)
         nation = request.query_params.get('nation', None)
 
-        drivers = Driver.objects.all()
+        drivers = optimize_queryset(Driver.objects.all(), DriverSerializer(**options))
 
         if nation is not None:
             drivers = drivers.filter(nation=nation)
 
-        serializer = DriverSerializer(drivers, many=True)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(drivers, request, view=self)
+        if page is not None:
+            serializer = DriverSerializer(page, many=True, **options)
+            return paginator.get_paginated_response(serializer.data)
+
+        if should_stream(request, drivers):
+            return stream_list(request, drivers, DriverSerializer, **options)
+
+        serializer = DriverSerializer(drivers, many=True, **options)
         return Response(serializer.data)
 
+    @serialized_write
     def create(self, request):
         """Handle POST operations
 
@@ -63,8 +85,12 @@ class DriverView(ViewSet):
             nation_id = request.data["nation_id"]
             current_constructor_id = request.data["current_constructor_id"]
 
-            current_constructor = Constructor.objects.get(pk=current_constructor_id)
-            nation = Nation.objects.get(pk=nation_id)
+            related = resolve_ids([
+                ("current_constructor_id", Constructor, current_constructor_id),
+                ("nation_id", Nation, nation_id),
+            ])
+            current_constructor = related["current_constructor_id"]
+            nation = related["nation_id"]
 
             # Create driver instance
             driver = Driver.objects.create(
@@ -92,6 +118,7 @@ class DriverView(ViewSet):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+    @serialized_write
     def update(self, request, pk):
         """Handle PUT requests for a driver
 
@@ -101,21 +128,21 @@ class DriverView(ViewSet):
         try:
             driver = Driver.objects.get(pk=pk)
 
-            nation_id = request.data.get("nation_id")
-            if nation_id:
-                try:
-                    nation = Nation.objects.get(pk=nation_id)
-                    driver.nation = nation
-                except Nation.DoesNotExist:
-                    return Response({"error": "Invalid nation_id, nation not found."}, status=status.HTTP_400_BAD_REQUEST)
-                
-            current_constructor_id = request.data.get("current_constructor_id")
-            if current_constructor_id:
-                try:
-                    current_constructor = Constructor.objects.get(pk=current_constructor_id)
-                    driver.current_constructor = current_constructor
-                except Constructor.DoesNotExist:
-                    return Response({"error": "Invalid current_constructor_id, constructor not found."}, status=status.HTTP_400_BAD_REQUEST)
+            # Resolve whichever related ids were sent, one query per model
+            lookups = [
+                (key, model, request.data.get(key))
+                for key, model in (("nation_id", Nation), ("current_constructor_id", Constructor))
+                if request.data.get(key)
+            ]
+            try:
+                related = resolve_ids(lookups)
+            except UnresolvedId as e:
+                return Response({"error": f"Invalid {e.key}, {e.model._meta.verbose_name} not found."}, status=status.HTTP_400_BAD_REQUEST)
+
+            if "nation_id" in related:
+                driver.nation = related["nation_id"]
+            if "current_constructor_id" in related:
+                driver.current_constructor = related["current_constructor_id"]
                 
             driver.name = request.data.get("name", driver.name)
             driver.age=request.data.get("age", driver.age)
@@ -132,6 +159,7 @@ class DriverView(ViewSet):
         except KeyError as e:
             return Response({"error": f"Missing field: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
         
+    @serialized_write
     def destroy(self, request, pk):
         try:
             driver = Driver.objects.get(pk=pk)
@@ -140,7 +168,7 @@ class DriverView(ViewSet):
         except Driver.DoesNotExist:
             raise Http404("driver not found")
 
-class DriverSerializer(serializers.ModelSerializer):
+class DriverSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for drivers
     """
     class Meta:
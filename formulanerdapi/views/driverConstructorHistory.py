@@ -5,12 +5,26 @@ from rest_framework import serializers, status
 from formulanerdapi.models import DriverConstructorHistory
 from formulanerdapi.models import Driver
 from formulanerdapi.models import Constructor
+from formulanerdapi.utils import optimize_queryset, resolve_ids, should_stream, stream_list, DynamicFieldsMixin, get_field_options, conditional_get, serialized_write
+from formulanerdapi.pagination import StartYearPagination
+from formulanerdapi.history_index import filter_active
+from collections import defaultdict
+from rest_framework.decorators import action
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
 
+MAX_ROSTER_YEARS = 100
+
 class DriverConstructorHistoryView(ViewSet):
     """ driverConstructorHistory view"""
 
+    pagination_class = StartYearPagination
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return DriverConstructorHistorySerializer
+
+    @conditional_get
     def retrieve(self, request, pk):
         """Handle GET requests for drivers that have driven for a constructor
 
@@ -19,29 +33,92 @@ class DriverConstructorHistoryView(ViewSet):
             Response -- JSON serialized driverConstructorHistory
 
         """
-        driverConstructorHistory = DriverConstructorHistory.objects.get(pk=pk)
-        serializer = DriverConstructorHistorySerializer(driverConstructorHistory)
+        options = get_field_options(request)
+        driverConstructorHistory = optimize_queryset(DriverConstructorHistory.objects.all(), DriverConstructorHistorySerializer(**options)).get(pk=pk)
+        serializer = DriverConstructorHistorySerializer(driverConstructorHistory, **options)
         return Response(serializer.data)
 
 
+    @conditional_get
     def list(self, request):
         """Handle GET requests to get all driver constructor histories
 
         Returns:
             Response -- JSON serialized list of circuits
         """
+        options = get_field_options(request)
         driver = request.query_params.get('driver', None)
         constructor = request.query_params.get('constructor', None)
+        year = request.query_params.get('year', None)
 
-        driverConstructorHistories = DriverConstructorHistory.objects.all()
+        driverConstructorHistories = optimize_queryset(DriverConstructorHistory.objects.all(), DriverConstructorHistorySerializer(**options))
 
         if driver is not None:
             driverConstructorHistories = driverConstructorHistories.filter(driver=driver)
         if constructor is not None:
             driverConstructorHistories = driverConstructorHistories.filter(constructor=constructor)
-
-        serializer = DriverConstructorHistorySerializer(driverConstructorHistories, many=True)
+        if year is not None:
+            try:
+                driverConstructorHistories = filter_active(driverConstructorHistories, int(year))
+            except ValueError:
+                return Response({"error": "year must be a year."}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(driverConstructorHistories, request, view=self)
+        if page is not None:
+            serializer = DriverConstructorHistorySerializer(page, many=True, **options)
+            return paginator.get_paginated_response(serializer.data)
+
+        if should_stream(request, driverConstructorHistories):
+            return stream_list(request, driverConstructorHistories, DriverConstructorHistorySerializer, **options)
+
+        serializer = DriverConstructorHistorySerializer(driverConstructorHistories, many=True, **options)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    @conditional_get
+    def rosters(self, request):
+        """Handle GET requests for every constructor's drivers in a range of years
+
+        Takes ?from= and ?to= (inclusive, at most MAX_ROSTER_YEARS apart) and
+        an optional ?constructor=. All spells overlapping the range are read
+        in one query and spread over the years they cover.
+
+        Returns:
+            Response -- year, constructor id and driver ids per roster
+        """
+        try:
+            first_year = int(request.query_params["from"])
+            last_year = int(request.query_params.get("to", first_year))
+        except KeyError as e:
+            return Response({"error": f"Missing parameter: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({"error": "from and to must be years."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= last_year - first_year < MAX_ROSTER_YEARS:
+            return Response(
+                {"error": f"to must be from or up to {MAX_ROSTER_YEARS - 1} years after it."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        spells = filter_active(DriverConstructorHistory.objects.all(), first_year, last_year)
+        constructor = request.query_params.get('constructor', None)
+        if constructor is not None:
+            spells = spells.filter(constructor=constructor)
+
+        rosters = defaultdict(set)
+        for driver_id, constructor_id, start_year, end_year in spells.values_list(
+            'driver_id', 'constructor_id', 'start_year', 'end_year'
+        ):
+            last_covered = last_year if end_year is None else min(end_year, last_year)
+            for year in range(max(start_year, first_year), last_covered + 1):
+                rosters[(year, constructor_id)].add(driver_id)
+
+        return Response([
+            {"year": year, "constructor_id": constructor_id, "driver_ids": sorted(driver_ids)}
+            for (year, constructor_id), driver_ids in sorted(rosters.items())
+        ])
+
+    @serialized_write
     def create(self, request):
         """Handle POST operations"""
 
@@ -53,8 +130,12 @@ class DriverConstructorHistoryView(ViewSet):
                 return Response({"error": f"Missing field: '{field}'"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            driver = Driver.objects.get(pk=request.data["driver_id"])
-            constructor = Constructor.objects.get(pk=request.data["constructor_id"])
+            related = resolve_ids([
+                ("driver_id", Driver, request.data["driver_id"]),
+                ("constructor_id", Constructor, request.data["constructor_id"]),
+            ])
+            driver = related["driver_id"]
+            constructor = related["constructor_id"]
 
             driver_constructor_history = DriverConstructorHistory.objects.create(
                 driver=driver,
@@ -74,6 +155,7 @@ class DriverConstructorHistoryView(ViewSet):
             return Response({"error": f"Missing field: '{str(e)}'"}, status=status.HTTP_400_BAD_REQUEST)
 
 
+    @serialized_write
     def update(self, request, pk):
         """Handle PUT requests for a driverConstructorHistory"""
 
@@ -81,8 +163,12 @@ class DriverConstructorHistoryView(ViewSet):
             driver_constructor_history = DriverConstructorHistory.objects.get(pk=pk)
 
             # Retrieve related objects to avoid ForeignKey constraint issues
-            driver = Driver.objects.get(pk=request.data["driver_id"])
-            constructor = Constructor.objects.get(pk=request.data["constructor_id"])
+            related = resolve_ids([
+                ("driver_id", Driver, request.data["driver_id"]),
+                ("constructor_id", Constructor, request.data["constructor_id"]),
+            ])
+            driver = related["driver_id"]
+            constructor = related["constructor_id"]
 
             driver_constructor_history.driver = driver
             driver_constructor_history.constructor = constructor
@@ -103,6 +189,7 @@ class DriverConstructorHistoryView(ViewSet):
         except KeyError as e:
             return Response({"error": f"Missing field: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
         
+    @serialized_write
     def destroy(self, request, pk):
         try:
             driverConstructorHistory = DriverConstructorHistory.objects.get(pk=pk)
@@ -112,7 +199,7 @@ class DriverConstructorHistoryView(ViewSet):
             return Response({"error": "DriverConstructorHistory not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
-class DriverConstructorHistorySerializer(serializers.ModelSerializer):
+class DriverConstructorHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for driver constructor history"""
 
     class Meta:
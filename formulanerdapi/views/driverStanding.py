@@ -0,0 +1,51 @@
+from django.db.models import Max
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework import serializers, status
+from formulanerdapi.models import DriverStanding
+from formulanerdapi.utils import optimize_queryset, DynamicFieldsMixin, get_field_options, conditional_get
+
+
+class DriverStandingView(ViewSet):
+    """Formula Nerd driver championship standings view"""
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return DriverStandingSerializer
+
+    @conditional_get
+    def list(self, request):
+        """Handle GET requests for a season's driver standings
+
+        Defaults to the latest season when ?season= is not given.
+
+        Returns:
+            Response -- JSON serialized standings, championship leader first
+        """
+        options = get_field_options(request)
+        season = request.query_params.get('season', None)
+        if season is None:
+            season = DriverStanding.objects.aggregate(latest=Max('season'))['latest']
+            if season is None:
+                return Response([], status=status.HTTP_200_OK)
+
+        try:
+            season = int(season)
+        except ValueError:
+            return Response({"error": "season must be a year."}, status=status.HTTP_400_BAD_REQUEST)
+
+        standings = optimize_queryset(
+            DriverStanding.objects.filter(season=season),
+            DriverStandingSerializer(**options)
+        ).order_by('-points', '-wins', '-podiums', 'driver__name')
+
+        serializer = DriverStandingSerializer(standings, many=True, **options)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class DriverStandingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """JSON serializer for driver standings"""
+    class Meta:
+        model = DriverStanding
+        depth = 1
+        fields = ('id', 'season', 'driver', 'points', 'wins', 'podiums')
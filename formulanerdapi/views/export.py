@@ -0,0 +1,49 @@
+from django.http import StreamingHttpResponse
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from rest_framework import status
+from formulanerdapi.archive import EXPORT_TABLES, get_export_columns, iter_column, iter_jsonl
+
+class ExportView(ViewSet):
+    """Formula Nerd admin-only table export view"""
+
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        """Handle GET requests for the tables that can be exported
+
+        Returns:
+            Response -- JSON list of table names and their columns
+        """
+        return Response([
+            {"table": name, "columns": get_export_columns(model)}
+            for name, model in EXPORT_TABLES
+        ])
+
+    def retrieve(self, request, pk):
+        """Handle GET requests that stream a whole table
+
+        Streams one JSON object per row. With ?column=<name> only that
+        column is streamed, one JSON value per row, for columnar loads.
+
+        Returns:
+            StreamingHttpResponse -- newline-delimited JSON
+        """
+        model = dict(EXPORT_TABLES).get(pk)
+        if model is None:
+            return Response({"error": "Table not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        column = request.query_params.get('column', None)
+        if column is None:
+            lines = iter_jsonl(model)
+            filename = f"{pk}.jsonl"
+        elif column in get_export_columns(model):
+            lines = iter_column(model, column)
+            filename = f"{pk}.{column}.jsonl"
+        else:
+            return Response({"error": "Column not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+from formulanerdapi.metrics import render_metrics
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics_view(request):
+    """Handle GET requests from a Prometheus scrape
+
+    A plain Django view rather than a ViewSet: scrapers want the text
+    format, not content negotiation, and there is nothing to browse.
+
+    Returns:
+        HttpResponse -- every metric in the Prometheus text format, or a 404
+        when metrics are turned off
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
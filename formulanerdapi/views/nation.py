@@ -3,28 +3,40 @@ from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import serializers, status
 from formulanerdapi.models import Nation
+from formulanerdapi.utils import DynamicFieldsMixin, get_field_options, conditional_get, serialized_write
+from formulanerdapi.pagination import KeysetPagination
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
 from rest_framework.exceptions import NotFound
 
     
 class NationView(ViewSet):
+    pagination_class = KeysetPagination
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return NationSerializer
+
+    @conditional_get
     def retrieve(self, request, pk=None):
         """Handle GET requests for a single nation"""
+        options = get_field_options(request)
         try:
             nation = Nation.objects.get(pk=pk)
-            serializer = NationSerializer(nation)
+            serializer = NationSerializer(nation, **options)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Nation.DoesNotExist:
             return Response({"error": "Nation not found"}, status=status.HTTP_404_NOT_FOUND)
 
     
+    @conditional_get
     def list(self, request):
         """Handle GET requests to get all nations
 
         Returns:
             Response -- JSON serialized list of nations
         """
+        options = get_field_options(request)
         try:
             # Attempt to retrieve all nations
             nations = Nation.objects.all()
@@ -32,8 +44,14 @@ class NationView(ViewSet):
                     # If no nations are found, return a 404 Not Found response
                 raise NotFound(detail="No nations found")
 
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(nations, request, view=self)
+            if page is not None:
+                serializer = NationSerializer(page, many=True, **options)
+                return paginator.get_paginated_response(serializer.data)
+
             # Serialize the nation data
-            serializer = NationSerializer(nations, many=True)
+            serializer = NationSerializer(nations, many=True, **options)
             return Response(serializer.data, status=status.HTTP_200_OK)
         
         except NotFound as nf_error:
@@ -51,6 +69,7 @@ class NationView(ViewSet):
             )      
 
 
+    @serialized_write
     def create(self, request):
         """Handle POST operations
 
@@ -82,6 +101,7 @@ class NationView(ViewSet):
 
     
 
+    @serialized_write
     def update(self, request, pk):
         """Handle PUT requests for a nation
 
@@ -100,6 +120,7 @@ class NationView(ViewSet):
         except KeyError as e:
             return Response({"error": f"Missing field: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
         
+    @serialized_write
     def destroy(self, request, pk):
         try:
             nation = Nation.objects.get(pk=pk)
@@ -109,7 +130,7 @@ class NationView(ViewSet):
             raise Http404("Nation not found")
 
 
-class NationSerializer(serializers.ModelSerializer):
+class NationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for nations
     """
     class Meta:
@@ -3,42 +3,86 @@ from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import serializers, status
 from formulanerdapi.models import Nation, Race, Driver, Circuit
+from formulanerdapi.utils import optimize_queryset, resolve_ids, UnresolvedId, should_stream, stream_list, DynamicFieldsMixin, get_field_options, conditional_get, serialized_write
+from formulanerdapi.pagination import RaceDatePagination
+from formulanerdapi.parsers import FastJSONParser, NDJSONParser
+from formulanerdapi.signals import bulk_write
+from formulanerdapi.standings import PODIUM_FIELDS, get_podium_constructors
 from django.core.exceptions import ObjectDoesNotExist
-from rest_framework.exceptions import ValidationError
+from django.core.exceptions import ValidationError as ModelValidationError
+from django.db import transaction
+from collections.abc import Iterator
+from itertools import islice
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError, ValidationError
+
+RACE_RELATIONS = (
+    ("nation", Nation),
+    ("circuit", Circuit),
+    ("winner_driver", Driver),
+    ("p2_driver", Driver),
+    ("p3_driver", Driver),
+)
+
+BULK_RACE_FIELDS = (
+    "name", "date", "nation_id", "circuit_id", "distance", "laps",
+    "winner_driver_id", "p2_driver_id", "p3_driver_id",
+)
+BULK_BATCH_SIZE = 1000
 
 class RaceView(ViewSet):
     """Formula Nerd race view"""
 
+    pagination_class = RaceDatePagination
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return RaceSerializer
+
+    @conditional_get
     def retrieve(self, request, pk):
         """Handle GET requests for single race
 
         Returns:
             Response -- JSON serialized race
         """
+        options = get_field_options(request)
         try:
-            race = Race.objects.get(pk=pk)
-            serializer = RaceSerializer(race)
+            race = optimize_queryset(Race.objects.all(), RaceSerializer(**options)).get(pk=pk)
+            serializer = RaceSerializer(race, **options)
             return Response(serializer.data)
         except Race.DoesNotExist:
             return Response({"error": "Race not Found"}, status=status.HTTP_404_NOT_FOUND)
 
+    @conditional_get
     def list(self, request):
         """Handle GET requests to get all races
 
         Returns:
             Response -- JSON serialized list of races
         """
+        options = get_field_options(request)
         nation = request.query_params.get('nation', None)
 
-        races = Race.objects.all()
+        races = optimize_queryset(Race.objects.all(), RaceSerializer(**options))
 
         if nation is not None:
             races = races.filter(nation=nation)
 
-        serializer = RaceSerializer(races, many=True)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(races, request, view=self)
+        if page is not None:
+            serializer = RaceSerializer(page, many=True, **options)
+            return paginator.get_paginated_response(serializer.data)
+
+        if should_stream(request, races):
+            return stream_list(request, races, RaceSerializer, **options)
+
+        serializer = RaceSerializer(races, many=True, **options)
         return Response(serializer.data)
 
 
+    @serialized_write
     def create(self, request):
         """Handle POST operations
 
@@ -53,24 +97,26 @@ class RaceView(ViewSet):
                 return Response({"error": f"Missing field: '{field}'"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-         # Retrieve related objects
-            nation = Nation.objects.get(pk=request.data["nation_id"])
-            circuit = Circuit.objects.get(pk=request.data["circuit_id"])
-            winner_driver = Driver.objects.get(pk=request.data["winner_driver_id"])
-            p2_driver = Driver.objects.get(pk=request.data["p2_driver_id"])
-            p3_driver = Driver.objects.get(pk=request.data["p3_driver_id"])
+         # Retrieve related objects, one query per model
+            related = resolve_ids([
+                ("nation_id", Nation, request.data["nation_id"]),
+                ("circuit_id", Circuit, request.data["circuit_id"]),
+                ("winner_driver_id", Driver, request.data["winner_driver_id"]),
+                ("p2_driver_id", Driver, request.data["p2_driver_id"]),
+                ("p3_driver_id", Driver, request.data["p3_driver_id"]),
+            ])
 
             # Create the race instance
             race = Race.objects.create(
                 name=request.data["name"],
-                circuit=circuit,
+                circuit=related["circuit_id"],
                 date=request.data["date"],
-                nation=nation,
+                nation=related["nation_id"],
                 distance=request.data["distance"],
                 laps=request.data["laps"],
-                winner_driver=winner_driver,
-                p2_driver=p2_driver,
-                p3_driver=p3_driver
+                winner_driver=related["winner_driver_id"],
+                p2_driver=related["p2_driver_id"],
+                p3_driver=related["p3_driver_id"]
             )     
 
             serializer = RaceSerializer(race)
@@ -87,6 +133,7 @@ class RaceView(ViewSet):
 
         
 
+    @serialized_write
     def update(self, request, pk):
         """Handle PUT requests for a race
 
@@ -96,40 +143,20 @@ class RaceView(ViewSet):
         try:
             race = Race.objects.get(pk=pk)
 
-            if "nation_id" in request.data:
-                try:
-                    nation = Nation.objects.get(pk=request.data["nation_id"])
-                    race.nation = nation
-                except Nation.DoesNotExist:
-                    return Response({"error": "Invalid nation_id, nation not found."}, status=status.HTTP_400_BAD_REQUEST)
-
-            if "circuit_id" in request.data:
-                try:
-                    circuit = Circuit.objects.get(pk=request.data["circuit_id"])
-                    race.circuit = circuit
-                except Circuit.DoesNotExist:
-                    return Response({"error": "Invalid circuit_id, circuit not found."}, status=status.HTTP_400_BAD_REQUEST)
-
-            if "winner_driver_id" in request.data:
-                try:
-                    winner_driver = Driver.objects.get(pk=request.data["winner_driver_id"])
-                    race.winner_driver = winner_driver
-                except Driver.DoesNotExist:
-                    return Response({"error": "Invalid winner_driver_id, driver not found."}, status=status.HTTP_400_BAD_REQUEST)
-
-            if "p2_driver_id" in request.data:
-                try:
-                    p2_driver = Driver.objects.get(pk=request.data["p2_driver_id"])
-                    race.p2_driver = p2_driver
-                except Driver.DoesNotExist:
-                    return Response({"error": "Invalid p2_driver_id, driver not found."}, status=status.HTTP_400_BAD_REQUEST)
-
-            if "p3_driver_id" in request.data:
-                try:
-                    p3_driver = Driver.objects.get(pk=request.data["p3_driver_id"])
-                    race.p3_driver = p3_driver
-                except Driver.DoesNotExist:
-                    return Response({"error": "Invalid p3_driver_id, driver not found."}, status=status.HTTP_400_BAD_REQUEST)
+            # Resolve whichever related ids were sent, one query per model
+            lookups = [
+                (f"{field}_id", model, request.data[f"{field}_id"])
+                for field, model in RACE_RELATIONS
+                if f"{field}_id" in request.data
+            ]
+            try:
+                related = resolve_ids(lookups)
+            except UnresolvedId as e:
+                return Response({"error": f"Invalid {e.key}, {e.model._meta.verbose_name} not found."}, status=status.HTTP_400_BAD_REQUEST)
+
+            for field, _ in RACE_RELATIONS:
+                if f"{field}_id" in related:
+                    setattr(race, field, related[f"{field}_id"])
 
             race.name = request.data.get("name", race.name)
             race.date = request.data.get("date", race.date)
@@ -147,6 +174,7 @@ class RaceView(ViewSet):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @serialized_write
     def destroy(self, request, pk):
         """Handle DELETE requests for a race"""
         try:
@@ -156,7 +184,157 @@ class RaceView(ViewSet):
         except Race.DoesNotExist:
             raise Http404("Race not found")
 
-class RaceSerializer(serializers.ModelSerializer):
+    @action(detail=True, methods=['get'])
+    def podium(self, request, pk):
+        """Handle GET requests for the constructors a race's podium scored for
+
+        Returns:
+            Response -- position, driver id and constructor id per podium place
+        """
+        try:
+            race = Race.objects.only(*PODIUM_FIELDS, "date").get(pk=pk)
+        except Race.DoesNotExist:
+            return Response({"error": "Race not Found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(get_podium_constructors(race))
+
+    @action(detail=False, methods=['post'], parser_classes=[FastJSONParser, NDJSONParser])
+    @serialized_write
+    def bulk(self, request):
+        """Handle POST requests that create many races at once
+
+        Accepts a JSON array of races or an NDJSON stream with one race per
+        line, using the same fields as a single create. Foreign keys are
+        checked with one query per model per batch and rows are inserted
+        with bulk_create inside a single transaction. By default nothing is
+        saved if any race is invalid; ?atomic=false saves the valid ones.
+
+        Returns:
+            Response -- count created and a result (id or error) per race
+        """
+        atomic = request.query_params.get('atomic', 'true').lower() not in ('0', 'false')
+        rows = request.data
+        # A JSON array, or the iterator NDJSONParser gives; anything else
+        # (an object, a string, a number) is not a list of races
+        if not isinstance(rows, (list, Iterator)):
+            return Response({"error": "Expected a list of races."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = []
+        written = []
+        failed = False
+        rows = enumerate(rows)
+        with transaction.atomic():
+            while True:
+                batch = list(islice(rows, BULK_BATCH_SIZE))
+                if not batch:
+                    break
+
+                built = build_race_batch(batch)
+                races = [race for _, race in built if isinstance(race, Race)]
+                failed = failed or len(races) < len(built)
+                # In atomic mode keep validating after a failure so every
+                # error is reported, but stop inserting
+                if races and not (atomic and failed):
+                    Race.objects.bulk_create(races, batch_size=BULK_BATCH_SIZE)
+                    written.extend(races)
+
+                for index, race in built:
+                    if isinstance(race, Race):
+                        results.append({"index": index, "id": race.pk})
+                    else:
+                        results.append({"index": index, "error": race})
+
+            if failed and atomic:
+                transaction.set_rollback(True)
+                for result in results:
+                    if "id" in result:
+                        result["id"] = None
+                return Response({"created": 0, "results": results}, status=status.HTTP_400_BAD_REQUEST)
+
+            created = len(written)
+            if created:
+                bulk_write.send(sender=Race, instances=written)
+
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"created": created, "results": results}, status=response_status)
+
+
+def build_race_batch(batch):
+    """Validate a batch of race payloads and build unsaved Race instances
+
+    Every referenced id is checked with one query per model for the whole
+    batch rather than per race.
+
+    Returns:
+        list -- (index, Race) for valid rows, (index, error message) otherwise
+    """
+    prepared = []
+    ids_by_model = {model: set() for _, model in RACE_RELATIONS}
+    for index, item in batch:
+        if isinstance(item, ParseError):
+            # A malformed NDJSON line
+            prepared.append((index, str(item.detail)))
+            continue
+        if not isinstance(item, dict):
+            prepared.append((index, "Expected a JSON object."))
+            continue
+        missing = next((field for field in BULK_RACE_FIELDS if field not in item), None)
+        if missing is not None:
+            prepared.append((index, f"Missing field: '{missing}'"))
+            continue
+        try:
+            related_ids = {
+                field: model._meta.pk.to_python(item[f"{field}_id"])
+                for field, model in RACE_RELATIONS
+            }
+        except ModelValidationError as e:
+            prepared.append((index, " ".join(e.messages)))
+            continue
+        for field, model in RACE_RELATIONS:
+            ids_by_model[model].add(related_ids[field])
+        prepared.append((index, (item, related_ids)))
+
+    existing = {
+        model: set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        for model, ids in ids_by_model.items() if ids
+    }
+
+    built = []
+    for index, entry in prepared:
+        if isinstance(entry, str):
+            built.append((index, entry))
+            continue
+        item, related_ids = entry
+        missing = next(
+            (model for field, model in RACE_RELATIONS if related_ids[field] not in existing[model]),
+            None
+        )
+        if missing is not None:
+            built.append((index, f"{missing.__name__} not found."))
+            continue
+
+        race = Race(
+            name=item["name"],
+            date=item["date"],
+            distance=item["distance"],
+            laps=item["laps"],
+            **{f"{field}_id": related_ids[field] for field, _ in RACE_RELATIONS}
+        )
+        try:
+            race.clean_fields(exclude=[field for field, _ in RACE_RELATIONS])
+        except ModelValidationError as e:
+            built.append((index, "; ".join(
+                f"{field}: {' '.join(messages)}" for field, messages in e.message_dict.items()
+            )))
+            continue
+        built.append((index, race))
+    return built
+
+class RaceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for races"""
     class Meta:
         model = Race
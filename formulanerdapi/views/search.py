@@ -0,0 +1,55 @@
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework import serializers, status
+from formulanerdapi.search import SEARCH_SOURCES, search
+from formulanerdapi.utils import DynamicFieldsMixin, conditional_get
+
+MAX_SEARCH_RESULTS = 100
+
+
+class SearchView(ViewSet):
+    """Formula Nerd full-text search view"""
+
+    # Results are read from the search table, which triggers keep in step
+    # with these
+    version_models = tuple(model for _, model, _, _ in SEARCH_SOURCES)
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return SearchResultSerializer
+
+    @conditional_get
+    def list(self, request):
+        """Handle GET requests to search drivers, constructors, circuits and races
+
+        Takes ?q=, an optional comma separated ?type= (driver, constructor,
+        circuit, race) and ?limit= (default 20, at most MAX_SEARCH_RESULTS).
+
+        Returns:
+            Response -- JSON serialized matches, best first
+        """
+        query = request.query_params.get('q', '')
+        if not query.strip():
+            return Response({"error": "Missing parameter: 'q'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        kinds = request.query_params.get('type', None)
+        if kinds is not None:
+            kinds = {kind.strip() for kind in kinds.split(',')}
+            unknown = kinds - {kind for kind, _, _, _ in SEARCH_SOURCES}
+            if unknown:
+                return Response({"error": f"Unknown type: {', '.join(sorted(unknown))}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), MAX_SEARCH_RESULTS)
+        except ValueError:
+            return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = SearchResultSerializer(search(query, kinds, max(limit, 1)), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class SearchResultSerializer(DynamicFieldsMixin, serializers.Serializer):
+    """JSON serializer for search results"""
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    name = serializers.CharField()
@@ -0,0 +1,21 @@
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from formulanerdapi.slow_queries import get_slow_query_log
+
+class SlowQueryView(ViewSet):
+    """Formula Nerd admin-only slow query view"""
+
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        """Handle GET requests for the slowest SQL statements this process has run
+
+        Each statement comes with how often it was slow, its slowest run
+        (parameters, route, view action and call stack) and its plan.
+        Empty unless settings.SLOW_QUERY_THRESHOLD_MS is set.
+
+        Returns:
+            Response -- JSON list of statements, slowest first
+        """
+        return Response(get_slow_query_log().top())
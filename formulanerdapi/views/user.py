@@ -6,23 +6,38 @@ from formulanerdapi.models import Driver
 from formulanerdapi.models import User
 from formulanerdapi.models import Nation
 from formulanerdapi.models import Circuit
+from formulanerdapi.utils import optimize_queryset, resolve_ids, UnresolvedId, DynamicFieldsMixin, get_field_options, conditional_get, serialized_write
+from formulanerdapi.pagination import KeysetPagination
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
 from rest_framework.exceptions import NotFound
 
+USER_RELATIONS = (
+    ("nation_id", Nation),
+    ("favorite_driver_id", Driver),
+    ("favorite_circuit_id", Circuit),
+)
+
 class UserView(ViewSet):
     """Formula Nerd user view"""
 
+    pagination_class = KeysetPagination
+
+    def get_serializer_class(self):
+        """Serializer used to render this view's resources"""
+        return UserSerializer
 
+    @conditional_get
     def retrieve(self, request, pk=None):
         """Handle GET operations for retrieving a user by their primary key (id)
 
         Returns:
             Response -- JSON serialized user instance or error message
         """
+        options = get_field_options(request)
         try:
-            user = User.objects.get(pk=pk)
-            serializer = UserSerializer(user)
+            user = optimize_queryset(User.objects.all(), UserSerializer(**options)).get(pk=pk)
+            serializer = UserSerializer(user, **options)
             return Response(serializer.data)
 
         except User.DoesNotExist:
@@ -34,17 +49,26 @@ class UserView(ViewSet):
 
 
 
+    @conditional_get
     def list(self, request):
         """Handle GET requests to get all users
 
         Returns:
             Response -- JSON serialized list of users
         """
-        users = User.objects.all()
+        options = get_field_options(request)
+        users = optimize_queryset(User.objects.all(), UserSerializer(**options))
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(users, request, view=self)
+        if page is not None:
+            serializer = UserSerializer(page, many=True, **options)
+            return paginator.get_paginated_response(serializer.data)
 
-        serializer = UserSerializer(users, many=True)
+        serializer = UserSerializer(users, many=True, **options)
         return Response(serializer.data)
 
+    @serialized_write
     def create(self, request):
         """Handle POST operations
 
@@ -64,14 +88,14 @@ class UserView(ViewSet):
                 return Response({"error": "Missing field: 'name'"}, status=status.HTTP_400_BAD_REQUEST)
 
             # Optional fields that can be left out
-            if "nation_id" in request.data:
-                nation = Nation.objects.get(pk=request.data["nation_id"])
-
-            if "favorite_driver_id" in request.data:
-                favorite_driver = Driver.objects.get(pk=request.data["favorite_driver_id"])
-
-            if "favorite_circuit_id" in request.data:
-                favorite_circuit = Circuit.objects.get(pk=request.data["favorite_circuit_id"])
+            related = resolve_ids([
+                (key, model, request.data[key])
+                for key, model in USER_RELATIONS
+                if key in request.data
+            ])
+            nation = related.get("nation_id")
+            favorite_driver = related.get("favorite_driver_id")
+            favorite_circuit = related.get("favorite_circuit_id")
 
             # Ensure that all required fields are provided
             if not favorite_circuit:  # If favorite_circuit is None, it means the field wasn't provided
@@ -105,6 +129,7 @@ class UserView(ViewSet):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+    @serialized_write
     def update(self, request, pk):
         """Handle PUT requests for a user
 
@@ -114,31 +139,26 @@ class UserView(ViewSet):
         try:
             user = User.objects.get(pk=pk)
 
-            nation_id = request.data.get("nation_id")
-            if nation_id:
-                try:
-                    nation = Nation.objects.get(pk=nation_id)
-                    user.nation = nation
-                except Nation.DoesNotExist:
-                    return Response({"error": "Invalid nation_id, nation not found."}, status=status.HTTP_400_BAD_REQUEST)
-                
             user.uid = request.data.get("uid", user.uid)
             user.name = request.data.get("name", user.name)
-            favorite_driver_id = request.data.get("favorite_driver_id")
-            if favorite_driver_id:
-                try:
-                    favorite_driver = Driver.objects.get(pk=favorite_driver_id)
-                    user.favorite_driver = favorite_driver
-                except Driver.DoesNotExist:
-                    return Response({"error": "Invalid favorite_driver_id, driver not found."}, status=status.HTTP_400_BAD_REQUEST)
-        
-            favorite_circuit_id = request.data.get("favorite_circuit_id")
-            if favorite_circuit_id:
-                try:
-                    favorite_circuit = Circuit.objects.get(pk=favorite_circuit_id)
-                    user.favorite_circuit = favorite_circuit
-                except Circuit.DoesNotExist:
-                    return Response({"error": "Invalid favorite_circuit_id, circuit not found."}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Resolve whichever related ids were sent, one query per model
+            lookups = [
+                (key, model, request.data.get(key))
+                for key, model in USER_RELATIONS
+                if request.data.get(key)
+            ]
+            try:
+                related = resolve_ids(lookups)
+            except UnresolvedId as e:
+                return Response({"error": f"Invalid {e.key}, {e.model._meta.verbose_name} not found."}, status=status.HTTP_400_BAD_REQUEST)
+
+            if "nation_id" in related:
+                user.nation = related["nation_id"]
+            if "favorite_driver_id" in related:
+                user.favorite_driver = related["favorite_driver_id"]
+            if "favorite_circuit_id" in related:
+                user.favorite_circuit = related["favorite_circuit_id"]
 
             user.save()
 
@@ -149,6 +169,7 @@ class UserView(ViewSet):
         except KeyError as e:
             return Response({"error": f"Missing field: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
         
+    @serialized_write
     def destroy(self, request, pk):
         try:
             user = User.objects.get(pk=pk)
@@ -156,7 +177,7 @@ class UserView(ViewSet):
             return Response(None, status=status.HTTP_204_NO_CONTENT)
         except User.DoesNotExist:
             return Response({"error": "User not found."}, status=status.HTTP_404_NOT_FOUND)
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for users
     """
     class Meta: